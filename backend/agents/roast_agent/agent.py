@@ -1,8 +1,9 @@
 import json
+from typing import AsyncIterator, Dict, List, Mapping, Optional, Tuple
 from pydantic import BaseModel, Field
 from backend.agents.scraper_agent.scraper import normalize
 from backend.core.agents_sdk_wrapper import OpenAIAgent
-from .prompt_templates import ROAST_PROMPT, CATEGORIZED_ROAST_PROMPT, BIRTH_CHART_SYNTHESIS_PROMPT
+from .prompt_templates import ROAST_PROMPT, CATEGORIZED_ROAST_PROMPT, BIRTH_CHART_SYNTHESIS_PROMPT, PLACEMENT_ROAST_PROMPT, CHART_ROAST_PROMPT
 
 
 class CategorizedRoast(BaseModel):
@@ -13,58 +14,224 @@ class CategorizedRoast(BaseModel):
     social: str = Field(description="Roast about social life (1-2 sentences)")
 
 
+class ChartRoast(BaseModel):
+    """Pydantic model for a whole birth chart roasted in one call: every placement, then the synthesis."""
+    sun: str = Field(description="Roast of the Sun placement (2-3 sentences)")
+    moon: str = Field(description="Roast of the Moon placement (2-3 sentences)")
+    mercury: str = Field(description="Roast of the Mercury placement (2-3 sentences)")
+    venus: str = Field(description="Roast of the Venus placement (2-3 sentences)")
+    mars: str = Field(description="Roast of the Mars placement (2-3 sentences)")
+    jupiter: str = Field(description="Roast of the Jupiter placement (2-3 sentences)")
+    saturn: str = Field(description="Roast of the Saturn placement (2-3 sentences)")
+    uranus: str = Field(description="Roast of the Uranus placement (2-3 sentences)")
+    neptune: str = Field(description="Roast of the Neptune placement (2-3 sentences)")
+    pluto: str = Field(description="Roast of the Pluto placement (2-3 sentences)")
+    overall_synthesis: str = Field(description="Synthesis of all placements (4-5 sentences)")
+
+
+# ChartRoast field -> key used by the placement roast stream
+CHART_ROAST_FIELDS = {name: name.capitalize() for name in ChartRoast.model_fields}
+CHART_ROAST_FIELDS['overall_synthesis'] = 'overall_synthesis'
+
+
+# Returned by run_categorized when the LLM call fails; never worth caching
+CATEGORIZED_ROAST_FALLBACK = {
+    "overall": "Overall, even the AI is confused by your cosmic energy. Your chart is so chaotic that even machine learning algorithms give up trying to decode it.",
+    "love": "Your love life is as unpredictable as this error message.",
+    "work": "Your career path is as unclear as this malformed response.",
+    "social": "Your social skills need debugging, just like this code."
+}
+
+SYNTHESIS_FALLBACK = "Your cosmic blueprint is so complex that even the universe's best roast algorithm crashed trying to decode it. Consider this a blessing in disguise, because the truth might have been too brutal to handle."
+
+
+def _roast_agent(cache: bool = True) -> OpenAIAgent:
+    return OpenAIAgent(system_prompt="You are Scorpiobot, the roast master.", cache=cache)
+
+
+def _categorized_agent() -> OpenAIAgent:
+    # Use Pydantic model for structured output
+    return OpenAIAgent(
+        system_prompt="You are Scorpiobot, the roast master. Always respond with valid JSON that matches the required schema.",
+        response_format=CategorizedRoast
+    )
+
+
+def _chart_agent() -> OpenAIAgent:
+    return OpenAIAgent(
+        system_prompt="You are Scorpiobot, the roast master. Always respond with valid JSON that matches the required schema.",
+        response_format=ChartRoast
+    )
+
+
+def _categorized_prompt(text: str, language: str) -> str:
+    cleaned = normalize(text)
+    return CATEGORIZED_ROAST_PROMPT.format(text=cleaned, language=language)
+
+
+def _categorized_to_dict(response) -> dict:
+    # If the agent returns a Pydantic model, convert to dict
+    if isinstance(response, CategorizedRoast):
+        return response.model_dump()
+    # If it's a string, try to parse as JSON
+    elif isinstance(response, str):
+        roast_data = json.loads(response)
+        # Validate with Pydantic
+        validated = CategorizedRoast(**roast_data)
+        return validated.model_dump()
+    else:
+        # Fallback
+        return response
+
+
+def _synthesis_prompt(planet_roasts: dict, language: str) -> str:
+    # Format planet roasts into a readable string
+    roasts_text = "\n".join([f"{planet}: {roast}" for planet, roast in planet_roasts.items()])
+    return BIRTH_CHART_SYNTHESIS_PROMPT.format(planet_roasts=roasts_text, language=language)
+
+
 def run(text: str, language: str = "English") -> str:
     cleaned = normalize(text)
     prompt = ROAST_PROMPT.format(text=cleaned, language=language)
-    agent = OpenAIAgent(system_prompt="You are Scorpiobot, the roast master.")
-    return agent.run(prompt)
+    return _roast_agent().run(prompt)
+
+
+async def arun(text: str, language: str = "English") -> str:
+    """Async version of run()."""
+    cleaned = normalize(text)
+    prompt = ROAST_PROMPT.format(text=cleaned, language=language)
+    return await _roast_agent().arun(prompt)
+
+
+def _placement_prompt(planet: str, sign: str, house: int, language: str) -> str:
+    cleaned = normalize(PLACEMENT_ROAST_PROMPT.format(planet=planet, sign=sign, house=house))
+    return ROAST_PROMPT.format(text=cleaned, language=language)
+
+
+# Placement roasts bypass the LLM response cache: they are stored as roast
+# library variants, and the same prompt would otherwise get the same text back
+# for every variant.
+
+async def arun_placement(planet: str, sign: str, house: int, language: str = "English") -> str:
+    """Roast one planet × sign × house placement."""
+    return await _roast_agent(cache=False).arun(_placement_prompt(planet, sign, house, language))
+
+
+async def astream(text: str, language: str = "English") -> AsyncIterator[str]:
+    """Streaming version of arun(): yields token deltas; shares its cache entries."""
+    cleaned = normalize(text)
+    prompt = ROAST_PROMPT.format(text=cleaned, language=language)
+    async for delta in _roast_agent().astream(prompt):
+        yield delta
+
+
+async def astream_placement(planet: str, sign: str, house: int, language: str = "English") -> AsyncIterator[str]:
+    """Stream the roast of one placement as token deltas."""
+    async for delta in _roast_agent(cache=False).astream(_placement_prompt(planet, sign, house, language)):
+        yield delta
+
+
+async def _stream_fields(snapshots: AsyncIterator, fields: List[str]) -> AsyncIterator[Tuple[str, str, Optional[str]]]:
+    """
+    Turn growing structured-output snapshots into per-field text deltas.
+
+    Yields:
+        (field, delta, text): text is None while the field is still growing
+        and its full value once complete. Fields arrive in schema order, so
+        one is complete once the next has started.
+    """
+    sent: Dict[str, str] = {}
+    done = set()
+    async for snapshot in snapshots:
+        final = isinstance(snapshot, BaseModel)
+        data: Dict = snapshot.model_dump() if final else snapshot
+        present = [field for field in fields if isinstance(data.get(field), str)]
+        for index, field in enumerate(present):
+            if field in done:
+                continue
+            text = data[field]
+            delta = text[len(sent.get(field, "")):]
+            complete = final or index < len(present) - 1
+            if delta or complete:
+                sent[field] = text
+                if complete:
+                    done.add(field)
+                yield field, delta, text if complete else None
+
+
+async def astream_chart_roast(placements: Mapping[str, Mapping], language: str = "English") -> AsyncIterator[Tuple[str, str, Optional[str]]]:
+    """
+    Roast every placement and the synthesis in a single structured call.
+
+    Args:
+        placements: Planet -> data with 'sign' and 'house', like a chart's 'planets'
+        language: Roast language
+
+    Yields:
+        (planet or 'overall_synthesis', delta, roast) as the response is
+        generated; roast is set once that field is complete
+    """
+    lines = "\n".join(f"{planet} in {data['sign']} in the {data['house']}th house" for planet, data in placements.items())
+    prompt = CHART_ROAST_PROMPT.format(placements=lines, language=language)
+    async for field, delta, roast in _stream_fields(_chart_agent().astream_parsed(prompt), list(CHART_ROAST_FIELDS)):
+        key = CHART_ROAST_FIELDS[field]
+        if key in placements or key == 'overall_synthesis':
+            yield key, delta, roast
 
 
 def run_categorized(text: str, language: str = "English") -> dict:
     """Generate categorized roasts for Love, Work, Social Life, and Overall."""
-    cleaned = normalize(text)
-    prompt = CATEGORIZED_ROAST_PROMPT.format(text=cleaned, language=language)
-    
-    # Use Pydantic model for structured output
-    agent = OpenAIAgent(
-        system_prompt="You are Scorpiobot, the roast master. Always respond with valid JSON that matches the required schema.",
-        response_format=CategorizedRoast
-    )
-    
     try:
-        response = agent.run(prompt)
-        # If the agent returns a Pydantic model, convert to dict
-        if isinstance(response, CategorizedRoast):
-            return response.model_dump()
-        # If it's a string, try to parse as JSON
-        elif isinstance(response, str):
-            roast_data = json.loads(response)
-            # Validate with Pydantic
-            validated = CategorizedRoast(**roast_data)
-            return validated.model_dump()
-        else:
-            # Fallback
-            return response
+        response = _categorized_agent().run(_categorized_prompt(text, language))
+        return _categorized_to_dict(response)
     except (json.JSONDecodeError, ValueError, Exception) as e:
         # Fallback if anything fails
-        return {
-            "overall": "Overall, even the AI is confused by your cosmic energy. Your chart is so chaotic that even machine learning algorithms give up trying to decode it.",
-            "love": "Your love life is as unpredictable as this error message.",
-            "work": "Your career path is as unclear as this malformed response.",
-            "social": "Your social skills need debugging, just like this code."
-        }
+        return dict(CATEGORIZED_ROAST_FALLBACK)
+
+
+async def arun_categorized(text: str, language: str = "English") -> dict:
+    """Async version of run_categorized()."""
+    try:
+        response = await _categorized_agent().arun(_categorized_prompt(text, language))
+        return _categorized_to_dict(response)
+    except (json.JSONDecodeError, ValueError, Exception) as e:
+        # Fallback if anything fails
+        return dict(CATEGORIZED_ROAST_FALLBACK)
+
+
+async def astream_categorized(text: str, language: str = "English") -> AsyncIterator[Tuple[str, str, Optional[str]]]:
+    """
+    Stream categorized roasts as they are generated.
+
+    Yields:
+        (category, delta, roast) in CategorizedRoast field order; roast is set
+        once the category is complete. The response is validated against
+        CategorizedRoast before the last category completes.
+    """
+    snapshots = _categorized_agent().astream_parsed(_categorized_prompt(text, language))
+    async for category, delta, roast in _stream_fields(snapshots, list(CategorizedRoast.model_fields)):
+        yield category, delta, roast
 
 
 def run_birth_chart_synthesis(planet_roasts: dict, language: str = "English") -> str:
     """Generate a synthesis roast that combines all planet roasts into one comprehensive analysis."""
-    # Format planet roasts into a readable string
-    roasts_text = "\n".join([f"{planet}: {roast}" for planet, roast in planet_roasts.items()])
-    
-    prompt = BIRTH_CHART_SYNTHESIS_PROMPT.format(planet_roasts=roasts_text, language=language)
-    agent = OpenAIAgent(system_prompt="You are Scorpiobot, the roast master.")
-    
     try:
-        return agent.run(prompt)
+        return _roast_agent().run(_synthesis_prompt(planet_roasts, language))
+    except Exception as e:
+        # Fallback if anything fails
+        return SYNTHESIS_FALLBACK
+
+
+async def astream_birth_chart_synthesis(planet_roasts: dict, language: str = "English") -> AsyncIterator[str]:
+    """Stream the synthesis roast as token deltas; failures propagate to the caller."""
+    async for delta in _roast_agent().astream(_synthesis_prompt(planet_roasts, language)):
+        yield delta
+
+
+async def arun_birth_chart_synthesis(planet_roasts: dict, language: str = "English") -> str:
+    """Async version of run_birth_chart_synthesis()."""
+    try:
+        return await _roast_agent().arun(_synthesis_prompt(planet_roasts, language))
     except Exception as e:
         # Fallback if anything fails
-        return "Your cosmic blueprint is so complex that even the universe's best roast algorithm crashed trying to decode it. Consider this a blessing in disguise, because the truth might have been too brutal to handle."
+        return SYNTHESIS_FALLBACK
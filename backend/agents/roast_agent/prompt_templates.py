@@ -40,3 +40,21 @@ BIRTH_CHART_SYNTHESIS_PROMPT = (
     "Respond directly without any prefix or formatting - just the synthesis roast itself. "
     "Now synthesize these planet roasts:\n{planet_roasts}\n[Language]: {language}"
 )
+
+# Wrapped in ROAST_PROMPT like any other roast input
+PLACEMENT_ROAST_PROMPT = (
+    "Generate a witty, insightful, and slightly sarcastic astrological roast "
+    "for a person with {planet} in {sign} in the {house}th house. "
+    "Focus on the unique combination of this planet, sign, and house."
+)
+
+CHART_ROAST_PROMPT = (
+    "You are a brutally honest AI astrologer who can respond in English, French, or Russian. "
+    "For each placement below, write a witty, insightful, and slightly sarcastic roast "
+    "(2-3 sentences) that focuses on the unique combination of its planet, sign, and house. "
+    "Then write the overall synthesis: 4-5 sentences that tie all the placements together "
+    "into one brutal but entertaining assessment of this person's astrological destiny. "
+    "Use sarcasm, dark humor, and pop culture references. Be nuanced and don't overdo it. "
+    "Respond in the language specified by the user, filling every field of the JSON schema.\n"
+    "[Placements]:\n{placements}\n[Language]: {language}"
+)
@@ -1,13 +1,34 @@
 import requests
 import logging
 import random
+import threading
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 from typing import Dict, Optional
+from backend.core.config import Config
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Keep-alive session shared by every scrape in the process
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Return the shared HTTP session, sized for the prefetch worker pool."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=Config.SCRAPER_POOL_SIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
 
 def fetch_horoscopes(sign: str, period: str = "daily") -> Dict[str, str]:
     """Fetch horoscope text from horoscope-app-api.vercel.app with fallback."""
@@ -35,7 +56,11 @@ def fetch_horoscopes(sign: str, period: str = "daily") -> Dict[str, str]:
             url = f"{base_url}/get-horoscope/daily"
             params = {"sign": sign_cap, "day": "TODAY"}
         logger.info(f"Fetching horoscope for {sign_cap} ({period}) from horoscope-app-api.vercel.app")
-        response = requests.get(url, params=params, timeout=10)
+        response = get_session().get(
+            url,
+            params=params,
+            timeout=(Config.SCRAPER_CONNECT_TIMEOUT, Config.SCRAPER_READ_TIMEOUT)
+        )
         response.raise_for_status()
         data = response.json()
         
@@ -2,11 +2,10 @@ import os
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from backend.agents.scraper_agent.agent import run_scraper
-from backend.core.daily_data_manager import load_daily_horoscopes, save_daily_horoscopes, is_data_fresh, cleanup_old_data
 from backend.api.routes.horoscope import router as horoscope_router
-from .utils.caching import save_to_cache
-import logging
+from backend.core.render_pool import start_render_pool, stop_render_pool
+from .utils.refresh_scheduler import start_refresh_scheduler, stop_refresh_scheduler
+from .utils.warmup import start_background_warmup
 
 # Load environment variables from .env file
 load_dotenv()
@@ -24,51 +23,20 @@ app.add_middleware(
 
 app.include_router(horoscope_router)
 
-# List of all zodiac signs
-ALL_SIGNS = [
-    "aries", "taurus", "gemini", "cancer", "leo", "virgo",
-    "libra", "scorpio", "sagittarius", "capricorn", "aquarius", "pisces"
-]
-ALL_PERIODS = ["daily", "yesterday", "tomorrow"]
 
 @app.on_event("startup")
-def prefetch_horoscopes():
-    logger = logging.getLogger("startup")
-    logger.info("Starting horoscope data initialization...")
-    
-    # Clean up old data first
-    cleanup_old_data()
-    
-    # Check if we have fresh data for today
-    if is_data_fresh():
-        logger.info("Found fresh daily horoscope data, loading from disk...")
-        daily_data = load_daily_horoscopes()
-        if daily_data:
-            # Load the data into cache
-            for sign, periods in daily_data.items():
-                for period, text in periods.items():
-                    save_to_cache(sign, period, text)
-            logger.info("Successfully loaded daily horoscopes from disk")
-            return
-    
-    # If no fresh data, fetch from API and save to disk
-    logger.info("No fresh data found, fetching horoscopes from API...")
-    all_horoscopes = {}
-    
-    for sign in ALL_SIGNS:
-        all_horoscopes[sign] = {}
-        for period in ALL_PERIODS:
-            try:
-                text = run_scraper(sign, period)
-                save_to_cache(sign, period, text)
-                all_horoscopes[sign][period] = text
-                logger.info(f"Cached {sign} ({period})")
-            except Exception as e:
-                logger.error(f"Failed to cache {sign} ({period}): {e}")
-    
-    # Save all horoscopes to disk
-    save_daily_horoscopes(all_horoscopes)
-    logger.info("Pre-fetching complete and saved to disk.")
+def start_warmup():
+    # Serve immediately; keys that are not warm yet are fetched on demand
+    start_background_warmup()
+    start_refresh_scheduler()
+    start_render_pool()
+
+
+@app.on_event("shutdown")
+def stop_background_tasks():
+    stop_refresh_scheduler()
+    stop_render_pool()
+
 
 @app.get("/")
 def read_root():
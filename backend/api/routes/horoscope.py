@@ -1,30 +1,116 @@
 import logging
 import requests
-import io
-import numpy as np
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response
 from backend.agents.scraper_agent.agent import run_scraper
 from backend.agents.roast_agent import agent as roast_agent
-from backend.agents.roast_agent.agent import run_birth_chart_synthesis
-from backend.api.utils.caching import load_from_cache, save_to_cache
+from backend.agents.roast_agent.agent import CATEGORIZED_ROAST_FALLBACK
+from backend.api.utils.caching import load_from_cache, save_to_cache, load_roast_from_cache, save_roast_to_cache, current_bucket, get_cache_stats, render_cache
+from backend.api.utils.sse import event_stream_response, get_sse_stats
+from backend.api.utils.warmup import get_warmup_status
+from backend.core.agents_sdk_wrapper import get_pool_stats, get_stream_stats
+from backend.core.llm_cache import get_llm_cache_stats
+from backend.core.config import Config
+from backend.core.single_flight import SingleFlight, get_single_flight_stats
 from backend.core.zodiac_calculator import get_zodiac_sign, get_sign_info
-from backend.core.birth_chart_calculator import calculate_birth_chart, generate_birth_chart_summary, ZODIAC_SIGNS
+from backend.core.chart_store import chart_store, make_chart_id
+from backend.core.birth_chart_calculator import calculate_birth_chart, generate_birth_chart_summary, get_chart_cache_stats
+from backend.core.chart_image import MASTER_DPI, MASTER_OPTIONS, SIZE_PRESETS, derive_image, render_dpi, resolve_render_options
+from backend.core.chart_plot import render_key
+from backend.core.chart_svg import render_chart_svg
+from backend.core.render_pool import RenderPoolFull, get_render_pool_stats, render_png
+from backend.core.ephemeris_table import get_table_stats
+from backend.core.roast_library import get_roast_library_stats, lookup_placement_roasts, save_placement_roast
 from backend.core.geocoder import search_cities_with_suggestions, get_city_coordinates_with_rate_limit
-from itertools import combinations
-import json
 import asyncio
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional, Tuple
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Coalesce concurrent cache misses for the same key into one computation
+scrape_flight = SingleFlight("scraper")
+roast_flight = SingleFlight("roast")
+chart_flight = SingleFlight("birth_chart")
+
+# Ways /birth-chart/roast-placements can generate roasts
+PLACEMENT_ROAST_MODES = ("per_placement", "single")
+
+# Streamed in place of roasts the LLM failed to generate
+PLACEMENT_ROAST_FALLBACK = "Couldn't generate a roast for this placement. It's probably too basic."
+SYNTHESIS_ROAST_FALLBACK = "Your cosmic blueprint is so complex that even our advanced AI gave up trying to synthesize it into one coherent roast."
+
+# Periods served by /horoscope/{sign}
+HOROSCOPE_PERIODS = ["daily", "yesterday", "tomorrow", "weekly", "monthly"]
+
+# Formats served by /birth-chart/plot
+PLOT_MEDIA_TYPES = {"png": "image/png", "webp": "image/webp", "svg": "image/svg+xml"}
+
+
+def render_plot(chart: dict, options: dict) -> bytes:
+    """
+    Render a plot image for resolved render options.
+
+    Raster sizes are derived from the cached full-size master when there is
+    one; otherwise the wheel is rendered at the smallest preset dpi that
+    covers the requested size, and kept as the master when that is full size.
+    """
+    if options["format"] == "svg":
+        return render_chart_svg(chart, options["size"])
+    master_key = render_key(chart, MASTER_OPTIONS)
+    # The route has already looked the master up under its own key
+    source = render_cache.get(master_key) if options != MASTER_OPTIONS else None
+    if source is None:
+        dpi = render_dpi(options["size"])
+        source = render_png(chart, dpi)
+        if dpi == MASTER_DPI and options != MASTER_OPTIONS:
+            render_cache.set(master_key, source)
+    return derive_image(source, options)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches an ETag (weak comparison, as RFC 9110 requires)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate in ("*", etag):
+            return True
+    return False
+
+
+def compute_birth_chart(birth_date: str, birth_time: str, latitude: float, longitude: float) -> dict:
+    """Calculate a birth chart, sharing the work between concurrent identical requests."""
+    key = (birth_date, birth_time, latitude, longitude)
+    return chart_flight.do(key, calculate_birth_chart, birth_date, birth_time, latitude, longitude)
+
+
+def resolve_chart(
+    chart_id: Optional[str],
+    birth_date: Optional[str],
+    birth_time: Optional[str],
+    latitude: Optional[float],
+    longitude: Optional[float]
+) -> Tuple[str, dict]:
+    """Return (chart_id, chart) from the chart store, or compute and store it from birth data."""
+    if chart_id:
+        chart = chart_store.get(chart_id)
+        if chart is not None:
+            return chart_id, chart
+    if None in (birth_date, birth_time, latitude, longitude):
+        if chart_id:
+            raise HTTPException(status_code=404, detail="Unknown or expired chart_id. Please resend the birth data.")
+        raise HTTPException(status_code=400, detail="Provide chart_id or birth_date, birth_time, latitude and longitude")
+    chart = compute_birth_chart(birth_date, birth_time, latitude, longitude)
+    chart_id = make_chart_id(birth_date, birth_time, latitude, longitude)
+    chart_store.put(chart_id, chart)
+    return chart_id, chart
+
 
 @router.get("/health")
 def health_check():
@@ -48,6 +134,31 @@ def health_check():
     }
 
 
+@router.get("/ready")
+def readiness_check():
+    """Readiness endpoint reporting cache warmup progress; 503 until warm."""
+    status = get_warmup_status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+
+@router.get("/metrics")
+def get_metrics():
+    """Runtime counters for caches and connection pools."""
+    return {
+        "caches": get_cache_stats(),
+        "birth_chart_cache": get_chart_cache_stats(),
+        "chart_store": chart_store.stats(),
+        "render_pool": get_render_pool_stats(),
+        "ephemeris_table": get_table_stats(),
+        "roast_library": get_roast_library_stats(),
+        "llm_cache": get_llm_cache_stats(),
+        "openai_pool": get_pool_stats(),
+        "llm_streams": get_stream_stats(),
+        "sse": get_sse_stats(),
+        "single_flight": get_single_flight_stats()
+    }
+
+
 @router.get("/search-cities")
 def search_cities(query: str = Query(..., description="City name to search for"), limit: int = Query(5, description="Maximum number of results")):
     """Search for cities and return suggestions."""
@@ -139,10 +250,10 @@ def get_birth_chart(
     latitude: float = Query(..., description="Birth location latitude"),
     longitude: float = Query(..., description="Birth location longitude")
 ):
-    """Calculate birth chart for given birth data."""
+    """Calculate birth chart for given birth data, with a chart_id for follow-up requests."""
     try:
-        birth_chart = calculate_birth_chart(birth_date, birth_time, latitude, longitude)
-        return birth_chart
+        chart_id, birth_chart = resolve_chart(None, birth_date, birth_time, latitude, longitude)
+        return {**birth_chart, "chart_id": chart_id}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -154,22 +265,29 @@ def get_birth_chart(
 
 
 @router.get("/birth-chart/roast")
-def get_birth_chart_roast(
-    birth_date: str = Query(..., description="Birth date in YYYY-MM-DD format"),
-    birth_time: str = Query(..., description="Birth time in HH:MM format (24-hour)"),
-    latitude: float = Query(..., description="Birth location latitude"),
-    longitude: float = Query(..., description="Birth location longitude")
+async def get_birth_chart_roast(
+    chart_id: Optional[str] = Query(None, description="Chart id returned by /birth-chart"),
+    birth_date: Optional[str] = Query(None, description="Birth date in YYYY-MM-DD format"),
+    birth_time: Optional[str] = Query(None, description="Birth time in HH:MM format (24-hour)"),
+    latitude: Optional[float] = Query(None, description="Birth location latitude"),
+    longitude: Optional[float] = Query(None, description="Birth location longitude")
 ):
     """Calculate birth chart and generate a roasted interpretation."""
     try:
-        birth_chart = calculate_birth_chart(birth_date, birth_time, latitude, longitude)
-        summary = generate_birth_chart_summary(birth_chart)
-        roasted = roast_agent.run(summary)
+        chart_id, birth_chart = await run_in_threadpool(resolve_chart, chart_id, birth_date, birth_time, latitude, longitude)
+        roasted = chart_store.get_artifact(chart_id, "roast")
+        if roasted is None:
+            summary = generate_birth_chart_summary(birth_chart)
+            roasted = await roast_agent.arun(summary)
+            chart_store.put_artifact(chart_id, "roast", roasted)
         
         return {
+            "chart_id": chart_id,
             "birth_chart": birth_chart,
             "roast": roasted
         }
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -180,70 +298,151 @@ def get_birth_chart_roast(
         )
 
 
+async def stream_per_placement_roasts(chart_id: str, placements: dict, language: str) -> AsyncGenerator[Tuple[str, str, Optional[str]], None]:
+    """
+    Roast each placement separately (library first), then synthesize: one LLM call per miss plus one.
+
+    Yields:
+        (planet or 'overall_synthesis', delta, roast); roast is set once complete
+    """
+    # Pre-generated roasts first; the LLM only writes the placements the library lacks
+    placement_roasts = await run_in_threadpool(lookup_placement_roasts, placements, language, chart_id)
+    for planet, roast in placement_roasts.items():
+        yield planet, "", roast
+
+    semaphore = asyncio.Semaphore(max(1, Config.PLACEMENT_ROAST_CONCURRENCY))
+    # Deltas of all placements in flight, interleaved as they arrive
+    events: asyncio.Queue = asyncio.Queue()
+
+    async def roast_placement(planet: str, data: dict) -> None:
+        async with semaphore:
+            parts = []
+            try:
+                async for delta in roast_agent.astream_placement(data['name'], data['sign'], data['house'], language):
+                    parts.append(delta)
+                    events.put_nowait((planet, delta, None))
+            except Exception as e:
+                logger.error(f"Failed to generate roast for {planet}: {e}")
+                events.put_nowait((planet, "", PLACEMENT_ROAST_FALLBACK))
+                return
+        roast = "".join(parts)
+        # A miss becomes a library variant for the next chart with this placement
+        await run_in_threadpool(save_placement_roast, data['name'], data['sign'], data['house'], language, roast)
+        events.put_nowait((planet, "", roast))
+
+    tasks = [
+        asyncio.ensure_future(roast_placement(planet, data))
+        for planet, data in placements.items() if planet not in placement_roasts
+    ]
+    try:
+        # Stream each planet's tokens as soon as they arrive
+        while len(placement_roasts) < len(placements):
+            planet, delta, roast = await events.get()
+            if roast is not None:
+                placement_roasts[planet] = roast
+            yield planet, delta, roast
+    finally:
+        # Client went away before all placements landed
+        for task in tasks:
+            task.cancel()
+
+    # Keep chart order for the synthesis prompt
+    placement_roasts = {planet: placement_roasts[planet] for planet in placements}
+
+    # Generate synthesis roast after all planet roasts are complete
+    parts = []
+    try:
+        async for delta in roast_agent.astream_birth_chart_synthesis(placement_roasts, language):
+            parts.append(delta)
+            yield 'overall_synthesis', delta, None
+        synthesis = "".join(parts)
+    except Exception as e:
+        logger.error(f"Failed to generate synthesis: {e}")
+        synthesis = SYNTHESIS_ROAST_FALLBACK
+    yield 'overall_synthesis', "", synthesis
+
+
+async def stream_single_call_roasts(placements: dict, language: str) -> AsyncGenerator[Tuple[str, str, Optional[str]], None]:
+    """Roast every placement and the synthesis in one structured LLM call, streaming each field's tokens."""
+    completed = set()
+    try:
+        async for key, delta, roast in roast_agent.astream_chart_roast(placements, language):
+            if roast is not None:
+                completed.add(key)
+            yield key, delta, roast
+    except Exception as e:
+        logger.error(f"Failed to generate chart roast in a single call: {e}")
+    for planet in placements:
+        if planet not in completed:
+            yield planet, "", PLACEMENT_ROAST_FALLBACK
+    if 'overall_synthesis' not in completed:
+        yield 'overall_synthesis', "", SYNTHESIS_ROAST_FALLBACK
+
+
 @router.get("/birth-chart/roast-placements")
 async def get_birth_chart_placement_roasts(
-    birth_date: str = Query(..., description="Birth date in YYYY-MM-DD format"),
-    birth_time: str = Query(..., description="Birth time in HH:MM format (24-hour)"),
-    latitude: float = Query(..., description="Birth location latitude"),
-    longitude: float = Query(..., description="Birth location longitude"),
-    language: str = Query("English", description="Language for roasts (English, French, Russian)")
+    chart_id: Optional[str] = Query(None, description="Chart id returned by /birth-chart"),
+    birth_date: Optional[str] = Query(None, description="Birth date in YYYY-MM-DD format"),
+    birth_time: Optional[str] = Query(None, description="Birth time in HH:MM format (24-hour)"),
+    latitude: Optional[float] = Query(None, description="Birth location latitude"),
+    longitude: Optional[float] = Query(None, description="Birth location longitude"),
+    language: str = Query("English", description="Language for roasts (English, French, Russian)"),
+    mode: Optional[str] = Query(None, description="per_placement (one LLM call per placement) or single (one call for the whole chart)"),
+    last_event_id: Optional[str] = Header(None, description="Id of the last event received, to resume a dropped stream")
 ):
-    """Calculate birth chart and generate a roasted interpretation for each planetary placement."""
+    """Calculate birth chart and stream a roasted interpretation of each planetary placement as server-sent events."""
+    mode = mode or Config.PLACEMENT_ROAST_MODE
+    if mode not in PLACEMENT_ROAST_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid mode. Must be one of: {', '.join(PLACEMENT_ROAST_MODES)}"
+        )
     try:
-        birth_chart = calculate_birth_chart(birth_date, birth_time, latitude, longitude)
+        chart_id, birth_chart = await run_in_threadpool(resolve_chart, chart_id, birth_date, birth_time, latitude, longitude)
         placements = birth_chart.get('planets', {})
+        artifact_name = f"placement_roasts:{language.lower()}"
         
-        async def generate_roasts() -> AsyncGenerator[str, None]:
+        async def generate_roasts() -> AsyncGenerator[dict, None]:
             """Stream roasts as they're generated."""
+            stored = chart_store.get_artifact(chart_id, artifact_name)
+            if stored is not None:
+                # Already generated for this chart and language
+                for planet, roast in stored.items():
+                    yield {'planet': planet, 'roast': roast, 'complete': False}
+                yield {'complete': True, 'all_roasts': stored}
+                return
+
+            if mode == "single":
+                roasts = stream_single_call_roasts(placements, language)
+            else:
+                roasts = stream_per_placement_roasts(chart_id, placements, language)
             placement_roasts = {}
-            
-            for planet, data in placements.items():
-                try:
-                    # Construct a detailed prompt for the agent
-                    prompt = (
-                        f"Generate a witty, insightful, and slightly sarcastic astrological roast "
-                        f"for a person with {data['name']} in {data['sign']} in the {data['house']}th house. "
-                        f"Focus on the unique combination of this planet, sign, and house."
-                    )
-                    
-                    # Run the agent to get the roast with language parameter
-                    roast = roast_agent.run(prompt, language)
-                    placement_roasts[planet] = roast
-                    
-                    # Stream the current planet's roast
-                    yield f"data: {json.dumps({'planet': planet, 'roast': roast, 'complete': False})}\n\n"
-                    
-                    # Small delay to make streaming visible
-                    await asyncio.sleep(0.1)
-                    
-                except Exception as e:
-                    logger.error(f"Failed to generate roast for {planet}: {e}")
-                    placement_roasts[planet] = "Couldn't generate a roast for this placement. It's probably too basic."
-                    yield f"data: {json.dumps({'planet': planet, 'roast': placement_roasts[planet], 'complete': False})}\n\n"
-            
-            # Generate synthesis roast after all planet roasts are complete
             try:
-                synthesis = run_birth_chart_synthesis(placement_roasts, language)
-                placement_roasts['overall_synthesis'] = synthesis
-                
-                # Stream the synthesis
-                yield f"data: {json.dumps({'planet': 'overall_synthesis', 'roast': synthesis, 'complete': False})}\n\n"
-                await asyncio.sleep(0.1)
-            except Exception as e:
-                logger.error(f"Failed to generate synthesis: {e}")
-                synthesis = "Your cosmic blueprint is so complex that even our advanced AI gave up trying to synthesize it into one coherent roast."
-                placement_roasts['overall_synthesis'] = synthesis
-                yield f"data: {json.dumps({'planet': 'overall_synthesis', 'roast': synthesis, 'complete': False})}\n\n"
-            
+                async for planet, delta, roast in roasts:
+                    if roast is None:
+                        # Token delta of a roast still being written
+                        yield {'planet': planet, 'delta': delta, 'complete': False}
+                        continue
+                    placement_roasts[planet] = roast
+                    yield {'planet': planet, 'roast': roast, 'complete': False}
+            finally:
+                # Runs the mode's cleanup now if the generation is cancelled
+                await roasts.aclose()
+
+            # Chart order, synthesis last
+            placement_roasts = {key: placement_roasts[key] for key in [*placements, 'overall_synthesis']}
+            # Failed generations are never cached: the next request retries them
+            failed = {PLACEMENT_ROAST_FALLBACK, SYNTHESIS_ROAST_FALLBACK}
+            if not failed.intersection(placement_roasts.values()):
+                chart_store.put_artifact(chart_id, artifact_name, placement_roasts)
             # Send completion signal
-            yield f"data: {json.dumps({'complete': True, 'all_roasts': placement_roasts})}\n\n"
+            yield {'complete': True, 'all_roasts': placement_roasts}
         
-        return StreamingResponse(
-            generate_roasts(),
-            media_type="text/plain",
-            headers={"Cache-Control": "no-cache", "Connection": "keep-alive"}
-        )
+        # Generation outlives the connection, so a client reconnecting with Last-Event-ID resumes it
+        return event_stream_response(f"placements:{chart_id}:{language.lower()}:{mode}", generate_roasts, last_event_id)
         
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -256,135 +455,55 @@ async def get_birth_chart_placement_roasts(
 
 @router.get("/birth-chart/plot")
 def plot_birth_chart(
-    birth_date: str = Query(..., description="Birth date in YYYY-MM-DD format"),
-    birth_time: str = Query(..., description="Birth time in HH:MM format (24-hour)"),
-    latitude: float = Query(..., description="Birth location latitude"),
-    longitude: float = Query(..., description="Birth location longitude")
+    chart_id: Optional[str] = Query(None, description="Chart id returned by /birth-chart"),
+    birth_date: Optional[str] = Query(None, description="Birth date in YYYY-MM-DD format"),
+    birth_time: Optional[str] = Query(None, description="Birth time in HH:MM format (24-hour)"),
+    latitude: Optional[float] = Query(None, description="Birth location latitude"),
+    longitude: Optional[float] = Query(None, description="Birth location longitude"),
+    image_format: str = Query("png", alias="format", description="Image format: png, webp or svg"),
+    size: Optional[str] = Query(None, description=f"Size preset ({', '.join(SIZE_PRESETS)}) or width in px; print by default"),
+    dpi: Optional[int] = Query(None, description="Resolution recorded in PNG files; the size preset's by default"),
+    if_none_match: Optional[str] = Header(None)
 ):
-    """Generate and return a PNG image of the birth chart wheel in a minimalistic style."""
+    """
+    Generate and return an image of the birth chart wheel in a minimalistic style.
+
+    Images are cached by a hash of the chart positions and render options,
+    which also serves as a strong ETag: a matching If-None-Match gets a 304
+    without rendering.
+    """
+    if image_format not in PLOT_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid format. Must be one of: {', '.join(PLOT_MEDIA_TYPES)}"
+        )
     try:
-        chart = calculate_birth_chart(birth_date, birth_time, latitude, longitude)
-        planets = chart['planets']
-        asc = chart['ascendant']
-        mc = chart['midheaven']
-        
-        all_points = {**planets, 'Ascendant': asc, 'Midheaven': mc}
-
-        # --- Chart Styling ---
-        fig, ax = plt.subplots(figsize=(12, 12), subplot_kw={'projection': 'polar'})
-        ax.set_theta_offset(np.pi)  # Set 0 degrees (Aries) to the left
-        ax.set_theta_direction(1) # Ensure Counter-Clockwise
-        ax.set_xticks([])
-        ax.set_yticks([])
-        ax.spines['polar'].set_visible(False)
-        ax.set_facecolor('#FFFFFF')
-        fig.patch.set_facecolor('#FFFFFF')
-
-        def tangent_rotation(screen_theta_rad: float) -> float:
-            """
-            Returns a text rotation (deg) that keeps the label tangential
-            to the ring *and* upright, using the final screen angle.
-            """
-            deg = np.degrees(screen_theta_rad) % 360
-            rot = deg - 90
-            # Flip text on the bottom half of the screen (180 to 360 degrees)
-            if 180 < deg < 360:
-                rot += 180
-            return rot % 360
-
-        # --- Draw Rings ---
-        ax.fill_between(np.linspace(0, 2 * np.pi, 200), 1.0, 1.2, color='black', zorder=2)
-        ax.fill_between(np.linspace(0, 2 * np.pi, 200), 0.8, 1.0, color='#F0F0F0', zorder=1)
-        ax.fill_between(np.linspace(0, 2 * np.pi, 200), 0, 0.8, color='white', zorder=1)
-        
-        # --- Degree Markers ---
-        for i in range(360):
-            angle = np.deg2rad(i)
-            style = {'color': '#AAAAAA', 'lw': 0.5, 'zorder': 3}
-            if i % 10 == 0:
-                ax.plot([angle, angle], [0.97, 1.0], **style)
-            elif i % 5 == 0:
-                ax.plot([angle, angle], [0.98, 1.0], **style)
-            else:
-                ax.plot([angle, angle], [0.99, 1.0], **style)
-
-        # --- Zodiac Signs and Separators ---
-        for i in range(12):
-            angle_deg_start = i * 30
-            angle_rad_start = np.deg2rad(angle_deg_start)
-            ax.plot([angle_rad_start, angle_rad_start], [1.0, 1.2], color='white', lw=1.5, zorder=3)
-            
-            sign_name = ZODIAC_SIGNS[i][0].upper()
-            data_theta_rad = np.deg2rad(angle_deg_start + 15)
-            
-            # Calculate the final screen angle by applying the offset
-            screen_theta_rad = data_theta_rad + ax.get_theta_offset()
-
-            ax.text(
-                data_theta_rad, # Position is in data coordinates
-                1.1,
-                sign_name,
-                ha='center',
-                va='center',
-                fontsize=11,
-                fontweight='bold',
-                color='white',
-                rotation=tangent_rotation(screen_theta_rad), # Rotation is based on the final screen angle
-                rotation_mode='anchor',
-                zorder=4
-            )
-
-        # --- Plot Planets & Points ---
-        for name, data in all_points.items():
-            angle = np.deg2rad(data['degrees'])
-            radius = 0.9 if name not in ['Ascendant', 'Midheaven'] else 1.0
-            symbol = data['symbol']
-            
-            # Use specific symbols for AC/MC
-            if name == 'Ascendant':
-                symbol = 'AC'
-            elif name == 'Midheaven':
-                symbol = 'MC'
-                
-            ax.text(angle, radius, symbol, ha='center', va='center', fontsize=16 if name in ['Ascendant', 'Midheaven'] else 14, 
-                    color='black', zorder=5, bbox=dict(boxstyle='circle,pad=0.2', fc='white', ec='none'))
-            
-            # Planet degree labels
-            if name not in ['Ascendant', 'Midheaven']:
-                 ax.text(angle, 0.82, f"{data['sign_degrees']:.0f}°", ha='center', va='center', fontsize=8, color='#555', zorder=5)
-
-        # --- Calculate and Draw Aspects ---
-        ASPECTS = {
-            'Conjunction': (0, 8, 'solid', 1.0),
-            'Opposition': (180, 8, 'solid', 1.0),
-            'Trine': (120, 7, 'solid', 0.8),
-            'Square': (90, 7, 'dashed', 0.8),
-            'Sextile': (60, 5, 'dashed', 0.6),
+        options = resolve_render_options(image_format, size, dpi)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        chart_id, chart = resolve_chart(chart_id, birth_date, birth_time, latitude, longitude)
+        key = render_key(chart, options)
+        headers = {
+            "ETag": f'"{key}"',
+            # The URL names birth data, not the image, so revalidate rather than mark it immutable
+            "Cache-Control": f"public, max-age={Config.RENDER_CACHE_MAX_AGE}",
         }
-        
-        # Only use planets for aspects, not AC/MC
-        aspect_points = list(planets.values())
-        
-        for p1, p2 in combinations(aspect_points, 2):
-            angle_diff = abs(p1['degrees'] - p2['degrees'])
-            angle_diff = min(angle_diff, 360 - angle_diff)
-
-            for name, (deg, orb, style, alpha) in ASPECTS.items():
-                if abs(angle_diff - deg) <= orb:
-                    angle1 = np.deg2rad(p1['degrees'])
-                    angle2 = np.deg2rad(p2['degrees'])
-                    ax.plot([angle1, angle2], [0.8, 0.8], color='#AAAAAA', ls=style, lw=0.8, zorder=1, alpha=alpha)
-                    break
-                    
-        # Final adjustments
-        ax.set_ylim(0, 1.2)
-        
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png', dpi=300, bbox_inches='tight', pad_inches=0.1, facecolor=fig.get_facecolor())
-        plt.close(fig)
-        buf.seek(0)
-        return StreamingResponse(buf, media_type='image/png')
-        
+        if etag_matches(if_none_match, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+
+        image = render_cache.get(key)
+        if image is None:
+            image = render_plot(chart, options)
+            render_cache.set(key, image)
+        return Response(content=image, media_type=PLOT_MEDIA_TYPES[image_format], headers=headers)
+
+    except HTTPException:
+        raise
+    except RenderPoolFull:
+        raise HTTPException(status_code=503, detail="Chart renderer is busy, please retry shortly.", headers={"Retry-After": "2"})
+    except TimeoutError:
+        raise HTTPException(status_code=504, detail="Chart rendering timed out.")
     except Exception as e:
         logger.error(f"Error generating new chart plot: {e}")
         import traceback
@@ -392,32 +511,67 @@ def plot_birth_chart(
         raise HTTPException(status_code=500, detail="Failed to generate chart image.")
 
 
+async def fetch_horoscope_text(sign: str, period: str, bucket: str) -> Tuple[str, bool]:
+    """
+    Horoscope text for a sign and period, scraped once per cache bucket.
+
+    Returns:
+        (text, whether it came from the cache)
+    """
+    cached = load_from_cache(sign, period, bucket)
+    if cached is not None:
+        logger.info(f"Using cached horoscope for {sign} ({period})")
+        return cached, True
+
+    logger.info(f"Fetching fresh horoscope for {sign} ({period})")
+
+    async def fetch_text() -> str:
+        text = await run_in_threadpool(run_scraper, sign, period)
+        save_to_cache(sign, period, text, bucket)
+        return text
+
+    return await scrape_flight.ado((sign, period, bucket), fetch_text), False
+
+
 @router.get("/horoscope/{sign}")
-def get_horoscope(sign: str, period: str = Query("daily", description="Time period: daily, yesterday, tomorrow, weekly, monthly"), language: str = Query("English", description="Language for roasts (English, French, Russian)")):
+async def get_horoscope(sign: str, period: str = Query("daily", description="Time period: daily, yesterday, tomorrow, weekly, monthly"), language: str = Query("English", description="Language for roasts (English, French, Russian)")):
     """Get horoscope for a specific sign and time period."""
-    valid_periods = ["daily", "yesterday", "tomorrow", "weekly", "monthly"]
-    if period not in valid_periods:
+    if period not in HOROSCOPE_PERIODS:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid period. Must be one of: {', '.join(valid_periods)}"
+            detail=f"Invalid period. Must be one of: {', '.join(HOROSCOPE_PERIODS)}"
         )
     
     try:
-        cached = load_from_cache(sign, period)
-        if cached is None:
-            logger.info(f"Fetching fresh horoscope for {sign} ({period})")
-            text = run_scraper(sign, period)
-            save_to_cache(sign, period, text)
-        else:
-            logger.info(f"Using cached horoscope for {sign} ({period})")
-            text = cached
-        
-        roasted = roast_agent.run_categorized(text, language)
+        # Generation being served; stays on the previous one until a refresh publishes
+        bucket = current_bucket(period)
+        roasted = load_roast_from_cache(sign, period, language, bucket)
+        if roasted is not None:
+            logger.info(f"Using cached roast for {sign} ({period}, {language})")
+            return {
+                "sign": sign,
+                "period": period,
+                "roast": roasted,
+                "source": "cached",
+                "roast_cache": "hit"
+            }
+
+        text, cached = await fetch_horoscope_text(sign, period, bucket)
+
+        async def roast_text() -> dict:
+            roasted = await roast_agent.arun_categorized(text, language)
+            # Failed generations are shared with waiting callers but never cached
+            if roasted != CATEGORIZED_ROAST_FALLBACK:
+                save_roast_to_cache(sign, period, language, roasted, bucket)
+            return roasted
+
+        roasted = await roast_flight.ado((sign.lower(), period, language.lower(), bucket), roast_text)
         return {
             "sign": sign, 
             "period": period,
             "roast": roasted, 
-            "source": "cached" if cached else "fresh"
+            "source": "cached" if cached else "fresh",
+            "roast_cache": "miss"
         }
     except Exception as e:
         logger.error(f"Error processing horoscope for {sign} ({period}): {e}")
@@ -427,50 +581,111 @@ def get_horoscope(sign: str, period: str = Query("daily", description="Time peri
         )
 
 
+@router.get("/horoscope/{sign}/stream")
+async def stream_horoscope(
+    sign: str,
+    period: str = Query("daily", description="Time period: daily, yesterday, tomorrow, weekly, monthly"),
+    language: str = Query("English", description="Language for roasts (English, French, Russian)"),
+    last_event_id: Optional[str] = Header(None, description="Id of the last event received, to resume a dropped stream")
+):
+    """Stream the horoscope roast category by category, token by token, as server-sent events."""
+    if period not in HOROSCOPE_PERIODS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid period. Must be one of: {', '.join(HOROSCOPE_PERIODS)}"
+        )
+
+    try:
+        bucket = current_bucket(period)
+        roasted = load_roast_from_cache(sign, period, language, bucket)
+        text, cached = None, True
+        if roasted is None:
+            text, cached = await fetch_horoscope_text(sign, period, bucket)
+    except Exception as e:
+        logger.error(f"Error processing horoscope for {sign} ({period}): {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to process horoscope for {sign}. Please try again later."
+        )
+
+    async def generate_roast() -> AsyncGenerator[dict, None]:
+        """Stream token deltas, then each finished category, then the whole roast."""
+        roast = roasted
+        if roast is not None:
+            logger.info(f"Using cached roast for {sign} ({period}, {language})")
+        else:
+            roast = {}
+            try:
+                async for category, delta, complete in roast_agent.astream_categorized(text, language):
+                    if complete is None:
+                        yield {'category': category, 'delta': delta, 'complete': False}
+                    else:
+                        roast[category] = complete
+                        yield {'category': category, 'roast': complete, 'complete': False}
+                # Validated against CategorizedRoast by the agent before the last category completed
+                save_roast_to_cache(sign, period, language, roast, bucket)
+            except Exception as e:
+                # Failed generations are never cached
+                logger.error(f"Failed to stream roast for {sign} ({period}): {e}")
+                roast = dict(CATEGORIZED_ROAST_FALLBACK)
+        # The complete event carries the whole roast, so cached and fallback roasts need no per-category events
+        yield {
+            'complete': True,
+            'sign': sign,
+            'period': period,
+            'roast': roast,
+            'source': 'cached' if cached else 'fresh',
+            'roast_cache': 'hit' if roasted is not None else 'miss'
+        }
+
+    stream_key = f"horoscope:{sign.lower()}:{period}:{language.lower()}:{bucket}"
+    return event_stream_response(stream_key, generate_roast, last_event_id)
+
+
 @router.get("/horoscope/{sign}/daily")
-def get_daily_horoscope(sign: str):
+async def get_daily_horoscope(sign: str):
     """Legacy endpoint for daily horoscope - redirects to new endpoint."""
-    return get_horoscope(sign, "daily")
+    return await get_horoscope(sign, "daily", "English")
 
 
 @router.get("/horoscope/{sign}/yesterday")
-def get_yesterday_horoscope(sign: str):
+async def get_yesterday_horoscope(sign: str):
     """Get yesterday's horoscope for a sign."""
-    return get_horoscope(sign, "yesterday")
+    return await get_horoscope(sign, "yesterday", "English")
 
 
 @router.get("/horoscope/{sign}/tomorrow")
-def get_tomorrow_horoscope(sign: str):
+async def get_tomorrow_horoscope(sign: str):
     """Get tomorrow's horoscope for a sign."""
-    return get_horoscope(sign, "tomorrow")
+    return await get_horoscope(sign, "tomorrow", "English")
 
 
 @router.get("/horoscope/{sign}/weekly")
-def get_weekly_horoscope(sign: str):
+async def get_weekly_horoscope(sign: str):
     """Get weekly horoscope for a sign."""
-    return get_horoscope(sign, "weekly")
+    return await get_horoscope(sign, "weekly", "English")
 
 
 @router.get("/horoscope/{sign}/monthly")
-def get_monthly_horoscope(sign: str):
+async def get_monthly_horoscope(sign: str):
     """Get monthly horoscope for a sign."""
-    return get_horoscope(sign, "monthly")
+    return await get_horoscope(sign, "monthly", "English")
 
 
 @router.get("/sign/{sign}/description")
-def get_sign_description(sign: str, language: str = Query("English", description="Language for roasts (English, French, Russian)")):
+async def get_sign_description(sign: str, language: str = Query("English", description="Language for roasts (English, French, Russian)")):
     try:
         cached = load_from_cache(sign, "description")
         if cached is None:
             logger.info(f"Fetching fresh description for {sign}")
             # Placeholder for future implementation
-            description = run_scraper(sign, "daily")
+            description = await scrape_flight.ado((sign, "description"), run_in_threadpool, run_scraper, sign, "daily")
             save_to_cache(sign, "description", description)
         else:
             logger.info(f"Using cached description for {sign}")
             description = cached
         
-        roasted = roast_agent.run(description, language)
+        roasted = await roast_agent.arun(description, language)
         return {"sign": sign, "personality": roasted, "source": "cached" if cached else "fresh"}
     except Exception as e:
         logger.error(f"Error processing description for {sign}: {e}")
@@ -1,25 +1,378 @@
+import hashlib
 import json
+import os
+import tempfile
+import threading
+import time as clock
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Hashable, List, Optional, Tuple, Union
+from backend.core.config import Config
 
 CACHE_DIR = Path(__file__).resolve().parent.parent / ".." / "data" / "horoscopes"
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
+# Periods whose content rolls over at midnight
+DAILY_PERIODS = ["daily", "yesterday", "tomorrow"]
 
-def cache_path(sign: str, period: str) -> Path:
-    return CACHE_DIR / f"{sign}_{period}.json"
+# Every cache created in the process, for metrics
+_registry: List[Union["TieredCache", "RenderCache"]] = []
 
 
-def save_to_cache(sign: str, period: str, text: str) -> None:
-    path = cache_path(sign, period)
-    with path.open("w", encoding="utf-8") as f:
-        json.dump({"text": text}, f)
+class TieredCache:
+    """
+    Bounded in-process LRU with TTL in front of a disk store.
 
+    Keys are namespaced and versioned so a format change only needs a version
+    bump. Disk entries are written to a temporary file and renamed into place,
+    so concurrent workers never read a partially written entry.
+    """
 
-def load_from_cache(sign: str, period: str) -> Optional[str]:
-    path = cache_path(sign, period)
-    if not path.exists():
+    def __init__(self, namespace: str, version: int = 1, max_entries: Optional[int] = None, directory: Path = CACHE_DIR) -> None:
+        self.namespace = namespace
+        self.version = version
+        self.max_entries = max_entries or Config.CACHE_MAX_ENTRIES
+        self.directory = directory / namespace / f"v{version}"
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # full key -> (expires_at epoch or None, value)
+        self._memory: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "evictions": 0, "expirations": 0}
+        _registry.append(self)
+
+    def _full_key(self, key: Hashable) -> str:
+        parts = key if isinstance(key, tuple) else (key,)
+        return f"{self.namespace}:v{self.version}:" + "|".join(str(part) for part in parts)
+
+    def _path(self, full_key: str) -> Path:
+        return self.directory / f"{hashlib.sha256(full_key.encode('utf-8')).hexdigest()}.json"
+
+    def _remember(self, full_key: str, expires_at: Optional[float], value: Any) -> None:
+        # Caller holds the lock
+        self._memory[full_key] = (expires_at, value)
+        self._memory.move_to_end(full_key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        full_key = self._full_key(key)
+        now = clock.time()
+        with self._lock:
+            entry = self._memory.get(full_key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > now:
+                    self._memory.move_to_end(full_key)
+                    self._stats["hits"] += 1
+                    return value
+                del self._memory[full_key]
+                self._stats["expirations"] += 1
+
+        entry = self._read_disk(full_key)
+        with self._lock:
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= now:
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                self._path(full_key).unlink(missing_ok=True)
+                return None
+            self._stats["disk_hits"] += 1
+            self._remember(full_key, expires_at, value)
+        return value
+
+    def set(self, key: Hashable, value: Any, expires_at: Optional[datetime] = None) -> None:
+        full_key = self._full_key(key)
+        expires_ts = expires_at.timestamp() if expires_at is not None else None
+        with self._lock:
+            self._remember(full_key, expires_ts, value)
+            self._stats["writes"] += 1
+        self._write_disk(full_key, {"key": full_key, "expires_at": expires_ts, "value": value})
+
+    def delete(self, key: Hashable) -> None:
+        full_key = self._full_key(key)
+        with self._lock:
+            self._memory.pop(full_key, None)
+        self._path(full_key).unlink(missing_ok=True)
+
+    def purge_expired(self) -> int:
+        """Remove expired entries from disk, returning how many were dropped."""
+        now = clock.time()
+        removed = 0
+        for path in self.directory.glob("*.json"):
+            try:
+                with path.open("r", encoding="utf-8") as f:
+                    expires_at = json.load(f).get("expires_at")
+                if expires_at is not None and expires_at <= now:
+                    path.unlink(missing_ok=True)
+                    removed += 1
+            except (OSError, ValueError):
+                continue
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        stats["max_entries"] = self.max_entries
+        return stats
+
+    def _read_disk(self, full_key: str) -> Optional[Tuple[Optional[float], Any]]:
+        path = self._path(full_key)
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Guard against hash collisions
+        if data.get("key") != full_key:
+            return None
+        return data.get("expires_at"), data.get("value")
+
+    def _write_disk(self, full_key: str, data: Dict[str, Any]) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(full_key))
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+
+class RenderCache:
+    """
+    Rendered images by content hash, in a byte-bounded memory LRU in front of
+    a byte-bounded disk store.
+
+    Keys are hashes of everything a render depends on, so entries never go
+    stale and are only dropped for space. Disk entries are written to a
+    temporary file and renamed into place; the least recently used files are
+    deleted once the directory exceeds its budget.
+    """
+
+    def __init__(self, namespace: str, memory_bytes: int, disk_bytes: int, version: int = 1, directory: Path = CACHE_DIR) -> None:
+        self.namespace = namespace
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.directory = directory / namespace / f"v{version}"
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_size = 0
+        self._disk_size = sum(entry.stat().st_size for entry in self.directory.glob("*.bin"))
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "evictions": 0, "disk_evictions": 0}
+        _registry.append(self)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.bin"
+
+    def _remember(self, key: str, data: bytes) -> None:
+        # Caller holds the lock
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_size -= len(previous)
+        if len(data) > self.memory_bytes:
+            return
+        self._memory[key] = data
+        self._memory_size += len(data)
+        while self._memory_size > self.memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted)
+            self._stats["evictions"] += 1
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self._stats["hits"] += 1
+                return data
+
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            # Mark as recently used for disk eviction
+            os.utime(path)
+        except OSError:
+            data = None
+        with self._lock:
+            if data is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["disk_hits"] += 1
+            self._remember(key, data)
+        return data
+
+    def set(self, key: str, data: bytes) -> None:
+        with self._lock:
+            self._remember(key, data)
+            self._stats["writes"] += 1
+        path = self._path(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        with self._lock:
+            self._disk_size += len(data)
+            over_budget = self._disk_size > self.disk_bytes
+        if over_budget:
+            self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        entries = []
+        for path in self.directory.glob("*.bin"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        # Down to 90% of the budget so every write does not trigger a scan
+        for _, size, path in entries:
+            if total <= self.disk_bytes * 0.9:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            evicted += 1
+        with self._lock:
+            self._disk_size = total
+            self._stats["disk_evictions"] += evicted
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+            stats["memory_bytes"] = self._memory_size
+            stats["disk_bytes"] = self._disk_size
+        stats["max_memory_bytes"] = self.memory_bytes
+        stats["max_disk_bytes"] = self.disk_bytes
+        return stats
+
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Hit/miss/eviction counters for every cache in the process."""
+    return {cache.namespace: cache.stats() for cache in _registry}
+
+
+# Scraped source texts: (sign, period, bucket) -> text
+text_cache = TieredCache("horoscope_text")
+# Materialized roasts: (sign, period, language, bucket) -> roast
+roast_cache = TieredCache("roast")
+# Rendered chart images: render hash -> image bytes
+render_cache = RenderCache("chart_render", Config.RENDER_CACHE_MEMORY_BYTES, Config.RENDER_CACHE_DISK_BYTES)
+
+# Latest complete generation per period: period -> (bucket, expires_at)
+_published_buckets: Dict[str, Tuple[str, datetime]] = {}
+
+
+def _bucket_expiry(period: str, bucket: Optional[str]) -> Optional[datetime]:
+    # Keep a generation through the refresh grace so it can still be served
+    if not bucket or period not in DAILY_PERIODS + ["weekly", "monthly"]:
         return None
-    with path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
-        return data.get("text")
+    return period_expires_at(period, _bucket_start(period, bucket)) + timedelta(seconds=Config.REFRESH_GRACE_SECONDS)
+
+
+def save_to_cache(sign: str, period: str, text: str, bucket: Optional[str] = None) -> None:
+    text_cache.set((sign.lower(), period, bucket or ""), text, _bucket_expiry(period, bucket))
+
+
+def load_from_cache(sign: str, period: str, bucket: Optional[str] = None) -> Optional[str]:
+    """Return cached text for a sign, period and bucket."""
+    return text_cache.get((sign.lower(), period, bucket or ""))
+
+
+def period_bucket(period: str, now: Optional[datetime] = None) -> str:
+    """Return the calendar bucket (day, ISO week or month) a period belongs to."""
+    today = (now or datetime.now()).date()
+    if period == "weekly":
+        year, week, _ = today.isocalendar()
+        return f"{year}-W{week:02d}"
+    if period == "monthly":
+        return today.strftime("%Y-%m")
+    return today.isoformat()
+
+
+def period_expires_at(period: str, now: Optional[datetime] = None) -> datetime:
+    """Return the boundary at which content for the current period bucket goes stale."""
+    today = (now or datetime.now()).date()
+    if period == "weekly":
+        boundary = today + timedelta(days=7 - today.weekday())
+    elif period == "monthly":
+        boundary = date(today.year + today.month // 12, today.month % 12 + 1, 1)
+    else:
+        boundary = today + timedelta(days=1)
+    return datetime.combine(boundary, time.min)
+
+
+def _bucket_start(period: str, bucket: str) -> datetime:
+    if period == "weekly":
+        return datetime.strptime(f"{bucket}-1", "%G-W%V-%u")
+    if period == "monthly":
+        return datetime.strptime(bucket, "%Y-%m")
+    return datetime.strptime(bucket, "%Y-%m-%d")
+
+
+def current_bucket(period: str, now: Optional[datetime] = None) -> str:
+    """
+    Return the bucket requests should be served from.
+
+    After a boundary the previous generation keeps being served for up to
+    REFRESH_GRACE_SECONDS, until the refresh scheduler publishes its replacement.
+    """
+    now = now or datetime.now()
+    wall_bucket = period_bucket(period, now)
+    published = _published_buckets.get(period)
+    if published is None:
+        return wall_bucket
+    bucket, expires_at = published
+    if bucket != wall_bucket and expires_at <= now < expires_at + timedelta(seconds=Config.REFRESH_GRACE_SECONDS):
+        return bucket
+    return wall_bucket
+
+
+def publish_generation(
+    period: str,
+    bucket: str,
+    texts: Dict[str, str],
+    roasts: Optional[Dict[Tuple[str, str], dict]] = None,
+) -> None:
+    """
+    Store a complete generation for a period and make it the one being served.
+
+    Args:
+        period: Time period the generation belongs to
+        bucket: Calendar bucket of the generation
+        texts: Dictionary with structure {sign: text}
+        roasts: Dictionary with structure {(sign, language): roast}
+    """
+    for sign, text in texts.items():
+        save_to_cache(sign, period, text, bucket)
+    for (sign, language), roast in (roasts or {}).items():
+        save_roast_to_cache(sign, period, language, roast, bucket)
+    _published_buckets[period] = (bucket, period_expires_at(period, _bucket_start(period, bucket)))
+
+
+def roast_cache_key(sign: str, period: str, language: str, bucket: str) -> Tuple[str, str, str, str]:
+    return (sign.lower(), period, language.lower(), bucket)
+
+
+def save_roast_to_cache(sign: str, period: str, language: str, roast: dict, bucket: Optional[str] = None) -> None:
+    """Store a generated roast until the end of its period bucket (plus the refresh grace)."""
+    bucket = bucket or current_bucket(period)
+    roast_cache.set(roast_cache_key(sign, period, language, bucket), roast, _bucket_expiry(period, bucket))
+
+
+def load_roast_from_cache(sign: str, period: str, language: str, bucket: Optional[str] = None) -> Optional[dict]:
+    """Return the cached roast for a bucket (the one being served by default), if any."""
+    return roast_cache.get(roast_cache_key(sign, period, language, bucket or current_bucket(period)))
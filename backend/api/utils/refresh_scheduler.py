@@ -0,0 +1,211 @@
+"""
+Refresh-ahead scheduler that rebuilds horoscope generations around period boundaries.
+
+Every API worker runs a scheduler. Each draws its own jitter, and the first to
+reach a boundary takes its lease in an SQLite table in the data directory;
+the others skip that run.
+"""
+import logging
+import os
+import random
+import socket
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from backend.agents.roast_agent import agent as roast_agent
+from backend.agents.scraper_agent.agent import run_scraper
+from backend.core.config import Config
+from .caching import load_from_cache, period_bucket, period_expires_at, publish_generation
+from .warmup import ALL_SIGNS
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshJob(NamedTuple):
+    """A refresh run for one boundary."""
+    name: str
+    run_at: datetime
+    boundary: datetime
+    # target period -> upstream period to scrape for it
+    sources: Dict[str, str]
+
+
+# Upstream can serve the next day ahead of midnight: today's "tomorrow" becomes
+# tomorrow's "daily" and today's "daily" becomes tomorrow's "yesterday".
+# Everything else only exists once its boundary has passed.
+_AHEAD_SOURCES = {"daily": "tomorrow", "yesterday": "daily"}
+_AFTER_SOURCES = {
+    "daily": {"tomorrow": "tomorrow"},
+    "weekly": {"weekly": "weekly"},
+    "monthly": {"monthly": "monthly"},
+}
+
+_stop_event = threading.Event()
+_scheduler_thread: Optional[threading.Thread] = None
+_completed: Dict[str, datetime] = {}
+_jitters: Dict[Tuple[str, datetime], timedelta] = {}
+
+LEASE_DIR = Path(__file__).resolve().parent.parent / ".." / "data" / "refresh"
+LEASE_DB_FILENAME = "leases.sqlite3"
+# Leases older than this are deleted when a new one is taken
+LEASE_RETENTION_SECONDS = 90 * 86400
+
+LEASE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS leases (
+    job TEXT NOT NULL,
+    boundary TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    taken_at REAL NOT NULL,
+    PRIMARY KEY (job, boundary)
+) WITHOUT ROWID;
+"""
+
+
+def _jitter(name: str, boundary: datetime, limit: float) -> timedelta:
+    # Drawn once per boundary so recomputing the schedule does not move the job
+    key = (name, boundary)
+    if key not in _jitters:
+        for old in [old for old in _jitters if old[0] == name]:
+            del _jitters[old]
+        _jitters[key] = timedelta(seconds=random.uniform(0, max(0.0, limit)))
+    return _jitters[key]
+
+
+def _take_lease(job: RefreshJob) -> bool:
+    """
+    Claim a job's boundary for this process.
+
+    Returns:
+        False when another worker already took it. True when this process
+        took it, or when the lease database failed: a duplicate refresh is
+        better than none
+    """
+    try:
+        LEASE_DIR.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(LEASE_DIR / LEASE_DB_FILENAME), timeout=5.0, isolation_level=None)
+        try:
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.executescript(LEASE_SCHEMA)
+            now = time.time()
+            taken = conn.execute(
+                "INSERT OR IGNORE INTO leases (job, boundary, owner, taken_at) VALUES (?, ?, ?, ?)",
+                (job.name, job.boundary.isoformat(), f"{socket.gethostname()}:{os.getpid()}", now),
+            ).rowcount == 1
+            conn.execute("DELETE FROM leases WHERE taken_at < ?", (now - LEASE_RETENTION_SECONDS,))
+            return taken
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logger.warning(f"Refresh lease for {job.name} unavailable, running anyway: {e}")
+        return True
+
+
+def upcoming_jobs(now: Optional[datetime] = None) -> List[RefreshJob]:
+    """Return the next run of every refresh job, earliest first."""
+    now = now or datetime.now()
+    jobs = []
+    midnight = period_expires_at("daily", now)
+    lead = timedelta(seconds=Config.REFRESH_LEAD_SECONDS)
+    ahead_jitter = min(Config.REFRESH_JITTER_SECONDS, Config.REFRESH_LEAD_SECONDS / 2)
+    jobs.append(RefreshJob(
+        "daily-ahead",
+        midnight - lead + _jitter("daily-ahead", midnight, ahead_jitter),
+        midnight,
+        _AHEAD_SOURCES,
+    ))
+    for group, sources in _AFTER_SOURCES.items():
+        name = f"{group}-after"
+        boundary = period_expires_at(group, now)
+        # A boundary we crossed but have not refreshed yet is still due
+        previous = period_expires_at(group, now - timedelta(seconds=Config.REFRESH_GRACE_SECONDS))
+        if previous <= now and _completed.get(name) != previous:
+            boundary = previous
+        jobs.append(RefreshJob(name, boundary + _jitter(name, boundary, Config.REFRESH_JITTER_SECONDS), boundary, sources))
+    return sorted(
+        (job for job in jobs if _completed.get(job.name) != job.boundary),
+        key=lambda job: job.run_at,
+    )
+
+
+def run_refresh_job(job: RefreshJob) -> None:
+    """Scrape and roast every sign for a job's periods, then publish each period at once."""
+    languages = [lang.strip() for lang in Config.REFRESH_LANGUAGES.split(",") if lang.strip()]
+    logger.info(f"Refresh job {job.name} starting for boundary {job.boundary.isoformat()}")
+
+    for period, upstream_period in job.sources.items():
+        bucket = period_bucket(period, job.boundary)
+        texts: Dict[str, str] = {}
+        roasts: Dict[Tuple[str, str], dict] = {}
+        for sign in ALL_SIGNS:
+            if _stop_event.is_set():
+                return
+            try:
+                # Reuse what we already hold when shifting daily into yesterday
+                text = None
+                if period == "yesterday":
+                    text = load_from_cache(sign, "daily", period_bucket("daily", job.boundary - timedelta(days=1)))
+                texts[sign] = text or run_scraper(sign, upstream_period)
+                for language in languages:
+                    roast = roast_agent.run_categorized(texts[sign], language)
+                    if roast != roast_agent.CATEGORIZED_ROAST_FALLBACK:
+                        roasts[(sign, language)] = roast
+            except Exception as e:
+                logger.error(f"Refresh of {sign} ({period}) failed: {e}")
+            # Stagger items so upstream and OpenAI see a trickle, not a burst
+            _stop_event.wait(Config.REFRESH_STAGGER_SECONDS)
+
+        if len(texts) < len(ALL_SIGNS):
+            # Keep serving the previous generation; requests fill the gaps on demand
+            logger.warning(f"Refresh of {period} incomplete ({len(texts)}/{len(ALL_SIGNS)} signs), not publishing")
+            continue
+        publish_generation(period, bucket, texts, roasts)
+        logger.info(f"Published {period} generation {bucket} with {len(roasts)} roasts")
+
+
+def _scheduler_loop() -> None:
+    while not _stop_event.is_set():
+        jobs = upcoming_jobs()
+        if not jobs:
+            _stop_event.wait(60)
+            continue
+        job = jobs[0]
+        delay = (job.run_at - datetime.now()).total_seconds()
+        if delay > 0:
+            # Wake up at least hourly so clock changes are picked up
+            _stop_event.wait(min(delay, 3600))
+            continue
+        if _take_lease(job):
+            try:
+                run_refresh_job(job)
+            except Exception as e:
+                logger.error(f"Refresh job {job.name} failed: {e}")
+        else:
+            logger.info(f"Refresh job {job.name} for {job.boundary.isoformat()} taken by another worker")
+        _completed[job.name] = job.boundary
+
+
+def start_refresh_scheduler() -> None:
+    """Start the refresh scheduler in a daemon thread."""
+    global _scheduler_thread
+    if not Config.REFRESH_ENABLED:
+        logger.info("Refresh scheduler disabled")
+        return
+    if _scheduler_thread is not None and _scheduler_thread.is_alive():
+        return
+    # The startup warmup already fetched content for boundaries crossed before boot
+    now = datetime.now()
+    for group in _AFTER_SOURCES:
+        previous = period_expires_at(group, now - timedelta(seconds=Config.REFRESH_GRACE_SECONDS))
+        if previous <= now:
+            _completed.setdefault(f"{group}-after", previous)
+    _stop_event.clear()
+    _scheduler_thread = threading.Thread(target=_scheduler_loop, name="horoscope-refresh", daemon=True)
+    _scheduler_thread.start()
+
+
+def stop_refresh_scheduler() -> None:
+    """Ask the scheduler to stop after its current item."""
+    _stop_event.set()
@@ -0,0 +1,189 @@
+"""
+Server-sent events for roast streams.
+
+Generation runs as a background task that appends events to a buffer; each
+client connection only reads that buffer. Events carry ids, so a client that
+drops and reconnects with Last-Event-ID picks up after the last event it saw
+instead of starting a new generation. Buffers are kept for
+SSE_BUFFER_TTL_SECONDS after the generation finishes, at most SSE_MAX_BUFFERS
+at a time; a failed generation's buffer is dropped at once so a retry starts
+over. Concurrent requests for the same stream key share one generation.
+
+Buffers live in process memory: with several API workers, a reconnect that
+lands on another worker starts over (from the chart store or caches when the
+first generation already finished).
+"""
+import asyncio
+import json
+import logging
+import secrets
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+from fastapi.responses import StreamingResponse
+from backend.core.config import Config
+
+logger = logging.getLogger(__name__)
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    # Stop nginx from buffering the stream
+    "X-Accel-Buffering": "no",
+}
+
+_buffers: Dict[str, "EventBuffer"] = {}
+_stats = {"streams": 0, "shared": 0, "resumed": 0, "failed": 0, "evicted": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(name: str) -> None:
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def format_event(data: Dict[str, Any], event_id: Optional[str] = None, event: Optional[str] = None) -> str:
+    """Encode one event in the text/event-stream format."""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event is not None:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data)}")
+    return "\n".join(lines) + "\n\n"
+
+
+class EventBuffer:
+    """The events of one generation, readable by any number of connections."""
+
+    def __init__(self, key: str) -> None:
+        self.key = key
+        # Ties event ids to this generation, so ids from an expired one are not resumed
+        self.token = secrets.token_hex(4)
+        self.events: List[str] = []
+        self.done = False
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    def expired(self, now: float) -> bool:
+        return self.done and now - self.finished_at > Config.SSE_BUFFER_TTL_SECONDS
+
+    def _notify(self) -> None:
+        # Wake everyone waiting on the current event, then start a new one
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def append(self, data: Dict[str, Any]) -> None:
+        self.events.append(format_event(data, f"{self.token}-{len(self.events)}"))
+        self._notify()
+
+    async def run(self, source: AsyncIterator[Dict[str, Any]]) -> None:
+        """Drain the generator into the buffer."""
+        failed = False
+        try:
+            async for data in source:
+                self.append(data)
+        except Exception as e:
+            failed = True
+            _count("failed")
+            logger.error(f"Event stream {self.key} failed: {e}")
+            self.append({"complete": True, "error": "Generation failed. Please try again."})
+        finally:
+            self.done = True
+            self.finished_at = time.monotonic()
+            self._notify()
+            if failed:
+                # Connected clients still get the error; new requests generate again
+                _discard(self)
+            else:
+                asyncio.get_running_loop().call_later(Config.SSE_BUFFER_TTL_SECONDS, _discard, self)
+
+    def resume_index(self, last_event_id: Optional[str]) -> int:
+        """Index of the first event a client that last saw last_event_id is missing."""
+        if not last_event_id:
+            return 0
+        token, _, index = last_event_id.strip().rpartition("-")
+        if token != self.token or not index.isdigit():
+            return 0
+        _count("resumed")
+        return min(int(index) + 1, len(self.events))
+
+    async def subscribe(self, last_event_id: Optional[str] = None) -> AsyncIterator[str]:
+        """Replay buffered events after last_event_id, then follow the generation with heartbeats."""
+        yield f"retry: {Config.SSE_RETRY_MS}\n\n"
+        index = self.resume_index(last_event_id)
+        while True:
+            while index < len(self.events):
+                yield self.events[index]
+                index += 1
+            if self.done:
+                return
+            changed = self._changed
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=Config.SSE_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                # Comment line: keeps proxies and mobile networks from closing an idle connection
+                yield ": heartbeat\n\n"
+
+
+def _discard(buffer: EventBuffer) -> None:
+    # A newer generation may hold the key by now
+    if _buffers.get(buffer.key) is buffer:
+        del _buffers[buffer.key]
+
+
+def _prune(now: float) -> None:
+    for key in [key for key, buffer in _buffers.items() if buffer.expired(now)]:
+        del _buffers[key]
+    # Over the cap: drop the oldest, finished ones first. Clients already
+    # reading a dropped buffer keep it; it just can no longer be resumed.
+    excess = len(_buffers) - max(0, Config.SSE_MAX_BUFFERS - 1)
+    if excess > 0:
+        oldest = sorted(_buffers.values(), key=lambda buffer: not buffer.done)[:excess]
+        for buffer in oldest:
+            del _buffers[buffer.key]
+            _count("evicted")
+
+
+def get_event_buffer(key: str, source: Callable[[], AsyncIterator[Dict[str, Any]]]) -> EventBuffer:
+    """
+    Return the live buffer for a stream key, starting the generation if there is none.
+
+    Args:
+        key: Identifies the content, e.g. chart id and language
+        source: Called to start a generation; yields JSON-serializable events
+    """
+    now = time.monotonic()
+    buffer = _buffers.get(key)
+    if buffer is not None and not buffer.expired(now):
+        _count("shared")
+        return buffer
+    _prune(now)
+    buffer = _buffers[key] = EventBuffer(key)
+    buffer.task = asyncio.ensure_future(buffer.run(source()))
+    _count("streams")
+    return buffer
+
+
+def event_stream_response(key: str, source: Callable[[], AsyncIterator[Dict[str, Any]]],
+                          last_event_id: Optional[str] = None) -> StreamingResponse:
+    """
+    Serve a stream key as text/event-stream.
+
+    Args:
+        key: See get_event_buffer
+        source: See get_event_buffer
+        last_event_id: The client's Last-Event-ID header, to resume after it
+    """
+    buffer = get_event_buffer(key, source)
+    return StreamingResponse(buffer.subscribe(last_event_id), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+def get_sse_stats() -> Dict[str, Any]:
+    """Stream counters and the number of buffers held."""
+    with _stats_lock:
+        stats: Dict[str, Any] = dict(_stats)
+    stats["buffers"] = len(_buffers)
+    stats["generating"] = sum(1 for buffer in _buffers.values() if not buffer.done)
+    return stats
@@ -0,0 +1,145 @@
+"""
+Background warmup of the horoscope cache.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from backend.agents.scraper_agent.agent import run_scraper
+from backend.core.config import Config
+from backend.core.daily_data_manager import load_horoscopes, save_horoscopes, is_data_fresh, cleanup_old_data
+from .caching import save_to_cache, period_bucket, publish_generation, text_cache, roast_cache
+
+logger = logging.getLogger("startup")
+
+# List of all zodiac signs
+ALL_SIGNS = [
+    "aries", "taurus", "gemini", "cancer", "leo", "virgo",
+    "libra", "scorpio", "sagittarius", "capricorn", "aquarius", "pisces"
+]
+ALL_PERIODS = ["daily", "yesterday", "tomorrow", "weekly", "monthly"]
+
+_status = {
+    "state": "pending",
+    "total": len(ALL_SIGNS) * len(ALL_PERIODS),
+    "completed": 0,
+    "failed": 0,
+    "started_at": None,
+    "finished_at": None,
+    "error": None,
+}
+_status_lock = threading.Lock()
+_warmup_thread: Optional[threading.Thread] = None
+
+
+def _update_status(**changes) -> None:
+    with _status_lock:
+        _status.update(changes)
+
+
+def _record_item(ok: bool) -> None:
+    with _status_lock:
+        _status["completed" if ok else "failed"] += 1
+
+
+def get_warmup_status() -> Dict:
+    """Return a snapshot of warmup progress."""
+    with _status_lock:
+        status = dict(_status)
+    done = status["completed"] + status["failed"]
+    status["progress"] = done / status["total"] if status["total"] else 1.0
+    status["ready"] = status["state"] == "ready"
+    return status
+
+
+def _prefetch_one(sign: str, period: str) -> Tuple[str, str, Optional[str], float]:
+    """Scrape a single sign/period, returning its text and how long it took."""
+    started = time.perf_counter()
+    try:
+        text = run_scraper(sign, period)
+    except Exception as e:
+        logger.error(f"Failed to cache {sign} ({period}): {e}")
+        text = None
+    return sign, period, text, time.perf_counter() - started
+
+
+def prefetch_horoscopes() -> None:
+    """Fill the horoscope cache from disk, then from the API for whatever is missing."""
+    logger.info("Starting horoscope data initialization...")
+    started = time.perf_counter()
+    _update_status(state="running", completed=0, failed=0, started_at=datetime.now().isoformat(), finished_at=None, error=None)
+
+    # Clean up old data first
+    cleanup_old_data()
+    for cache in (text_cache, roast_cache):
+        cache.purge_expired()
+    buckets = {period: period_bucket(period) for period in ALL_PERIODS}
+
+    # Load whatever fresh data we already have on disk
+    missing = []
+    for period in ALL_PERIODS:
+        period_data = load_horoscopes(period) if is_data_fresh(period) else None
+        for sign in ALL_SIGNS:
+            if period_data and period_data.get(sign):
+                save_to_cache(sign, period, period_data[sign], buckets[period])
+                _record_item(True)
+            else:
+                missing.append((sign, period))
+
+    if not missing:
+        logger.info("Successfully loaded all horoscopes from disk")
+        for period, bucket in buckets.items():
+            publish_generation(period, bucket, {})
+        _update_status(state="ready", finished_at=datetime.now().isoformat())
+        return
+
+    # Fetch the rest from the API concurrently over the shared session
+    logger.info(f"Fetching {len(missing)} horoscopes from API with {Config.PREFETCH_WORKERS} workers...")
+    fetched: Dict[str, Dict[str, str]] = {period: {} for period in ALL_PERIODS}
+    timings = []
+    with ThreadPoolExecutor(max_workers=max(1, Config.PREFETCH_WORKERS)) as executor:
+        futures = [executor.submit(_prefetch_one, sign, period) for sign, period in missing]
+        for future in as_completed(futures):
+            sign, period, text, elapsed = future.result()
+            timings.append(elapsed)
+            _record_item(text is not None)
+            if text is None:
+                continue
+            save_to_cache(sign, period, text, buckets[period])
+            fetched[period][sign] = text
+            logger.info(f"Cached {sign} ({period}) in {elapsed:.2f}s")
+
+    # Upsert newly fetched horoscopes, one transaction per period
+    for period, horoscopes in fetched.items():
+        if horoscopes:
+            save_horoscopes(horoscopes, period)
+
+    # Everything warm so far becomes the generation being served
+    for period, bucket in buckets.items():
+        publish_generation(period, bucket, {})
+
+    _update_status(state="ready", finished_at=datetime.now().isoformat())
+    logger.info(
+        f"Pre-fetching complete: {sum(len(h) for h in fetched.values())}/{len(missing)} items "
+        f"in {time.perf_counter() - started:.2f}s (slowest {max(timings, default=0):.2f}s)"
+    )
+
+
+def _run_warmup() -> None:
+    try:
+        prefetch_horoscopes()
+    except Exception as e:
+        # Requests keep falling back to on-demand fetching
+        logger.error(f"Horoscope warmup failed: {e}")
+        _update_status(state="ready", finished_at=datetime.now().isoformat(), error=str(e))
+
+
+def start_background_warmup() -> None:
+    """Start the warmup in a daemon thread so the API can serve immediately."""
+    global _warmup_thread
+    if _warmup_thread is not None and _warmup_thread.is_alive():
+        return
+    _warmup_thread = threading.Thread(target=_run_warmup, name="horoscope-warmup", daemon=True)
+    _warmup_thread.start()
@@ -1,44 +1,355 @@
-from typing import List, Dict, Optional, Type, Union
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Type, Union
+import httpx
+import jiter
 import openai
 from pydantic import BaseModel
 from .config import Config
+from .llm_cache import cache_key, get_cached_response, save_response
+
+# Process-wide clients, created lazily so importing this module never needs an API key
+_client: Optional[openai.OpenAI] = None
+_async_client: Optional[openai.AsyncOpenAI] = None
+_client_lock = threading.Lock()
+
+# Connection pool usage across both clients
+_pool_stats = {
+    "requests": 0,
+    "in_flight": 0,
+    "peak_in_flight": 0,
+    "saturated_requests": 0,
+    "errors": 0,
+}
+_pool_stats_lock = threading.Lock()
+
+# Streamed completions: time to the first token vs the whole generation, in seconds
+_stream_stats = {
+    "streams": 0,
+    "first_token_seconds": 0.0,
+    "total_seconds": 0.0,
+    "max_first_token_seconds": 0.0,
+}
+_stream_stats_lock = threading.Lock()
+
+
+def _pool_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=Config.OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=Config.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=Config.OPENAI_KEEPALIVE_EXPIRY,
+    )
+
+
+def _pool_timeout() -> httpx.Timeout:
+    return httpx.Timeout(Config.OPENAI_TIMEOUT, connect=Config.OPENAI_CONNECT_TIMEOUT)
+
+
+def get_client() -> openai.OpenAI:
+    """Return the shared synchronous OpenAI client."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = openai.OpenAI(
+                    api_key=Config.get_openai_api_key(),
+                    max_retries=Config.OPENAI_MAX_RETRIES,
+                    http_client=httpx.Client(limits=_pool_limits(), timeout=_pool_timeout()),
+                )
+    return _client
+
+
+def get_async_client() -> openai.AsyncOpenAI:
+    """Return the shared asynchronous OpenAI client."""
+    global _async_client
+    if _async_client is None:
+        with _client_lock:
+            if _async_client is None:
+                _async_client = openai.AsyncOpenAI(
+                    api_key=Config.get_openai_api_key(),
+                    max_retries=Config.OPENAI_MAX_RETRIES,
+                    http_client=httpx.AsyncClient(limits=_pool_limits(), timeout=_pool_timeout()),
+                )
+    return _async_client
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Snapshot of OpenAI connection pool usage."""
+    with _pool_stats_lock:
+        stats = dict(_pool_stats)
+    stats["max_connections"] = Config.OPENAI_MAX_CONNECTIONS
+    stats["utilization"] = stats["in_flight"] / max(1, Config.OPENAI_MAX_CONNECTIONS)
+    return stats
+
+
+def _record_stream(first_token: Optional[float], total: float) -> None:
+    with _stream_stats_lock:
+        _stream_stats["streams"] += 1
+        _stream_stats["total_seconds"] += total
+        if first_token is not None:
+            _stream_stats["first_token_seconds"] += first_token
+            _stream_stats["max_first_token_seconds"] = max(_stream_stats["max_first_token_seconds"], first_token)
+
+
+def get_stream_stats() -> Dict[str, Any]:
+    """Time to first token and total generation time of streamed completions."""
+    with _stream_stats_lock:
+        stats = dict(_stream_stats)
+    streams = max(1, stats["streams"])
+    stats["avg_first_token_ms"] = stats.pop("first_token_seconds") / streams * 1000
+    stats["avg_total_ms"] = stats.pop("total_seconds") / streams * 1000
+    stats["max_first_token_ms"] = stats.pop("max_first_token_seconds") * 1000
+    return stats
+
+
+def _acquire_slot() -> None:
+    with _pool_stats_lock:
+        _pool_stats["requests"] += 1
+        # Every connection is busy, this request will queue for one
+        if _pool_stats["in_flight"] >= Config.OPENAI_MAX_CONNECTIONS:
+            _pool_stats["saturated_requests"] += 1
+        _pool_stats["in_flight"] += 1
+        _pool_stats["peak_in_flight"] = max(_pool_stats["peak_in_flight"], _pool_stats["in_flight"])
+
+
+def _release_slot(failed: bool) -> None:
+    with _pool_stats_lock:
+        _pool_stats["in_flight"] -= 1
+        if failed:
+            _pool_stats["errors"] += 1
+
+
+@contextmanager
+def _tracked() -> Iterator[None]:
+    _acquire_slot()
+    failed = True
+    try:
+        yield
+        failed = False
+    finally:
+        _release_slot(failed)
+
+
+@asynccontextmanager
+async def _atracked() -> AsyncIterator[None]:
+    _acquire_slot()
+    failed = True
+    try:
+        yield
+        failed = False
+    finally:
+        _release_slot(failed)
 
 
 class OpenAIAgent:
     """Wrapper around OpenAI chat completion API."""
 
-    def __init__(self, system_prompt: str, model: str = "gpt-4o-mini", response_format: Optional[Type[BaseModel]] = None) -> None:
-        api_key = Config.get_openai_api_key()
-        self.client = openai.OpenAI(api_key=api_key)
+    def __init__(self, system_prompt: str, model: str = "gpt-4o-mini", response_format: Optional[Type[BaseModel]] = None,
+                 cache: bool = True) -> None:
         self.system_prompt = system_prompt
         self.model = model
         self.response_format = response_format
+        # Serve repeated prompts from the LLM response cache
+        self.cache = cache
 
-    def run(self, input_text: str) -> Union[str, BaseModel]:
-        messages: List[Dict[str, str]] = [
+    @property
+    def client(self) -> openai.OpenAI:
+        return get_client()
+
+    @property
+    def async_client(self) -> openai.AsyncOpenAI:
+        return get_async_client()
+
+    def _messages(self, input_text: str) -> List[Dict[str, str]]:
+        return [
             {"role": "system", "content": self.system_prompt},
             {"role": "user", "content": input_text},
         ]
-        
+
+    def _cache_key(self, input_text: str) -> str:
+        return cache_key(self.model, self.system_prompt, input_text, self.response_format)
+
+    def _cacheable(self, response: Union[str, BaseModel, None]) -> bool:
+        # The plain-text fallback of a structured agent must not be stored under its structured key
+        if self.response_format is None:
+            return response is not None
+        return isinstance(response, self.response_format)
+
+    def run(self, input_text: str) -> Union[str, BaseModel]:
+        if not self.cache:
+            return self._complete(input_text)
+        key = self._cache_key(input_text)
+        cached = get_cached_response(key, self.response_format)
+        if cached is not None:
+            return cached
+        response = self._complete(input_text)
+        if self._cacheable(response):
+            save_response(key, response)
+        return response
+
+    async def arun(self, input_text: str) -> Union[str, BaseModel]:
+        """Async counterpart of run() for use inside the event loop."""
+        if not self.cache:
+            return await self._acomplete(input_text)
+        key = self._cache_key(input_text)
+        # The cache is SQLite; keep its I/O off the event loop
+        loop = asyncio.get_running_loop()
+        cached = await loop.run_in_executor(None, get_cached_response, key, self.response_format)
+        if cached is not None:
+            return cached
+        response = await self._acomplete(input_text)
+        if self._cacheable(response):
+            await loop.run_in_executor(None, save_response, key, response)
+        return response
+
+    async def astream_parsed(self, input_text: str) -> AsyncIterator[Union[Dict[str, Any], BaseModel]]:
+        """
+        Stream a structured response as it is generated.
+
+        Yields dicts of the fields parsed so far (the last field may still be
+        growing), then the validated response_format instance. A cached
+        response is yielded once, whole.
+        """
+        if self.response_format is None:
+            raise ValueError("astream_parsed needs a response_format")
+        loop = asyncio.get_running_loop()
+        key = self._cache_key(input_text) if self.cache else None
+        if key is not None:
+            cached = await loop.run_in_executor(None, get_cached_response, key, self.response_format)
+            if cached is not None:
+                yield cached
+                return
+
+        parsed = None
+        started = time.perf_counter()
+        first_token = None
+        async with _atracked():
+            async with self.async_client.beta.chat.completions.stream(
+                model=self.model,
+                messages=self._messages(input_text),
+                response_format=self.response_format,
+            ) as stream:
+                async for event in stream:
+                    if event.type == "content.delta":
+                        if first_token is None:
+                            first_token = time.perf_counter() - started
+                        # event.parsed drops unterminated strings; keep the growing field instead
+                        try:
+                            snapshot = jiter.from_json(event.snapshot.encode("utf-8"), partial_mode="trailing-strings")
+                        except ValueError:
+                            continue
+                        if snapshot:
+                            yield snapshot
+                    elif event.type == "content.done":
+                        parsed = event.parsed
+        _record_stream(first_token, time.perf_counter() - started)
+        if parsed is None:
+            raise ValueError("Structured response could not be parsed")
+        if key is not None:
+            await loop.run_in_executor(None, save_response, key, parsed)
+        yield parsed
+
+    async def astream(self, input_text: str) -> AsyncIterator[str]:
+        """
+        Stream a text response as token deltas.
+
+        The assembled text is cached once the completion finishes; a cached
+        response is yielded once, whole.
+
+        Raises:
+            ValueError: If the agent has a response_format (use astream_parsed)
+                or the completion came back empty
+        """
+        if self.response_format is not None:
+            raise ValueError("astream streams text; use astream_parsed for structured responses")
+        loop = asyncio.get_running_loop()
+        key = self._cache_key(input_text) if self.cache else None
+        if key is not None:
+            cached = await loop.run_in_executor(None, get_cached_response, key)
+            if cached is not None:
+                yield cached
+                return
+
+        parts = []
+        started = time.perf_counter()
+        first_token = None
+        async with _atracked():
+            stream = await self.async_client.chat.completions.create(
+                model=self.model,
+                messages=self._messages(input_text),
+                stream=True,
+            )
+            # Closes the HTTP response if the consumer stops early
+            async with stream:
+                async for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        if first_token is None:
+                            first_token = time.perf_counter() - started
+                        parts.append(delta)
+                        yield delta
+        _record_stream(first_token, time.perf_counter() - started)
+        text = "".join(parts)
+        if not text.strip():
+            raise ValueError("Streamed response was empty")
+        if key is not None:
+            await loop.run_in_executor(None, save_response, key, text)
+
+    def _complete(self, input_text: str) -> Union[str, BaseModel]:
+        messages = self._messages(input_text)
+
         # Use structured outputs if response_format is provided
         if self.response_format:
             try:
-                response = self.client.beta.chat.completions.parse(
-                    model=self.model,
-                    messages=messages,
-                    response_format=self.response_format,
-                )
+                with _tracked():
+                    response = self.client.beta.chat.completions.parse(
+                        model=self.model,
+                        messages=messages,
+                        response_format=self.response_format,
+                    )
                 return response.choices[0].message.parsed
             except Exception:
                 # Fallback to regular completion if structured output fails
+                with _tracked():
+                    response = self.client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                    )
+                return response.choices[0].message.content
+        else:
+            with _tracked():
                 response = self.client.chat.completions.create(
                     model=self.model,
                     messages=messages,
                 )
+            return response.choices[0].message.content
+
+    async def _acomplete(self, input_text: str) -> Union[str, BaseModel]:
+        messages = self._messages(input_text)
+
+        if self.response_format:
+            try:
+                async with _atracked():
+                    response = await self.async_client.beta.chat.completions.parse(
+                        model=self.model,
+                        messages=messages,
+                        response_format=self.response_format,
+                    )
+                return response.choices[0].message.parsed
+            except Exception:
+                # Fallback to regular completion if structured output fails
+                async with _atracked():
+                    response = await self.async_client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                    )
                 return response.choices[0].message.content
         else:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-            )
+            async with _atracked():
+                response = await self.async_client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                )
             return response.choices[0].message.content
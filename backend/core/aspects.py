@@ -0,0 +1,119 @@
+"""
+Aspect engine.
+
+Builds the full pairwise angular-distance matrix of a chart's planets with
+NumPy and matches it against an orb table in one pass. Used for the chart
+JSON, the roast summary and the chart wheel alike.
+"""
+from typing import Dict, List, Mapping, Optional, Union
+import numpy as np
+from .config import Config
+
+# Major aspects and their exact angles
+ASPECT_ANGLES = {
+    'Conjunction': 0.0,
+    'Sextile': 60.0,
+    'Square': 90.0,
+    'Trine': 120.0,
+    'Opposition': 180.0,
+}
+
+# Named orb tables: aspect -> largest allowed deviation from the exact angle, in degrees
+ORB_TABLES = {
+    'standard': {'Conjunction': 8.0, 'Sextile': 5.0, 'Square': 7.0, 'Trine': 7.0, 'Opposition': 8.0},
+    'tight': {'Conjunction': 6.0, 'Sextile': 3.0, 'Square': 5.0, 'Trine': 5.0, 'Opposition': 6.0},
+    'wide': {'Conjunction': 10.0, 'Sextile': 6.0, 'Square': 8.0, 'Trine': 8.0, 'Opposition': 10.0},
+}
+
+
+def resolve_orbs(orbs: Union[str, Mapping[str, float], None] = None) -> Dict[str, float]:
+    """
+    Return an orb table by name or as given.
+
+    Args:
+        orbs: Name in ORB_TABLES, a mapping of aspect -> orb (aspects left out
+            are not matched), or None for Config.ASPECT_ORB_TABLE
+
+    Raises:
+        ValueError: For an unknown table or aspect name
+    """
+    if orbs is None:
+        orbs = Config.ASPECT_ORB_TABLE
+    if isinstance(orbs, str):
+        if orbs not in ORB_TABLES:
+            raise ValueError(f"Unknown orb table {orbs!r}, expected one of {tuple(ORB_TABLES)}")
+        return dict(ORB_TABLES[orbs])
+    unknown = set(orbs) - set(ASPECT_ANGLES)
+    if unknown:
+        raise ValueError(f"Unknown aspects {sorted(unknown)}, expected some of {tuple(ASPECT_ANGLES)}")
+    return {name: float(orb) for name, orb in orbs.items()}
+
+
+def find_aspects(
+    positions: Mapping[str, Mapping[str, float]],
+    orbs: Union[str, Mapping[str, float], None] = None,
+) -> List[Dict]:
+    """
+    Find every aspect between pairs of points.
+
+    Args:
+        positions: Point name -> {'degrees', optional 'speed' in degrees/day},
+            such as a chart's 'planets'
+        orbs: Orb table, see resolve_orbs
+
+    Returns:
+        One dict per aspecting pair, in pair order: point1, point2, aspect,
+        angle (exact), separation (actual), orb (deviation from exact),
+        max_orb, exactness (1 when exact, 0 at the edge of the orb) and
+        applying (True/False, or None when a speed is unknown)
+    """
+    table = resolve_orbs(orbs)
+    names = list(positions)
+    if len(names) < 2 or not table:
+        return []
+    aspect_names = list(table)
+    angles = np.array([ASPECT_ANGLES[name] for name in aspect_names])
+    max_orbs = np.array([table[name] for name in aspect_names])
+
+    longitudes = np.array([positions[name]['degrees'] for name in names], dtype=float)
+    # Signed shortest arc from point i to point j, in [-180, 180)
+    arcs = (longitudes[None, :] - longitudes[:, None] + 180.0) % 360.0 - 180.0
+    separations = np.abs(arcs)
+    deviations = np.abs(separations[:, :, None] - angles)
+    # Orbs do not overlap, so at most one aspect matches; take the closest anyway
+    masked = np.where(deviations <= max_orbs, deviations, np.inf)
+    best = masked.argmin(axis=2)
+    matched = np.isfinite(masked.min(axis=2))
+    first, second = np.nonzero(np.triu(matched, k=1))
+
+    speeds = [positions[name].get('speed') for name in names]
+    aspects = []
+    for i, j in zip(first.tolist(), second.tolist()):
+        k = int(best[i, j])
+        separation = float(separations[i, j])
+        orb = float(deviations[i, j, k])
+        applying: Optional[bool] = None
+        if speeds[i] is not None and speeds[j] is not None:
+            # The orb shrinks when the separation moves towards the exact angle
+            separation_rate = np.sign(arcs[i, j]) * (speeds[j] - speeds[i])
+            applying = bool(np.sign(separation - angles[k]) * separation_rate < 0)
+        aspects.append({
+            'point1': names[i],
+            'point2': names[j],
+            'aspect': aspect_names[k],
+            'angle': float(angles[k]),
+            'separation': separation,
+            'orb': orb,
+            'max_orb': float(max_orbs[k]),
+            'exactness': 1.0 - orb / float(max_orbs[k]) if max_orbs[k] else 1.0,
+            'applying': applying,
+        })
+    return aspects
+
+
+def describe_aspect(aspect: Mapping) -> str:
+    """One-line description, e.g. 'Sun trine Moon (orb 1.2°, applying)'."""
+    detail = f"orb {aspect['orb']:.1f}°"
+    if aspect.get('applying') is not None:
+        detail += ", applying" if aspect['applying'] else ", separating"
+    return f"{aspect['point1']} {aspect['aspect'].lower()} {aspect['point2']} ({detail})"
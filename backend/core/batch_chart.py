@@ -0,0 +1,258 @@
+"""
+Batch birth chart engine returning columnar NumPy arrays.
+
+Computes the same positions as birth_chart_calculator for many charts at once:
+bodies are set up once and reused, each distinct instant is computed once,
+and sign and house placement are vectorized over the whole batch.
+
+Almost all of the time goes into ephemeris calls, one at a time, so the gain
+comes from making fewer of them. Interpolated ephem batches need about one
+Moon sample per day of the span they cover, and fewer for the other bodies.
+On benchmarks/batch_chart that is roughly 10x the single-chart path for
+20000 charts over 60 years and over 20x for 100000. Exact batches compute
+what the single-chart path does and gain under 2x.
+"""
+from datetime import datetime
+from typing import Callable, NamedTuple, Optional, Sequence, Tuple, Union
+import logging
+import numpy as np
+import swisseph as swe
+from .birth_chart_calculator import CHART_ENGINES, EPHEM_SPEED_STEP_DAYS, PLANETS, SWE_BODIES, SWE_FLAGS, ephem_speed
+from .config import Config
+from .ephemeris_table import table_usable
+
+logger = logging.getLogger(__name__)
+
+# Column order of the per-body arrays
+BODIES = tuple(PLANETS.keys())
+
+# Grid step in days per body for in-batch interpolation of ephem positions:
+# the widest step at which eight-point Lagrange interpolation stays within
+# ephem's own jitter (~3e-5° for the Sun to Mars, ~3e-4° beyond). The Moon's
+# series is too noisy for more than a day. Swiss Ephemeris positions are not
+# smooth enough at that level (Delta T and Moshier term switches); that engine
+# interpolates from the precomputed ephemeris table instead, when it is built,
+# or is computed directly.
+_GRID_STEP_DAYS = {
+    'Sun': 4.0,
+    'Moon': 1.0,
+    'Mercury': 2.0,
+    'Venus': 16.0,
+    'Mars': 32.0,
+    'Jupiter': 32.0,
+    'Saturn': 32.0,
+    'Uranus': 32.0,
+    'Neptune': 32.0,
+    'Pluto': 32.0
+}
+_INTERP_POINTS = 8
+
+
+class BatchCharts(NamedTuple):
+    """Columnar birth charts; row i of every array belongs to chart i."""
+    datetimes: np.ndarray         # (n,) datetime64[us]
+    latitudes: np.ndarray         # (n,) rounded like calculate_birth_chart
+    longitudes: np.ndarray        # (n,)
+    body_longitudes: np.ndarray   # (n, len(BODIES)) degrees
+    body_speeds: np.ndarray       # (n, len(BODIES)) degrees/day; forward differences for ephem
+    sign_index: np.ndarray        # (n, len(BODIES)) index into ZODIAC_SIGNS
+    house: np.ndarray             # (n, len(BODIES)) house number 1-12
+    cusps: np.ndarray             # (n, 12) Placidus cusp degrees
+    ascendant: np.ndarray         # (n,)
+    midheaven: np.ndarray         # (n,)
+
+
+def sign_indices(degrees: np.ndarray) -> np.ndarray:
+    """Zodiac sign index (0 = Aries) for an array of ecliptic longitudes."""
+    return (np.floor(np.asarray(degrees) / 30.0).astype(np.int64) % 12).astype(np.int8)
+
+
+def assign_houses(degrees: np.ndarray, cusps: np.ndarray) -> np.ndarray:
+    """
+    Vectorized house placement for every body of every chart.
+
+    Args:
+        degrees: Body longitudes, shape (n, k)
+        cusps: House cusps in house order, shape (n, 12)
+
+    Returns:
+        House numbers 1-12, shape (n, k)
+    """
+    # Measure everything from the first cusp so each row's cusps increase from
+    # 0, then count the cusps at or below each body: a row-wise searchsorted
+    start = cusps[:, :1]
+    relative_cusps = (cusps - start) % 360.0
+    relative_degrees = (degrees - start) % 360.0
+    houses = (relative_degrees[:, :, None] >= relative_cusps[:, None, :]).sum(axis=2)
+    return houses.astype(np.int8)
+
+
+# Samples one body at a list of times: (degrees, speeds or None)
+Sampler = Callable[[Sequence[float]], Tuple[np.ndarray, Optional[np.ndarray]]]
+
+
+def _ephem_sampler(name: str) -> Sampler:
+    """Sample ephem's hlong at ephem dates, with the single-chart arithmetic."""
+    import ephem
+
+    body = getattr(ephem, name)()
+
+    def sample(days: Sequence[float]) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        values = np.empty(len(days))
+        for i, day in enumerate(days):
+            body.compute(day)
+            values[i] = float(body.hlong)
+        return values * 180 / ephem.pi, None
+
+    return sample
+
+
+def _swisseph_sampler(name: str) -> Sampler:
+    """Sample Swiss Ephemeris geocentric longitudes and speeds at Julian days."""
+    body = SWE_BODIES[name]
+
+    def sample(days: Sequence[float]) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        values = np.array([swe.calc_ut(day, body, SWE_FLAGS)[0] for day in days]).reshape(-1, 6)
+        return values[:, 0], values[:, 3]
+
+    return sample
+
+
+def _lagrange_weights(x: np.ndarray) -> np.ndarray:
+    """Lagrange weights of nodes 0..P-1 evaluated at positions x, shape (n, P)."""
+    nodes = np.arange(_INTERP_POINTS)
+    offsets = x[:, None] - nodes
+    weights = np.empty_like(offsets)
+    for j in nodes:
+        others = np.delete(nodes, j)
+        weights[:, j] = np.prod(offsets[:, others], axis=1) / np.prod(j - others)
+    return weights
+
+
+def _body_positions(sample: Sampler, days: np.ndarray, step: Optional[float]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Longitudes and speeds of one body at given days.
+
+    Engines without speeds (ephem) get the forward difference of
+    ephem_speed, like the single-chart path. With a grid step (ephem only),
+    longitudes are sampled on a regular grid around the requested days and
+    interpolated, if that takes fewer ephemeris calls than computing every
+    day directly; the interpolant is then differenced too.
+    """
+    if step is not None:
+        first = np.floor(days / step).astype(np.int64) - (_INTERP_POINTS // 2 - 1)
+        nodes = first[:, None] + np.arange(_INTERP_POINTS)
+        node_ids, inverse = np.unique(nodes, return_inverse=True)
+        # Computing directly takes two samples per day: the day and its speed step
+        if len(node_ids) < 2 * len(days):
+            inverse = inverse.reshape(nodes.shape)
+            degrees, _ = sample((node_ids * step).tolist())
+            unwrapped = np.unwrap(degrees[inverse], axis=1, period=360.0)
+
+            def interpolate(at: np.ndarray) -> np.ndarray:
+                return (_lagrange_weights(at / step - first) * unwrapped).sum(axis=1) % 360.0
+
+            degrees = interpolate(days)
+            return degrees, ephem_speed(degrees, interpolate(days + EPHEM_SPEED_STEP_DAYS))
+    # Same arithmetic as the single-chart path, so results are bit-identical
+    degrees, speeds = sample(days.tolist())
+    if speeds is None:
+        later, _ = sample((days + EPHEM_SPEED_STEP_DAYS).tolist())
+        speeds = ephem_speed(degrees, later)
+    return degrees, speeds
+
+
+def calculate_birth_charts(
+    datetimes: Union[Sequence[datetime], np.ndarray],
+    latitudes: Sequence[float],
+    longitudes: Sequence[float],
+    interpolate: bool = True,
+    engine: Optional[str] = None,
+) -> BatchCharts:
+    """
+    Calculate many birth charts at once.
+
+    Args:
+        datetimes: Naive UTC birth moments (datetimes or datetime64 values)
+        latitudes: Birth latitudes
+        longitudes: Birth longitudes
+        interpolate: Interpolate ephem positions on an in-batch grid when it
+            is cheaper, and swisseph positions from the ephemeris table.
+            Positions then match calculate_birth_chart to within ephem's
+            own jitter, a few 1e-4° at most (ephem), or the table's error bound (swisseph); pass False to
+            compute every position exactly.
+        engine: Planet engine, Config.CHART_ENGINE by default
+
+    Returns:
+        BatchCharts with one row per input chart
+    """
+    moments = np.asarray(datetimes, dtype='datetime64[us]').ravel()
+    precision = Config.CHART_COORD_PRECISION
+    lats = np.array([round(float(lat), precision) for lat in latitudes])
+    lons = np.array([round(float(lon), precision) for lon in longitudes])
+    if not (len(moments) == len(lats) == len(lons)):
+        raise ValueError("datetimes, latitudes and longitudes must have the same length")
+    engine = engine or Config.CHART_ENGINE
+    if engine not in CHART_ENGINES:
+        raise ValueError(f"Unknown chart engine {engine!r}, expected one of {CHART_ENGINES}")
+
+    # Every distinct instant is converted and computed once
+    instants, instant_index = np.unique(moments, return_inverse=True)
+    instant_index = instant_index.ravel()
+    instant_datetimes = instants.tolist()
+    julian_days = np.array([
+        swe.julday(moment.year, moment.month, moment.day,
+                   moment.hour + moment.minute / 60.0 + moment.second / 3600.0)
+        for moment in instant_datetimes
+    ])
+    if engine == "swisseph":
+        days, make_sampler = julian_days, _swisseph_sampler
+    else:
+        import ephem
+        days = np.array([float(ephem.Date(moment)) for moment in instant_datetimes])
+        make_sampler = _ephem_sampler
+
+    table = table_usable(julian_days) if interpolate and engine == "swisseph" else None
+    if table is not None:
+        # The precomputed table has the same column order as BODIES
+        body_longitudes, body_speeds = table.positions(julian_days)
+    else:
+        body_longitudes = np.empty((len(instants), len(BODIES)))
+        body_speeds = np.empty((len(instants), len(BODIES)))
+        for column, name in enumerate(BODIES):
+            step = _GRID_STEP_DAYS[name] if interpolate and engine == "ephem" else None
+            degrees, speeds = _body_positions(make_sampler(name), days, step)
+            body_longitudes[:, column] = degrees
+            body_speeds[:, column] = speeds
+    body_longitudes = body_longitudes[instant_index]
+    body_speeds = body_speeds[instant_index]
+
+    # Houses depend on location too; compute each distinct (instant, lat, lon) once
+    keys = np.column_stack((instant_index, lats, lons))
+    unique_keys, key_index = np.unique(keys, axis=0, return_inverse=True)
+    cusps = np.empty((len(unique_keys), 12))
+    angles = np.empty((len(unique_keys), 2))
+    for row, (instant, lat, lon) in enumerate(unique_keys):
+        try:
+            house_cusps, ascmc = swe.houses(julian_days[int(instant)], lat, lon, b'P')
+        except Exception as e:
+            chart = int(np.argmax(key_index.ravel() == row))
+            raise ValueError(f"Invalid birth data for chart {chart}: {e}")
+        cusps[row] = house_cusps[:12]
+        angles[row] = ascmc[:2]
+    key_index = key_index.ravel()
+    cusps = cusps[key_index]
+    angles = angles[key_index]
+
+    return BatchCharts(
+        datetimes=moments,
+        latitudes=lats,
+        longitudes=lons,
+        body_longitudes=body_longitudes,
+        body_speeds=body_speeds,
+        sign_index=sign_indices(body_longitudes),
+        house=assign_houses(body_longitudes, cusps),
+        cusps=cusps,
+        ascendant=angles[:, 0],
+        midheaven=angles[:, 1],
+    )
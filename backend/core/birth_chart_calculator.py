@@ -1,12 +1,17 @@
 """
-Birth chart calculator using ephem library.
+Birth chart calculator.
+
+Planets come from ephem or Swiss Ephemeris depending on Config.CHART_ENGINE;
+Ascendant, Midheaven and house cusps always come from Swiss Ephemeris.
 """
-import ephem
 from datetime import datetime
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
 import logging
 import math
 import swisseph as swe
+from .aspects import describe_aspect, find_aspects
+from .config import Config
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +29,29 @@ PLANETS = {
     'Pluto': '♇'
 }
 
+# Swiss Ephemeris body ids for PLANETS
+SWE_BODIES = {
+    'Sun': swe.SUN,
+    'Moon': swe.MOON,
+    'Mercury': swe.MERCURY,
+    'Venus': swe.VENUS,
+    'Mars': swe.MARS,
+    'Jupiter': swe.JUPITER,
+    'Saturn': swe.SATURN,
+    'Uranus': swe.URANUS,
+    'Neptune': swe.NEPTUNE,
+    'Pluto': swe.PLUTO
+}
+
+# Moshier's analytical ephemeris needs no data files; FLG_SPEED adds daily motion
+SWE_FLAGS = swe.FLG_MOSEPH | swe.FLG_SPEED
+
+# Planet engines selectable with CHART_ENGINE
+CHART_ENGINES = ("ephem", "swisseph")
+
+# Step in days of the forward difference that gives ephem speeds
+EPHEM_SPEED_STEP_DAYS = 0.5
+
 # Zodiac signs and their degrees
 ZODIAC_SIGNS = [
     ('Aries', 0, 30, '♈'),
@@ -40,6 +68,9 @@ ZODIAC_SIGNS = [
     ('Pisces', 330, 360, '♓')
 ]
 
+# Aspects mentioned in generate_birth_chart_summary, tightest first
+SUMMARY_ASPECTS = 5
+
 # Houses and their meanings
 HOUSES = {
     1: "Self, personality, appearance",
@@ -57,6 +88,31 @@ HOUSES = {
 }
 
 
+class FrozenDict(dict):
+    """Read-only dict returned for memoized charts so callers cannot corrupt shared entries."""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Birth chart data is read-only; copy it before modifying")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _readonly
+
+    def __ior__(self, other):
+        self._readonly()
+
+    def __reduce__(self):
+        # Unpickles as a plain dict; the default protocol would call __setitem__
+        return (dict, (dict(self),))
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively convert dicts and lists into read-only equivalents."""
+    if isinstance(value, dict):
+        return FrozenDict((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
 def get_zodiac_sign(degrees: float) -> Dict[str, str]:
     """Get zodiac sign for given degrees."""
     for sign_name, start_deg, end_deg, symbol in ZODIAC_SIGNS:
@@ -104,140 +160,199 @@ def calculate_ascendant_midheaven_swe(birth_date: str, birth_time: str, latitude
 def calculate_birth_chart(birth_date: str, birth_time: str, latitude: float, longitude: float) -> Dict:
     """
     Calculate birth chart for given birth data.
-    Uses ephem for planets, Swiss Ephemeris for Ascendant/MC and houses.
+
+    Results are memoized on the parsed datetime and on coordinates rounded to
+    CHART_COORD_PRECISION decimals, and returned as read-only mappings.
     """
+    engine = Config.CHART_ENGINE
+    if engine not in CHART_ENGINES:
+        raise ValueError(f"Unknown CHART_ENGINE {engine!r}, expected one of {CHART_ENGINES}")
     try:
-        # Parse date and time
-        datetime_str = f"{birth_date} {birth_time}"
-        birth_datetime = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M")
-        
-        # Get Julian Day for Swiss Ephemeris
-        jd = get_julian_day(birth_date, birth_time)
-        
-        # Calculate house cusps using Placidus system
-        cusps, ascmc = swe.houses(jd, latitude, longitude, b'P')
-
-        # Function to find which house a planet is in
-        def get_planet_house(planet_degrees: float) -> int:
-            """Determines the house placement of a celestial body."""
-            # Normalize degrees to be within the 0-360 range
-            planet_degrees = planet_degrees % 360
-            cusps_12 = list(cusps[:12])
-            for i in range(12):
-                start_cusp = cusps_12[i]
-                end_cusp = cusps_12[(i + 1) % 12]
-                # Handles the wrap-around from the 12th to the 1st house (e.g., 330° to 20°)
-                if start_cusp > end_cusp:
-                    if planet_degrees >= start_cusp or planet_degrees < end_cusp:
-                        return i + 1
-                # Standard case
-                elif start_cusp <= planet_degrees < end_cusp:
+        birth_datetime = datetime.strptime(f"{birth_date} {birth_time}", "%Y-%m-%d %H:%M")
+        precision = Config.CHART_COORD_PRECISION
+        return _calculate_birth_chart_cached(
+            birth_datetime,
+            round(float(latitude), precision),
+            round(float(longitude), precision),
+            engine
+        )
+    except Exception as e:
+        logger.error(f"Failed to calculate birth chart: {e}")
+        raise ValueError(f"Invalid birth data: {e}")
+
+
+def get_chart_cache_stats() -> Dict[str, Any]:
+    """Hit rate and size of the birth chart memo cache."""
+    info = _calculate_birth_chart_cached.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "hit_rate": info.hits / lookups if lookups else 0.0,
+        "size": info.currsize,
+        "max_size": info.maxsize,
+    }
+
+
+def ephem_speed(degrees, later):
+    """
+    Daily motion from hlong in degrees now and EPHEM_SPEED_STEP_DAYS later.
+
+    Works on floats and NumPy arrays alike, so the batch engine shares the arithmetic.
+    """
+    # Shortest arc, so a step across 0° Aries is not read as a full turn
+    return ((later - degrees + 180.0) % 360.0 - 180.0) / EPHEM_SPEED_STEP_DAYS
+
+
+def _ephem_positions(birth_datetime: datetime) -> Dict[str, Dict[str, float]]:
+    """
+    Planet longitudes from ephem's hlong (heliocentric, except for the Moon).
+
+    hlong does not depend on the observer, so bodies are computed for the
+    date alone. ephem has no speeds; each one is a forward difference, see
+    ephem_speed.
+    """
+    # Imported here so the swisseph engine never loads ephem
+    import ephem
+
+    birth = ephem.Date(birth_datetime)
+    positions = {}
+    for planet_name in PLANETS.keys():
+        try:
+            planet = getattr(ephem, planet_name)()
+            planet.compute(birth + EPHEM_SPEED_STEP_DAYS)
+            later = float(planet.hlong) * 180 / ephem.pi
+            planet.compute(birth)
+            degrees = float(planet.hlong) * 180 / ephem.pi
+            positions[planet_name] = {'degrees': degrees, 'speed': ephem_speed(degrees, later)}
+        except Exception as e:
+            logger.warning(f"Failed to calculate {planet_name}: {e}")
+    return positions
+
+
+def _swisseph_positions(jd: float) -> Dict[str, Dict[str, float]]:
+    """Geocentric planet longitudes and daily speeds from Swiss Ephemeris."""
+    positions = {}
+    for planet_name, body in SWE_BODIES.items():
+        try:
+            values, _ = swe.calc_ut(jd, body, SWE_FLAGS)
+            positions[planet_name] = {'degrees': values[0], 'speed': values[3]}
+        except Exception as e:
+            logger.warning(f"Failed to calculate {planet_name}: {e}")
+    return positions
+
+
+@lru_cache(maxsize=Config.CHART_CACHE_SIZE)
+def _calculate_birth_chart_cached(birth_datetime: datetime, latitude: float, longitude: float, engine: str) -> Dict:
+    """
+    Calculate birth chart for a normalized birth moment and location.
+    Uses the given engine for planets, Swiss Ephemeris for Ascendant/MC and houses.
+    """
+    birth_date = birth_datetime.strftime("%Y-%m-%d")
+    birth_time = birth_datetime.strftime("%H:%M")
+    # Get Julian Day for Swiss Ephemeris
+    jd = swe.julday(birth_datetime.year, birth_datetime.month, birth_datetime.day,
+                    birth_datetime.hour + birth_datetime.minute / 60.0)
+    
+    # Calculate house cusps using Placidus system
+    cusps, ascmc = swe.houses(jd, latitude, longitude, b'P')
+
+    # Function to find which house a planet is in
+    def get_planet_house(planet_degrees: float) -> int:
+        """Determines the house placement of a celestial body."""
+        # Normalize degrees to be within the 0-360 range
+        planet_degrees = planet_degrees % 360
+        cusps_12 = list(cusps[:12])
+        for i in range(12):
+            start_cusp = cusps_12[i]
+            end_cusp = cusps_12[(i + 1) % 12]
+            # Handles the wrap-around from the 12th to the 1st house (e.g., 330° to 20°)
+            if start_cusp > end_cusp:
+                if planet_degrees >= start_cusp or planet_degrees < end_cusp:
                     return i + 1
-            return 12 # Default to 12th house if no match is found
-
-        # Create observer (birth location) for ephem
-        observer = ephem.Observer()
-        observer.lat = str(latitude)
-        observer.lon = str(longitude)
-        observer.date = birth_datetime
-        
-        # Calculate planetary positions
-        planets_data = {}
-        for planet_name in PLANETS.keys():
-            try:
-                if planet_name == 'Sun':
-                    planet = ephem.Sun()
-                elif planet_name == 'Moon':
-                    planet = ephem.Moon()
-                elif planet_name == 'Mercury':
-                    planet = ephem.Mercury()
-                elif planet_name == 'Venus':
-                    planet = ephem.Venus()
-                elif planet_name == 'Mars':
-                    planet = ephem.Mars()
-                elif planet_name == 'Jupiter':
-                    planet = ephem.Jupiter()
-                elif planet_name == 'Saturn':
-                    planet = ephem.Saturn()
-                elif planet_name == 'Uranus':
-                    planet = ephem.Uranus()
-                elif planet_name == 'Neptune':
-                    planet = ephem.Neptune()
-                elif planet_name == 'Pluto':
-                    planet = ephem.Pluto()
-                else:
-                    continue
-                planet.compute(observer)
-                degrees = float(planet.hlong) * 180 / ephem.pi
-                sign_data = get_zodiac_sign(degrees)
-                house = get_planet_house(degrees)
-                
-                planets_data[planet_name] = {
-                    'name': planet_name,
-                    'symbol': PLANETS[planet_name],
-                    'degrees': degrees,
-                    'sign': sign_data['name'],
-                    'sign_symbol': sign_data['symbol'],
-                    'sign_degrees': sign_data['sign_degrees'],
-                    'formatted': format_degrees(degrees),
-                    'house': house
-                }
-            except Exception as e:
-                logger.warning(f"Failed to calculate {planet_name}: {e}")
-                continue
-        
-        # Use Swiss Ephemeris for Ascendant and MC
-        asc_degrees, mc_degrees = ascmc[0], ascmc[1]
-        asc_sign_data = get_zodiac_sign(asc_degrees)
-        ascendant = {
-            'name': 'Ascendant',
-            'symbol': 'AC',
-            'degrees': asc_degrees,
-            'sign': asc_sign_data['name'],
-            'sign_symbol': asc_sign_data['symbol'],
-            'sign_degrees': asc_sign_data['sign_degrees'],
-            'formatted': format_degrees(asc_degrees)
+            # Standard case
+            elif start_cusp <= planet_degrees < end_cusp:
+                return i + 1
+        return 12 # Default to 12th house if no match is found
+
+    # Calculate planetary positions
+    if engine == "swisseph":
+        # Served from the precomputed table when it is built and precise enough
+        from .ephemeris_table import lookup_positions
+        positions = lookup_positions(jd)
+    else:
+        positions = _ephem_positions(birth_datetime)
+
+    planets_data = {}
+    for planet_name, position in positions.items():
+        degrees = position['degrees']
+        sign_data = get_zodiac_sign(degrees)
+        planets_data[planet_name] = {
+            'name': planet_name,
+            'symbol': PLANETS[planet_name],
+            'degrees': degrees,
+            'sign': sign_data['name'],
+            'sign_symbol': sign_data['symbol'],
+            'sign_degrees': sign_data['sign_degrees'],
+            'formatted': format_degrees(degrees),
+            'house': get_planet_house(degrees)
         }
-        mc_sign_data = get_zodiac_sign(mc_degrees)
-        midheaven = {
-            'name': 'Midheaven',
-            'symbol': 'MC',
-            'degrees': mc_degrees,
-            'sign': mc_sign_data['name'],
-            'sign_symbol': mc_sign_data['symbol'],
-            'sign_degrees': mc_sign_data['sign_degrees'],
-            'formatted': format_degrees(mc_degrees)
+        if 'speed' in position:
+            planets_data[planet_name]['speed'] = position['speed']
+            # Retrograde motion is geocentric; ephem's heliocentric speeds never show it
+            if engine == "swisseph":
+                planets_data[planet_name]['retrograde'] = position['speed'] < 0
+    
+    # Use Swiss Ephemeris for Ascendant and MC
+    asc_degrees, mc_degrees = ascmc[0], ascmc[1]
+    asc_sign_data = get_zodiac_sign(asc_degrees)
+    ascendant = {
+        'name': 'Ascendant',
+        'symbol': 'AC',
+        'degrees': asc_degrees,
+        'sign': asc_sign_data['name'],
+        'sign_symbol': asc_sign_data['symbol'],
+        'sign_degrees': asc_sign_data['sign_degrees'],
+        'formatted': format_degrees(asc_degrees)
+    }
+    mc_sign_data = get_zodiac_sign(mc_degrees)
+    midheaven = {
+        'name': 'Midheaven',
+        'symbol': 'MC',
+        'degrees': mc_degrees,
+        'sign': mc_sign_data['name'],
+        'sign_symbol': mc_sign_data['symbol'],
+        'sign_degrees': mc_sign_data['sign_degrees'],
+        'formatted': format_degrees(mc_degrees)
+    }
+    
+    # House cusps data
+    house_cusps_data = {}
+    for i, cusp_degrees in enumerate(cusps[:12]):
+        sign_data = get_zodiac_sign(cusp_degrees)
+        house_cusps_data[i+1] = {
+            'house': i + 1,
+            'degrees': cusp_degrees,
+            'sign': sign_data['name'],
+            'sign_symbol': sign_data['symbol'],
+            'formatted': format_degrees(cusp_degrees)
         }
-        
-        # House cusps data
-        house_cusps_data = {}
-        for i, cusp_degrees in enumerate(cusps[:12]):
-            sign_data = get_zodiac_sign(cusp_degrees)
-            house_cusps_data[i+1] = {
-                'house': i + 1,
-                'degrees': cusp_degrees,
-                'sign': sign_data['name'],
-                'sign_symbol': sign_data['symbol'],
-                'formatted': format_degrees(cusp_degrees)
-            }
 
-        return {
-            'birth_data': {
-                'date': birth_date,
-                'time': birth_time,
-                'datetime': birth_datetime.isoformat(),
-                'latitude': latitude,
-                'longitude': longitude
-            },
-            'planets': planets_data,
-            'ascendant': ascendant,
-            'midheaven': midheaven,
-            'houses': house_cusps_data,
-            'calculated_at': datetime.now().isoformat()
-        }
-    except Exception as e:
-        logger.error(f"Failed to calculate birth chart: {e}")
-        raise ValueError(f"Invalid birth data: {e}")
+    return _freeze({
+        'birth_data': {
+            'date': birth_date,
+            'time': birth_time,
+            'datetime': birth_datetime.isoformat(),
+            'latitude': latitude,
+            'longitude': longitude
+        },
+        'planets': planets_data,
+        'ascendant': ascendant,
+        'midheaven': midheaven,
+        'houses': house_cusps_data,
+        'aspects': find_aspects(planets_data),
+        'calculated_at': datetime.now().isoformat()
+    })
 
 
 def get_planet_interpretation(planet: str, sign: str) -> str:
@@ -299,6 +414,14 @@ def generate_birth_chart_summary(birth_chart: Dict) -> str:
     
     if aspects:
         summary += f"Key placements include: {', '.join(aspects)}. "
+
+    # The tightest aspects between planets
+    chart_aspects = birth_chart.get('aspects')
+    if chart_aspects is None:
+        chart_aspects = find_aspects(planets)
+    tightest = sorted(chart_aspects, key=lambda aspect: aspect['orb'])[:SUMMARY_ASPECTS]
+    if tightest:
+        summary += f"Major aspects: {'; '.join(describe_aspect(aspect) for aspect in tightest)}. "
     
     summary += "This cosmic fingerprint reveals the unique blend of energies that make you... well, you."
     
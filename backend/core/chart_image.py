@@ -0,0 +1,117 @@
+"""
+Chart image sizes and raster formats.
+
+The full-size PNG from chart_plot is the master render. Smaller sizes and
+WebP are derived from it with Pillow when it is at hand; otherwise the wheel
+is rendered at the dpi that gives the requested size, which costs a fraction
+of a full-size render.
+"""
+import io
+import math
+from typing import Any, Dict, Optional
+
+# Edge length in px of the master render: the 12in wheel at 300 dpi after the tight crop
+MASTER_PIXELS = 2832
+MASTER_DPI = 300
+MIN_PIXELS = 64
+
+# Named sizes: preset -> (edge length in px, dpi recorded in PNG files)
+SIZE_PRESETS = {
+    "thumb": (256, 72),
+    "screen": (1024, 96),
+    "print": (MASTER_PIXELS, MASTER_DPI),
+}
+DEFAULT_SIZE = "print"
+
+# Raster formats: name -> Pillow format
+RASTER_FORMATS = {"png": "PNG", "webp": "WEBP"}
+
+# Options of the master render, which every raster size can be derived from
+MASTER_OPTIONS: Dict[str, Any] = {"format": "png", "size": MASTER_PIXELS, "dpi": MASTER_DPI}
+
+
+def resolve_render_options(image_format: str, size: Optional[str] = None, dpi: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Normalize plot options into the dict that render keys are built from.
+
+    Args:
+        image_format: png, webp or svg
+        size: Preset name or edge length in px; the print preset by default
+            (SVG keeps its own canvas size unless one is given)
+        dpi: Resolution recorded in PNG files, the preset's by default
+            (WebP has no resolution field)
+
+    Returns:
+        {"format", "size"} plus "dpi" for PNG
+
+    Raises:
+        ValueError: If the size or dpi is out of range
+    """
+    if size is None and image_format == "svg":
+        return {"format": "svg", "size": None}
+    size = size or DEFAULT_SIZE
+    if size in SIZE_PRESETS:
+        pixels, default_dpi = SIZE_PRESETS[size]
+    else:
+        try:
+            pixels = int(size)
+        except ValueError:
+            raise ValueError(f"Invalid size {size!r}. Must be one of: {', '.join(SIZE_PRESETS)}, or a width in px")
+        if not MIN_PIXELS <= pixels <= MASTER_PIXELS:
+            raise ValueError(f"Size must be between {MIN_PIXELS} and {MASTER_PIXELS} px")
+        default_dpi = SIZE_PRESETS["screen"][1]
+    if image_format != "png":
+        return {"format": image_format, "size": pixels}
+
+    dpi = default_dpi if dpi is None else dpi
+    if not 1 <= dpi <= 1200:
+        raise ValueError("dpi must be between 1 and 1200")
+    return {"format": image_format, "size": pixels, "dpi": dpi}
+
+
+def _exact_dpi(pixels: int) -> int:
+    return min(MASTER_DPI, math.ceil(MASTER_DPI * pixels / MASTER_PIXELS))
+
+
+# dpis the wheel is rendered at: one per preset, so chart_plot's cached
+# backgrounds (one per dpi) stay few whatever sizes are requested
+RENDER_DPIS = sorted({_exact_dpi(pixels) for pixels, _ in SIZE_PRESETS.values()})
+
+
+def render_dpi(pixels: int) -> int:
+    """
+    dpi at which chart_plot renders the wheel at least this many px wide.
+
+    Custom sizes snap up to the nearest preset's dpi and are downscaled from there.
+    """
+    needed = _exact_dpi(pixels)
+    return next(dpi for dpi in RENDER_DPIS if dpi >= needed)
+
+
+def derive_image(source: bytes, options: Dict[str, Any]) -> bytes:
+    """
+    Convert a rendered PNG to the requested raster size and format.
+
+    Args:
+        source: Grayscale PNG from render_chart_png, at least options["size"] px wide
+        options: Raster options from resolve_render_options
+
+    Returns:
+        Encoded image; the source itself when it already matches
+    """
+    from PIL import Image
+
+    if options == MASTER_OPTIONS:
+        return source
+    image = Image.open(io.BytesIO(source))
+    width, height = image.size
+    if width != options["size"]:
+        # reducing_gap box-reduces large downscales first; visually identical, several times faster
+        image = image.resize((options["size"], round(height * options["size"] / width)), Image.LANCZOS, reducing_gap=3.0)
+
+    buf = io.BytesIO()
+    if options["format"] == "webp":
+        image.save(buf, format=RASTER_FORMATS["webp"], quality=90, method=4)
+    else:
+        image.save(buf, format=RASTER_FORMATS["png"], dpi=(options["dpi"], options["dpi"]))
+    return buf.getvalue()
@@ -0,0 +1,247 @@
+"""
+Birth chart wheel rendering with matplotlib.
+
+matplotlib and numpy are imported on first render, so importing this module
+(and the API routes) stays cheap. Figures are built with the object-oriented
+API rather than pyplot, so no global figure state is shared between renders.
+"""
+import hashlib
+import io
+import json
+from functools import lru_cache
+from typing import Any, Dict, List, Sequence, Tuple
+from .aspects import find_aspects
+from .birth_chart_calculator import ZODIAC_SIGNS
+
+# How aspects found by core/aspects.py are drawn: name -> (line style, alpha)
+ASPECT_STYLES = {
+    'Conjunction': ('solid', 1.0),
+    'Opposition': ('solid', 1.0),
+    'Trine': ('solid', 0.8),
+    'Square': ('dashed', 0.8),
+    'Sextile': ('dashed', 0.6),
+}
+
+# Points drawn on the outer edge of the grey band with text symbols
+ANGLE_POINTS = {'Ascendant': 'AC', 'Midheaven': 'MC'}
+
+# Bump whenever a renderer's output changes, so cached images are not reused
+RENDER_VERSION = 2
+
+
+def chart_points(chart: Dict) -> Dict[str, Dict]:
+    """Planets plus Ascendant and Midheaven, in drawing order."""
+    return {**chart['planets'], 'Ascendant': chart['ascendant'], 'Midheaven': chart['midheaven']}
+
+
+def render_key(chart: Dict, options: Dict[str, Any]) -> str:
+    """
+    Content hash of everything a rendered image depends on.
+
+    Args:
+        chart: Birth chart as returned by calculate_birth_chart
+        options: Render options such as the image format
+
+    Returns:
+        Hex digest, identical for charts that draw the same wheel
+    """
+    points = [
+        [name, data.get('symbol'), data['degrees'], data.get('sign_degrees')]
+        for name, data in chart_points(chart).items()
+    ]
+    aspects = [[aspect['point1'], aspect['point2'], aspect['aspect']] for aspect in chart_aspects(chart)]
+    payload = json.dumps({"version": RENDER_VERSION, "points": points, "aspects": aspects, "options": options}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def chart_aspects(chart: Dict) -> Sequence[Dict]:
+    """The chart's planet aspects, computed if the chart predates them."""
+    aspects = chart.get('aspects')
+    return find_aspects(chart['planets']) if aspects is None else aspects
+
+
+def chart_aspect_lines(chart: Dict) -> List[Tuple[float, float, str, float]]:
+    """
+    Aspects between planets (not AC/MC) as lines to draw.
+
+    Returns:
+        List of (degrees1, degrees2, line style, alpha)
+    """
+    planets = chart['planets']
+    lines = []
+    for aspect in chart_aspects(chart):
+        style, alpha = ASPECT_STYLES[aspect['aspect']]
+        lines.append((planets[aspect['point1']]['degrees'], planets[aspect['point2']]['degrees'], style, alpha))
+    return lines
+
+
+def tangent_rotation(screen_deg: float) -> float:
+    """
+    Returns a text rotation (deg) that keeps the label tangential
+    to the ring *and* upright, using the final screen angle.
+    """
+    deg = screen_deg % 360
+    rot = deg - 90
+    # Flip text on the bottom half of the screen (180 to 360 degrees)
+    if 180 < deg < 360:
+        rot += 180
+    return rot % 360
+
+
+def _wheel_axes(fig: Any) -> Any:
+    """Polar axes with the wheel's orientation and radial extent."""
+    import numpy as np
+
+    ax = fig.add_subplot(projection='polar')
+    ax.set_theta_offset(np.pi)  # Set 0 degrees (Aries) to the left
+    ax.set_theta_direction(1) # Ensure Counter-Clockwise
+    ax.set_xticks([])
+    ax.set_yticks([])
+    ax.spines['polar'].set_visible(False)
+    ax.set_ylim(0, 1.2)
+    return ax
+
+
+@lru_cache(maxsize=4)
+def chart_background(dpi: int = 300) -> Tuple[Any, Any]:
+    """
+    Render the parts of the wheel that are the same for every chart.
+
+    Rings, degree ticks, sign separators and sign labels are drawn once per
+    dpi and reused by every render at that dpi.
+
+    Returns:
+        (RGBA Pillow image, crop box in inches for the chart layers drawn on top)
+    """
+    import numpy as np
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from PIL import Image
+
+    # --- Chart Styling ---
+    fig = Figure(figsize=(12, 12))
+    canvas = FigureCanvasAgg(fig)
+    ax = _wheel_axes(fig)
+    ax.set_facecolor('#FFFFFF')
+    fig.patch.set_facecolor('#FFFFFF')
+
+    # --- Draw Rings ---
+    ax.fill_between(np.linspace(0, 2 * np.pi, 200), 1.0, 1.2, color='black', zorder=2)
+    ax.fill_between(np.linspace(0, 2 * np.pi, 200), 0.8, 1.0, color='#F0F0F0', zorder=1)
+    ax.fill_between(np.linspace(0, 2 * np.pi, 200), 0, 0.8, color='white', zorder=1)
+
+    # --- Degree Markers ---
+    for i in range(360):
+        angle = np.deg2rad(i)
+        style = {'color': '#AAAAAA', 'lw': 0.5, 'zorder': 3}
+        if i % 10 == 0:
+            ax.plot([angle, angle], [0.97, 1.0], **style)
+        elif i % 5 == 0:
+            ax.plot([angle, angle], [0.98, 1.0], **style)
+        else:
+            ax.plot([angle, angle], [0.99, 1.0], **style)
+
+    # --- Zodiac Signs and Separators ---
+    for i in range(12):
+        angle_deg_start = i * 30
+        angle_rad_start = np.deg2rad(angle_deg_start)
+        ax.plot([angle_rad_start, angle_rad_start], [1.0, 1.2], color='white', lw=1.5, zorder=3)
+
+        sign_name = ZODIAC_SIGNS[i][0].upper()
+        data_theta_rad = np.deg2rad(angle_deg_start + 15)
+
+        # Calculate the final screen angle by applying the offset
+        screen_theta_rad = data_theta_rad + ax.get_theta_offset()
+
+        ax.text(
+            data_theta_rad, # Position is in data coordinates
+            1.1,
+            sign_name,
+            ha='center',
+            va='center',
+            fontsize=11,
+            fontweight='bold',
+            color='white',
+            rotation=tangent_rotation(np.degrees(screen_theta_rad)), # Rotation is based on the final screen angle
+            rotation_mode='anchor',
+            zorder=4
+        )
+
+    # Chart artists stay inside the sign ring, so the background's tight box fits every chart
+    bbox = fig.get_tightbbox(canvas.get_renderer()).padded(0.1)
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', dpi=dpi, bbox_inches=bbox, facecolor=fig.get_facecolor())
+    background = Image.open(buf).convert('RGBA')
+    return background, bbox
+
+
+def render_chart_layer(chart: Dict, dpi: int, bbox: Any) -> bytes:
+    """
+    Draw the chart-specific artists (planets, degree labels, AC/MC, aspects) on a transparent canvas.
+
+    Returns:
+        Raw RGBA pixels cropped to bbox
+    """
+    import numpy as np
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(12, 12))
+    ax = _wheel_axes(fig)
+    ax.patch.set_visible(False)
+    fig.patch.set_alpha(0)
+
+    # --- Plot Planets & Points ---
+    for name, data in chart_points(chart).items():
+        angle = np.deg2rad(data['degrees'])
+        radius = 0.9 if name not in ANGLE_POINTS else 1.0
+        # Use specific symbols for AC/MC
+        symbol = ANGLE_POINTS.get(name, data['symbol'])
+
+        ax.text(angle, radius, symbol, ha='center', va='center', fontsize=16 if name in ANGLE_POINTS else 14,
+                color='black', zorder=5, bbox=dict(boxstyle='circle,pad=0.2', fc='white', ec='none'))
+
+        # Planet degree labels
+        if name not in ANGLE_POINTS:
+            ax.text(angle, 0.82, f"{data['sign_degrees']:.0f}°", ha='center', va='center', fontsize=8, color='#555', zorder=5)
+
+    # --- Draw Aspects ---
+    for degrees1, degrees2, style, alpha in chart_aspect_lines(chart):
+        angle1 = np.deg2rad(degrees1)
+        angle2 = np.deg2rad(degrees2)
+        ax.plot([angle1, angle2], [0.8, 0.8], color='#AAAAAA', ls=style, lw=0.8, zorder=1, alpha=alpha)
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format='raw', dpi=dpi, bbox_inches=bbox, transparent=True)
+    return buf.getvalue()
+
+
+def composite_chart(background: Any, layer: bytes, dpi: int) -> bytes:
+    """
+    Alpha-composite a chart layer over the background and encode the PNG.
+
+    The wheel is drawn in greys only, so it is encoded as a grayscale PNG:
+    a third of the RGBA size and several times faster to compress.
+    """
+    from PIL import Image
+
+    overlay = Image.frombuffer('RGBA', background.size, layer, 'raw', 'RGBA', 0, 1)
+    image = Image.alpha_composite(background, overlay).convert('L')
+    buf = io.BytesIO()
+    image.save(buf, format='PNG', dpi=(dpi, dpi))
+    return buf.getvalue()
+
+
+def render_chart_png(chart: Dict, dpi: int = 300) -> bytes:
+    """
+    Render the birth chart wheel as a PNG in a minimalistic style.
+
+    Pipeline: the cached static background for this dpi, the chart layer
+    drawn on a transparent canvas of the same size, then the composite.
+
+    Args:
+        chart: Birth chart as returned by calculate_birth_chart
+        dpi: Resolution of the 12in figure; 300 gives the full-size master
+    """
+    background, bbox = chart_background(dpi)
+    layer = render_chart_layer(chart, dpi, bbox)
+    return composite_chart(background, layer, dpi)
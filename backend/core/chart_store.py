@@ -0,0 +1,128 @@
+"""
+In-memory store of computed birth charts and artifacts derived from them.
+
+Chart ids are an HMAC of the normalized birth data, so the same chart gets the
+same id on every worker but ids cannot be computed, or birth data confirmed,
+without the server secret: CHART_ID_SECRET, or else a random secret created
+once in the data directory and shared by the workers on this host.
+
+The store itself lives in process memory. With several API workers a chart_id
+is only known to the worker that computed the chart, so callers must send the
+birth data along with it; an id alone fails with 404 on another worker.
+"""
+import hashlib
+import hmac
+import os
+import secrets
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+from .config import Config
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data" / "chart_store"
+SECRET_FILENAME = "chart_id.secret"
+
+
+@lru_cache(maxsize=1)
+def _chart_id_secret() -> bytes:
+    """The configured secret, or the one in the data directory, created on first use."""
+    if Config.CHART_ID_SECRET:
+        return Config.CHART_ID_SECRET.encode("utf-8")
+    path = DATA_DIR / SECRET_FILENAME
+    if not path.exists():
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=DATA_DIR, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(secrets.token_hex(32))
+            # Fails if another worker created it first; everyone then reads theirs
+            os.link(tmp_path, path)
+        except FileExistsError:
+            pass
+        finally:
+            os.unlink(tmp_path)
+    return path.read_text().strip().encode("utf-8")
+
+
+def make_chart_id(birth_date: str, birth_time: str, latitude: float, longitude: float) -> str:
+    """
+    Build a chart id from normalized birth data, keyed with the server secret.
+
+    Inputs that calculate_birth_chart treats as the same chart get the same id.
+    """
+    birth_datetime = datetime.strptime(f"{birth_date} {birth_time}", "%Y-%m-%d %H:%M")
+    precision = Config.CHART_COORD_PRECISION
+    key = f"{birth_datetime.isoformat()}|{round(float(latitude), precision)}|{round(float(longitude), precision)}"
+    return hmac.new(_chart_id_secret(), key.encode("utf-8"), hashlib.sha256).hexdigest()[:24]
+
+
+class ChartStore:
+    """LRU store of charts by id, each with a dict of derived artifacts (roasts)."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # chart_id -> {"last_used", "chart", "artifacts"}
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "artifact_hits": 0}
+
+    def _entry(self, chart_id: str) -> Optional[Dict[str, Any]]:
+        # Caller holds the lock
+        entry = self._entries.get(chart_id)
+        if entry is None:
+            return None
+        if time.time() - entry["last_used"] > self.ttl_seconds:
+            del self._entries[chart_id]
+            self._stats["evictions"] += 1
+            return None
+        entry["last_used"] = time.time()
+        self._entries.move_to_end(chart_id)
+        return entry
+
+    def put(self, chart_id: str, chart: Dict) -> None:
+        with self._lock:
+            entry = self._entry(chart_id)
+            if entry is not None:
+                entry["chart"] = chart
+                return
+            self._entries[chart_id] = {"last_used": time.time(), "chart": chart, "artifacts": {}}
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def get(self, chart_id: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entry(chart_id)
+            self._stats["hits" if entry is not None else "misses"] += 1
+            return entry["chart"] if entry is not None else None
+
+    def get_artifact(self, chart_id: str, name: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entry(chart_id)
+            artifact = entry["artifacts"].get(name) if entry is not None else None
+            if artifact is not None:
+                self._stats["artifact_hits"] += 1
+            return artifact
+
+    def put_artifact(self, chart_id: str, name: str, value: Any) -> None:
+        with self._lock:
+            entry = self._entry(chart_id)
+            # The chart was evicted meanwhile; nothing to attach the artifact to
+            if entry is not None:
+                entry["artifacts"][name] = value
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        stats["max_size"] = self.max_entries
+        return stats
+
+
+chart_store = ChartStore(Config.CHART_STORE_SIZE, Config.CHART_STORE_TTL_SECONDS)
@@ -0,0 +1,113 @@
+"""
+Birth chart wheel rendering as SVG text.
+
+Draws the same wheel as chart_plot.render_chart_png (sign ring, degree ticks,
+planets, AC/MC and aspect lines) without matplotlib: the 360 degree ticks are
+a single path and the whole chart is a few dozen elements.
+"""
+import math
+from functools import lru_cache
+from typing import Dict, List, Optional
+from xml.sax.saxutils import escape
+from .birth_chart_calculator import ZODIAC_SIGNS
+from .chart_plot import ANGLE_POINTS, chart_aspect_lines, chart_points, tangent_rotation
+
+# Canvas size in px; the outer edge of the sign ring (radius 1.2) sits 20px inside
+SIZE = 1000
+CENTER = SIZE / 2
+UNIT = (SIZE / 2 - 20) / 1.2
+# Points to px at the PNG renderer's scale (12in figure at 300 dpi, tight bbox)
+PT = 1.443
+
+FONT_FAMILY = "DejaVu Sans, Segoe UI Symbol, Noto Sans Symbols, sans-serif"
+
+
+def _xy(degrees: float, radius: float) -> str:
+    """Screen position of a zodiac longitude at a wheel radius (0° Aries on the left, counter-clockwise)."""
+    screen = math.radians(degrees + 180.0)
+    return f"{CENTER + radius * UNIT * math.cos(screen):.2f},{CENTER - radius * UNIT * math.sin(screen):.2f}"
+
+
+def _text(degrees: float, radius: float, text: str, size_pt: float, color: str, extra: str = "") -> str:
+    x, y = _xy(degrees, radius).split(",")
+    return (f'<text x="{x}" y="{y}" font-size="{size_pt * PT:.1f}" fill="{color}" '
+            f'text-anchor="middle" dominant-baseline="central"{extra}>{escape(text)}</text>')
+
+
+def _ring(inner: float, outer: float, color: str) -> str:
+    radius = (inner + outer) / 2 * UNIT
+    return (f'<circle cx="{CENTER}" cy="{CENTER}" r="{radius:.2f}" fill="none" '
+            f'stroke="{color}" stroke-width="{(outer - inner) * UNIT:.2f}"/>')
+
+
+@lru_cache(maxsize=1)
+def _background_svg() -> str:
+    """The elements that are the same for every chart: rings, degree ticks, separators and sign labels."""
+    parts: List[str] = [
+        f'<rect width="{SIZE}" height="{SIZE}" fill="#FFFFFF"/>',
+        # --- Rings ---
+        _ring(1.0, 1.2, "black"),
+        _ring(0.8, 1.0, "#F0F0F0"),
+    ]
+
+    # --- Degree markers, one path ---
+    ticks = []
+    for i in range(360):
+        length = 0.03 if i % 10 == 0 else 0.02 if i % 5 == 0 else 0.01
+        ticks.append(f"M{_xy(i, 1.0 - length)}L{_xy(i, 1.0)}")
+    parts.append(f'<path d="{"".join(ticks)}" stroke="#AAAAAA" stroke-width="{0.5 * PT:.2f}"/>')
+
+    # --- Zodiac signs and separators ---
+    separators = "".join(f"M{_xy(i * 30, 1.0)}L{_xy(i * 30, 1.2)}" for i in range(12))
+    parts.append(f'<path d="{separators}" stroke="white" stroke-width="{1.5 * PT:.2f}"/>')
+    for i in range(12):
+        degrees = i * 30 + 15
+        x, y = _xy(degrees, 1.1).split(",")
+        rotation = tangent_rotation(degrees + 180.0)
+        parts.append(_text(degrees, 1.1, ZODIAC_SIGNS[i][0].upper(), 11, "white",
+                           f' font-weight="bold" transform="rotate({-rotation:.2f} {x} {y})"'))
+    return "\n".join(parts)
+
+
+def render_chart_svg(chart: Dict, size: Optional[int] = None) -> bytes:
+    """
+    Render the birth chart wheel as an SVG document.
+
+    The static background is built once; only the chart's aspects, planets
+    and labels are generated per call.
+
+    Args:
+        chart: Birth chart as returned by calculate_birth_chart
+        size: Displayed width and height in px, SIZE by default
+    """
+    size = size or SIZE
+    parts: List[str] = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" '
+        f'viewBox="0 0 {SIZE} {SIZE}" font-family="{FONT_FAMILY}">',
+        _background_svg(),
+    ]
+
+    # --- Aspects, inside the white disc ---
+    for degrees1, degrees2, style, alpha in chart_aspect_lines(chart):
+        x1, y1 = _xy(degrees1, 0.8).split(",")
+        x2, y2 = _xy(degrees2, 0.8).split(",")
+        dash = ' stroke-dasharray="4.3,1.8"' if style == 'dashed' else ""
+        parts.append(f'<line x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}" stroke="#AAAAAA" '
+                     f'stroke-width="{0.8 * PT:.2f}" stroke-opacity="{alpha}"{dash}/>')
+
+    # --- Planets & points ---
+    for name, data in chart_points(chart).items():
+        radius = 0.9 if name not in ANGLE_POINTS else 1.0
+        symbol = ANGLE_POINTS.get(name, data['symbol'])
+        size_pt = 16 if name in ANGLE_POINTS else 14
+        # Circle around the label like matplotlib's boxstyle='circle,pad=0.2'
+        width = 0.62 * len(symbol) if name in ANGLE_POINTS else 0.8
+        circle_radius = (math.hypot(width, 1.0) / 2 + 0.2) * size_pt * PT
+        x, y = _xy(data['degrees'], radius).split(",")
+        parts.append(f'<circle cx="{x}" cy="{y}" r="{circle_radius:.2f}" fill="white"/>')
+        parts.append(_text(data['degrees'], radius, symbol, size_pt, "black"))
+        if name not in ANGLE_POINTS:
+            parts.append(_text(data['degrees'], 0.82, f"{data['sign_degrees']:.0f}°", 8, "#555"))
+
+    parts.append("</svg>")
+    return "\n".join(parts).encode("utf-8")
@@ -13,6 +13,102 @@ class Config:
     
     # OpenAI Configuration
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+
+    # Shared OpenAI HTTP connection pool
+    OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "20"))
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "10"))
+    OPENAI_KEEPALIVE_EXPIRY = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", "30"))
+    OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "60"))
+    OPENAI_CONNECT_TIMEOUT = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "5"))
+    OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+
+    # Horoscope upstream scraping; the defaults cover 12 signs x 5 periods in one round trip
+    SCRAPER_POOL_SIZE = int(os.getenv("SCRAPER_POOL_SIZE", "60"))
+    SCRAPER_CONNECT_TIMEOUT = float(os.getenv("SCRAPER_CONNECT_TIMEOUT", "3"))
+    SCRAPER_READ_TIMEOUT = float(os.getenv("SCRAPER_READ_TIMEOUT", "10"))
+    PREFETCH_WORKERS = int(os.getenv("PREFETCH_WORKERS", "60"))
+
+    # Entries kept in memory per tiered cache namespace
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+
+    # Birth chart memoization: entries kept and decimals of lat/lon in the key
+    CHART_CACHE_SIZE = int(os.getenv("CHART_CACHE_SIZE", "2048"))
+    CHART_COORD_PRECISION = int(os.getenv("CHART_COORD_PRECISION", "4"))
+
+    # Planet engine: "ephem" (heliocentric hlong, the original output) or
+    # "swisseph" (geocentric longitudes with speeds and retrograde flags)
+    CHART_ENGINE = os.getenv("CHART_ENGINE", "ephem").lower()
+
+    # Orb table used for chart aspects: standard, tight or wide (see core/aspects.py)
+    ASPECT_ORB_TABLE = os.getenv("ASPECT_ORB_TABLE", "standard").lower()
+
+    # Precomputed ephemeris table (python -m backend.core.ephemeris_table), read by
+    # the swisseph engine only; lookups fall back to Swiss Ephemeris when its
+    # error bound exceeds this precision
+    EPHEMERIS_TABLE_ENABLED = os.getenv("EPHEMERIS_TABLE_ENABLED", "true").lower() in ("1", "true", "yes")
+    EPHEMERIS_PRECISION_DEGREES = float(os.getenv("EPHEMERIS_PRECISION_DEGREES", "0.01"))
+
+    # Computed charts kept for follow-up requests by chart_id
+    CHART_STORE_SIZE = int(os.getenv("CHART_STORE_SIZE", "1000"))
+    CHART_STORE_TTL_SECONDS = float(os.getenv("CHART_STORE_TTL_SECONDS", "3600"))
+    # Key for chart ids; when unset, a random one is kept in backend/data/chart_store.
+    # Set it when API workers run on several hosts so their ids agree
+    CHART_ID_SECRET = os.getenv("CHART_ID_SECRET", "")
+
+    # Refresh-ahead scheduler for period boundaries
+    REFRESH_ENABLED = os.getenv("REFRESH_ENABLED", "true").lower() in ("1", "true", "yes")
+    REFRESH_LEAD_SECONDS = float(os.getenv("REFRESH_LEAD_SECONDS", "900"))
+    REFRESH_JITTER_SECONDS = float(os.getenv("REFRESH_JITTER_SECONDS", "300"))
+    REFRESH_STAGGER_SECONDS = float(os.getenv("REFRESH_STAGGER_SECONDS", "1"))
+    REFRESH_GRACE_SECONDS = float(os.getenv("REFRESH_GRACE_SECONDS", "3600"))
+    REFRESH_LANGUAGES = os.getenv("REFRESH_LANGUAGES", "English,French,Russian")
+
+    # Chart PNG rendering pool: worker processes (0 renders in the request thread),
+    # queued plus running renders before new ones get 503, per-render deadline
+    # and renders per worker before it is replaced. Each API process starts its
+    # own pool, so by default the cores are shared between the WEB_CONCURRENCY
+    # uvicorn workers, with at most 4 renderers per process
+    RENDER_WORKERS = int(os.getenv(
+        "RENDER_WORKERS",
+        str(max(1, min(4, (os.cpu_count() or 1) // max(1, int(os.getenv("WEB_CONCURRENCY", "1"))))))
+    ))
+    RENDER_QUEUE_SIZE = int(os.getenv("RENDER_QUEUE_SIZE", "32"))
+    RENDER_TIMEOUT_SECONDS = float(os.getenv("RENDER_TIMEOUT_SECONDS", "30"))
+    RENDER_MAX_TASKS_PER_WORKER = int(os.getenv("RENDER_MAX_TASKS_PER_WORKER", "50"))
+
+    # Rendered chart images: memory and disk budgets in bytes, and the
+    # Cache-Control max-age sent with them
+    RENDER_CACHE_MEMORY_BYTES = int(os.getenv("RENDER_CACHE_MEMORY_BYTES", str(64 * 1024 * 1024)))
+    RENDER_CACHE_DISK_BYTES = int(os.getenv("RENDER_CACHE_DISK_BYTES", str(1024 * 1024 * 1024)))
+    RENDER_CACHE_MAX_AGE = int(os.getenv("RENDER_CACHE_MAX_AGE", "86400"))
+
+    # LLM response cache (core/llm_cache.py): on-disk budget in bytes, and
+    # responses collected per prompt before hits start rotating through them
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+    LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+    LLM_CACHE_VARIANTS = int(os.getenv("LLM_CACHE_VARIANTS", "1"))
+
+    # Pre-generated placement roasts (python -m backend.core.roast_library):
+    # served before any LLM call; variants kept per planet/sign/house/language
+    ROAST_LIBRARY_ENABLED = os.getenv("ROAST_LIBRARY_ENABLED", "true").lower() in ("1", "true", "yes")
+    ROAST_LIBRARY_VARIANTS = int(os.getenv("ROAST_LIBRARY_VARIANTS", "3"))
+
+    # How /birth-chart/roast-placements generates roasts by default:
+    # "per_placement" (one LLM call per placement, then the synthesis) or
+    # "single" (one structured call for the whole chart)
+    PLACEMENT_ROAST_MODE = os.getenv("PLACEMENT_ROAST_MODE", "per_placement").lower()
+
+    # Maximum number of placement roasts generated concurrently per request
+    PLACEMENT_ROAST_CONCURRENCY = int(os.getenv("PLACEMENT_ROAST_CONCURRENCY", "5"))
+
+    # Roast streams (server-sent events): how long finished streams stay
+    # resumable via Last-Event-ID, seconds between heartbeats on an idle
+    # stream, and the reconnect delay suggested to clients in ms
+    SSE_BUFFER_TTL_SECONDS = float(os.getenv("SSE_BUFFER_TTL_SECONDS", "300"))
+    SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+    SSE_RETRY_MS = int(os.getenv("SSE_RETRY_MS", "3000"))
+    # Most stream buffers held at once; the oldest finished ones go first
+    SSE_MAX_BUFFERS = int(os.getenv("SSE_MAX_BUFFERS", "256"))
     
     @classmethod
     def validate(cls) -> None:
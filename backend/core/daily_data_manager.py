@@ -1,119 +1,206 @@
 """
 Daily data manager for saving and loading horoscope data.
+
+Horoscopes are stored in an SQLite database (WAL mode) keyed by
+(date, period, sign), so several uvicorn workers can read and write it
+at the same time.
 """
 import json
-import os
-from datetime import datetime, date
+import sqlite3
+import threading
+from datetime import datetime, date, timedelta
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
 DATA_DIR = Path(__file__).resolve().parent.parent / "data" / "daily_horoscopes"
 DATA_DIR.mkdir(parents=True, exist_ok=True)
+DB_FILENAME = "horoscopes.sqlite3"
 
 # Valid time periods
 VALID_PERIODS = ["daily", "yesterday", "tomorrow", "weekly", "monthly"]
 
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS horoscopes (
+    date TEXT NOT NULL,
+    period TEXT NOT NULL,
+    sign TEXT NOT NULL,
+    text TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (date, period, sign)
+) WITHOUT ROWID
+"""
+
+# One connection per thread and database file
+_local = threading.local()
+
+
+def get_db_path() -> Path:
+    """Get the path to the horoscope database."""
+    return DATA_DIR / DB_FILENAME
+
 
-def get_today_filename() -> str:
-    """Get filename for today's data."""
-    today = date.today()
-    return f"horoscopes_{today.strftime('%Y-%m-%d')}.json"
+def _connect() -> sqlite3.Connection:
+    path = get_db_path()
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(path)
+    if conn is None:
+        created = not path.exists()
+        conn = sqlite3.connect(str(path), timeout=5.0, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute(SCHEMA)
+        connections[path] = conn
+        if created:
+            _import_legacy_json(conn)
+    return conn
 
 
-def get_data_file_path() -> Path:
-    """Get the path to today's data file."""
-    return DATA_DIR / get_today_filename()
+def _import_legacy_json(conn: sqlite3.Connection) -> None:
+    """Import horoscopes_YYYY-MM-DD.json files written before the database existed."""
+    for file_path in DATA_DIR.glob("horoscopes_*.json"):
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            day = datetime.fromisoformat(data["date"]).date().isoformat()
+            timestamp = data.get("timestamp") or datetime.now().isoformat()
+            rows = []
+            for outer, inner in data.get("horoscopes", {}).items():
+                for key, text in inner.items():
+                    # Files are either {period: {sign: text}} or the older {sign: {period: text}}
+                    period, sign = (outer, key) if outer in VALID_PERIODS else (key, outer)
+                    if period in VALID_PERIODS and text:
+                        rows.append((day, period, sign, text, timestamp))
+            with conn:
+                conn.execute("BEGIN")
+                conn.executemany(
+                    "INSERT OR IGNORE INTO horoscopes (date, period, sign, text, updated_at) VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+        except Exception as e:
+            logger.warning(f"Failed to import legacy file {file_path}: {e}")
 
 
-def save_horoscopes(horoscopes: Dict[str, Dict[str, str]], period: str = "daily") -> None:
+def save_horoscopes(horoscopes: Dict[str, str], period: str = "daily", day: Optional[date] = None) -> None:
     """
-    Save horoscopes to disk for a specific period.
-    
+    Save horoscopes to disk for a specific period in a single transaction.
+
     Args:
         horoscopes: Dictionary with structure {sign: text}
         period: Time period (daily, yesterday, tomorrow, weekly, monthly)
+        day: Date the horoscopes belong to, today by default
     """
     if period not in VALID_PERIODS:
         logger.error(f"Invalid period: {period}")
         return
-    
+
     try:
-        file_path = get_data_file_path()
-        
-        # Load existing data if it exists
-        existing_data = {}
-        if file_path.exists():
-            with open(file_path, 'r', encoding='utf-8') as f:
-                existing_data = json.load(f)
-        
-        # Update with new data
-        if "horoscopes" not in existing_data:
-            existing_data["horoscopes"] = {}
-        
-        existing_data["horoscopes"][period] = horoscopes
-        existing_data["date"] = date.today().isoformat()
-        existing_data["timestamp"] = datetime.now().isoformat()
-        
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(existing_data, f, indent=2, ensure_ascii=False)
-        
-        logger.info(f"Saved {period} horoscopes to {file_path}")
+        day_str = (day or date.today()).isoformat()
+        timestamp = datetime.now().isoformat()
+        conn = _connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT INTO horoscopes (date, period, sign, text, updated_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (date, period, sign) DO UPDATE SET text = excluded.text, updated_at = excluded.updated_at",
+                [(day_str, period, sign, text, timestamp) for sign, text in horoscopes.items()]
+            )
+        logger.info(f"Saved {len(horoscopes)} {period} horoscopes for {day_str}")
     except Exception as e:
         logger.error(f"Failed to save {period} horoscopes: {e}")
 
 
-def load_horoscopes(period: str = "daily") -> Optional[Dict[str, str]]:
+def load_horoscopes(period: str = "daily", day: Optional[date] = None) -> Optional[Dict[str, str]]:
     """
     Load horoscopes from disk for a specific period.
-    
+
     Args:
         period: Time period (daily, yesterday, tomorrow, weekly, monthly)
-    
+        day: Date to load, today by default
+
     Returns:
         Dictionary with horoscopes or None if not found
     """
     if period not in VALID_PERIODS:
         logger.error(f"Invalid period: {period}")
         return None
-    
+
     try:
-        file_path = get_data_file_path()
-        if not file_path.exists():
-            logger.info(f"No horoscope data found for {period}")
-            return None
-        
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # Check if the data is from today
-        saved_date = datetime.fromisoformat(data["date"]).date()
-        if saved_date != date.today():
-            logger.info("Saved data is not from today, will fetch fresh data")
-            return None
-        
-        horoscopes = data.get("horoscopes", {})
-        period_data = horoscopes.get(period, {})
-        
-        if period_data:
-            logger.info(f"Loaded {period} horoscopes from {file_path}")
-            return period_data
+        day_str = (day or date.today()).isoformat()
+        rows = _connect().execute(
+            "SELECT sign, text FROM horoscopes WHERE date = ? AND period = ?",
+            (day_str, period)
+        ).fetchall()
+
+        if rows:
+            logger.info(f"Loaded {period} horoscopes for {day_str}")
+            return dict(rows)
         else:
-            logger.info(f"No {period} horoscopes found in saved data")
+            logger.info(f"No {period} horoscopes found for {day_str}")
             return None
-            
+
     except Exception as e:
         logger.error(f"Failed to load {period} horoscopes: {e}")
         return None
 
 
+def load_horoscope(sign: str, period: str = "daily", day: Optional[date] = None) -> Optional[str]:
+    """
+    Load a single horoscope with a point lookup.
+
+    Args:
+        sign: Zodiac sign in lowercase
+        period: Time period
+        day: Date to load, today by default
+
+    Returns:
+        Horoscope text or None if not found
+    """
+    try:
+        row = _connect().execute(
+            "SELECT text FROM horoscopes WHERE date = ? AND period = ? AND sign = ?",
+            ((day or date.today()).isoformat(), period, sign)
+        ).fetchone()
+        return row[0] if row else None
+    except Exception as e:
+        logger.error(f"Failed to load {sign} ({period}) horoscope: {e}")
+        return None
+
+
+def load_horoscopes_range(start: date, end: date, period: Optional[str] = None) -> List[Tuple[str, str, str, str]]:
+    """
+    Load every horoscope between two dates (inclusive).
+
+    Args:
+        start: First date
+        end: Last date
+        period: Optional period to restrict to
+
+    Returns:
+        List of (date, period, sign, text) rows ordered by date
+    """
+    query = "SELECT date, period, sign, text FROM horoscopes WHERE date BETWEEN ? AND ?"
+    params: Iterable = (start.isoformat(), end.isoformat())
+    if period is not None:
+        query += " AND period = ?"
+        params = (*params, period)
+    try:
+        return _connect().execute(query + " ORDER BY date, period, sign", params).fetchall()
+    except Exception as e:
+        logger.error(f"Failed to load horoscopes between {start} and {end}: {e}")
+        return []
+
+
 def save_daily_horoscopes(horoscopes: Dict[str, Dict[str, str]]) -> None:
     """
     Legacy function for backward compatibility.
     Save daily horoscopes to disk.
-    
+
     Args:
         horoscopes: Dictionary with structure {sign: {period: text}}
     """
@@ -122,7 +209,7 @@ def save_daily_horoscopes(horoscopes: Dict[str, Dict[str, str]]) -> None:
     for sign, periods in horoscopes.items():
         if "daily" in periods:
             daily_horoscopes[sign] = periods["daily"]
-    
+
     save_horoscopes(daily_horoscopes, "daily")
 
 
@@ -130,7 +217,7 @@ def load_daily_horoscopes() -> Optional[Dict[str, Dict[str, str]]]:
     """
     Legacy function for backward compatibility.
     Load today's horoscopes from disk.
-    
+
     Returns:
         Dictionary with horoscopes or None if not found
     """
@@ -144,55 +231,40 @@ def load_daily_horoscopes() -> Optional[Dict[str, Dict[str, str]]]:
 def is_data_fresh(period: str = "daily") -> bool:
     """
     Check if we have fresh data for today and specific period.
-    
+
     Args:
         period: Time period to check
-    
+
     Returns:
         True if fresh data exists, False otherwise
     """
     if period not in VALID_PERIODS:
         return False
-    
-    file_path = get_data_file_path()
-    if not file_path.exists():
-        return False
-    
+
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        saved_date = datetime.fromisoformat(data["date"]).date()
-        if saved_date != date.today():
-            return False
-        
-        # Check if the specific period exists
-        horoscopes = data.get("horoscopes", {})
-        return period in horoscopes and bool(horoscopes[period])
+        row = _connect().execute(
+            "SELECT 1 FROM horoscopes WHERE date = ? AND period = ? LIMIT 1",
+            (date.today().isoformat(), period)
+        ).fetchone()
+        return row is not None
     except Exception:
         return False
 
 
 def cleanup_old_data(days_to_keep: int = 7) -> None:
     """
-    Clean up old horoscope data files.
-    
+    Clean up old horoscope data.
+
     Args:
         days_to_keep: Number of days of data to keep
     """
     try:
-        cutoff_date = date.today() - datetime.timedelta(days=days_to_keep)
-        
-        for file_path in DATA_DIR.glob("horoscopes_*.json"):
-            try:
-                # Extract date from filename
-                date_str = file_path.stem.split("_")[1]
-                file_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-                
-                if file_date < cutoff_date:
-                    file_path.unlink()
-                    logger.info(f"Deleted old data file: {file_path}")
-            except Exception as e:
-                logger.warning(f"Failed to process file {file_path}: {e}")
+        cutoff_date = date.today() - timedelta(days=days_to_keep)
+        conn = _connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            deleted = conn.execute("DELETE FROM horoscopes WHERE date < ?", (cutoff_date.isoformat(),)).rowcount
+        if deleted:
+            logger.info(f"Deleted {deleted} horoscopes older than {cutoff_date}")
     except Exception as e:
-        logger.error(f"Failed to cleanup old data: {e}") 
\ No newline at end of file
+        logger.error(f"Failed to cleanup old data: {e}")
@@ -0,0 +1,262 @@
+"""
+Precomputed ephemeris table for fast planet position lookups.
+
+A build step samples Swiss Ephemeris geocentric longitudes and speeds for
+every body in PLANETS at a fixed step and stores them as a .npy file, with a
+JSON sidecar holding the layout and the measured interpolation error. At
+runtime the file is memory-mapped, so every worker shares the same pages,
+and positions are cubic Hermite interpolated from the two nearest rows.
+Only CHART_ENGINE=swisseph reads it; the default ephem engine never does.
+
+Build with: python -m backend.core.ephemeris_table [--start 1900] [--end 2100] [--step 1.0]
+"""
+import argparse
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Optional, Tuple
+import numpy as np
+import swisseph as swe
+from .birth_chart_calculator import SWE_BODIES, SWE_FLAGS, _swisseph_positions
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+TABLE_DIR = Path(__file__).resolve().parent.parent / "data" / "ephemeris"
+TABLE_NAME = "ephemeris"
+
+BODIES = tuple(SWE_BODIES.keys())
+
+# Random instants checked against Swiss Ephemeris for the error report
+ERROR_SAMPLES = 20000
+
+
+def table_paths(name: str = TABLE_NAME, directory: Path = TABLE_DIR) -> Tuple[Path, Path]:
+    """Return the (.npy data, .json metadata) paths of a table."""
+    return directory / f"{name}.npy", directory / f"{name}.json"
+
+
+def _sample(julian_days: np.ndarray) -> np.ndarray:
+    """Longitudes and speeds of every body, shape (len(julian_days), len(BODIES), 2)."""
+    rows = np.empty((len(julian_days), len(BODIES), 2))
+    for column, body in enumerate(SWE_BODIES.values()):
+        for row, jd in enumerate(julian_days.tolist()):
+            values, _ = swe.calc_ut(jd, body, SWE_FLAGS)
+            rows[row, column] = values[0], values[3]
+    return rows
+
+
+def _interpolate(data: np.ndarray, start_jd: float, step: float, julian_days: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Cubic Hermite interpolation of longitudes (from their speeds) at Julian days."""
+    position = (julian_days - start_jd) / step
+    index = np.minimum(np.floor(position).astype(np.int64), len(data) - 2)
+    t = (position - index)[:, None]
+    left, right = data[index], data[index + 1]
+    lon0, speed0 = left[..., 0], left[..., 1] * step
+    # Unwrap across 0°/360° so the segment is continuous
+    lon1 = lon0 + (right[..., 0] - lon0 + 180.0) % 360.0 - 180.0
+    speed1 = right[..., 1] * step
+
+    t2 = t * t
+    t3 = t2 * t
+    degrees = ((2 * t3 - 3 * t2 + 1) * lon0 + (t3 - 2 * t2 + t) * speed0
+               + (-2 * t3 + 3 * t2) * lon1 + (t3 - t2) * speed1)
+    speeds = ((6 * t2 - 6 * t) * lon0 + (3 * t2 - 4 * t + 1) * speed0
+              + (-6 * t2 + 6 * t) * lon1 + (3 * t2 - 2 * t) * speed1) / step
+    return degrees % 360.0, speeds
+
+
+def _write_atomically(path: Path, write: Callable[[BinaryIO], Any]) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        # mkstemp creates the file 0600; workers running as another user must read it
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def build_table(start_year: int = 1900, end_year: int = 2100, step: float = 1.0,
+                name: str = TABLE_NAME, directory: Path = TABLE_DIR) -> Dict[str, Any]:
+    """
+    Precompute the table and its error report.
+
+    Args:
+        start_year: First year covered
+        end_year: Last year covered (inclusive)
+        step: Days between rows
+        name: File name without extension
+        directory: Output directory
+
+    Returns:
+        The metadata written to the JSON sidecar
+    """
+    started = time.perf_counter()
+    start_jd = swe.julday(start_year, 1, 1, 0.0)
+    end_jd = swe.julday(end_year + 1, 1, 1, 0.0)
+    rows = int(np.ceil((end_jd - start_jd) / step)) + 1
+    data = _sample(start_jd + step * np.arange(rows))
+
+    # Error report: interpolated vs computed at random instants
+    rng = np.random.default_rng(0)
+    check_days = rng.uniform(start_jd, end_jd, ERROR_SAMPLES)
+    degrees, speeds = _interpolate(data, start_jd, step, check_days)
+    exact = _sample(check_days)
+    degree_errors = np.abs((degrees - exact[..., 0] + 180.0) % 360.0 - 180.0).max(axis=0)
+    speed_errors = np.abs(speeds - exact[..., 1]).max(axis=0)
+
+    directory.mkdir(parents=True, exist_ok=True)
+    data_path, meta_path = table_paths(name, directory)
+    metadata = {
+        "bodies": list(BODIES),
+        "flags": SWE_FLAGS,
+        "start_jd": start_jd,
+        "end_jd": end_jd,
+        "step_days": step,
+        "rows": rows,
+        "columns": ["longitude", "speed"],
+        "error_samples": ERROR_SAMPLES,
+        "max_error_degrees": {body: float(error) for body, error in zip(BODIES, degree_errors)},
+        "max_speed_error": {body: float(error) for body, error in zip(BODIES, speed_errors)},
+        "error_bound_degrees": float(degree_errors.max()),
+        "built_at": datetime.now().isoformat(),
+    }
+
+    # Written aside and renamed into place so running workers keep their mapping
+    _write_atomically(data_path, lambda f: np.save(f, data))
+    _write_atomically(meta_path, lambda f: f.write(json.dumps(metadata, indent=2).encode("utf-8")))
+
+    logger.info(f"Built ephemeris table {data_path} ({rows} rows) in {time.perf_counter() - started:.1f}s")
+    return metadata
+
+
+class EphemerisTable:
+    """Memory-mapped ephemeris table."""
+
+    def __init__(self, data_path: Path, meta_path: Path) -> None:
+        with meta_path.open("r", encoding="utf-8") as f:
+            self.metadata = json.load(f)
+        if self.metadata["bodies"] != list(BODIES) or self.metadata["flags"] != SWE_FLAGS:
+            raise ValueError(f"Ephemeris table {data_path} was built for different bodies or flags")
+        self.data = np.load(data_path, mmap_mode="r")
+        self.start_jd = self.metadata["start_jd"]
+        self.end_jd = self.metadata["end_jd"]
+        self.step = self.metadata["step_days"]
+        self.error_bound = self.metadata["error_bound_degrees"]
+
+    def covers(self, julian_days: Any) -> bool:
+        if isinstance(julian_days, float):
+            return self.start_jd <= julian_days <= self.end_jd
+        days = np.asarray(julian_days)
+        return bool(np.all((days >= self.start_jd) & (days <= self.end_jd)))
+
+    def positions(self, julian_days: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Longitudes and speeds, each shaped (len(julian_days), len(BODIES))."""
+        return _interpolate(self.data, self.start_jd, self.step, np.asarray(julian_days, dtype=float))
+
+    def position_at(self, jd: float) -> Dict[str, Dict[str, float]]:
+        """Longitudes and speeds at one Julian day; plain Python, as NumPy overhead dominates here."""
+        position = (jd - self.start_jd) / self.step
+        index = min(int(position), len(self.data) - 2)
+        t = position - index
+        t2 = t * t
+        t3 = t2 * t
+        h00, h10, h01, h11 = 2 * t3 - 3 * t2 + 1, t3 - 2 * t2 + t, -2 * t3 + 3 * t2, t3 - t2
+        d00, d10, d01, d11 = 6 * t2 - 6 * t, 3 * t2 - 4 * t + 1, -6 * t2 + 6 * t, 3 * t2 - 2 * t
+        step = self.step
+        left, right = self.data[index:index + 2].tolist()
+        result = {}
+        for body, (lon0, speed0), (lon1, speed1) in zip(BODIES, left, right):
+            lon1 = lon0 + (lon1 - lon0 + 180.0) % 360.0 - 180.0
+            speed0 *= step
+            speed1 *= step
+            result[body] = {
+                'degrees': (h00 * lon0 + h10 * speed0 + h01 * lon1 + h11 * speed1) % 360.0,
+                'speed': (d00 * lon0 + d10 * speed0 + d01 * lon1 + d11 * speed1) / step,
+            }
+        return result
+
+
+_table: Optional[EphemerisTable] = None
+_table_loaded = False
+_table_lock = threading.Lock()
+
+
+def get_table() -> Optional[EphemerisTable]:
+    """Return the shared table, or None when it is disabled or has not been built."""
+    global _table, _table_loaded
+    if not _table_loaded:
+        with _table_lock:
+            if not _table_loaded:
+                data_path, meta_path = table_paths()
+                if Config.EPHEMERIS_TABLE_ENABLED and data_path.exists() and meta_path.exists():
+                    try:
+                        _table = EphemerisTable(data_path, meta_path)
+                    except Exception as e:
+                        logger.warning(f"Ignoring ephemeris table {data_path}: {e}")
+                _table_loaded = True
+    return _table
+
+
+def table_usable(julian_days: Any, precision: Optional[float] = None) -> Optional[EphemerisTable]:
+    """
+    Return the table if it can serve these days at this precision, else None.
+
+    Args:
+        julian_days: Julian day or array of them
+        precision: Largest acceptable error in degrees, Config.EPHEMERIS_PRECISION_DEGREES by default
+    """
+    table = get_table()
+    precision = Config.EPHEMERIS_PRECISION_DEGREES if precision is None else precision
+    if table is None or precision < table.error_bound or not table.covers(julian_days):
+        return None
+    return table
+
+
+def lookup_positions(jd: float, precision: Optional[float] = None) -> Dict[str, Dict[str, float]]:
+    """
+    Geocentric longitudes and speeds of every body at a Julian day.
+
+    Served from the table when it covers the day within the requested
+    precision, otherwise computed with Swiss Ephemeris.
+    """
+    table = table_usable(jd, precision)
+    if table is None:
+        return _swisseph_positions(jd)
+    return table.position_at(jd)
+
+
+def get_table_stats() -> Dict[str, Any]:
+    """Coverage and error bound of the loaded table."""
+    table = get_table()
+    if table is None:
+        return {"loaded": False}
+    return {
+        "loaded": True,
+        "start_jd": table.start_jd,
+        "end_jd": table.end_jd,
+        "step_days": table.step,
+        "error_bound_degrees": table.error_bound,
+        "precision_degrees": Config.EPHEMERIS_PRECISION_DEGREES,
+    }
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Build the precomputed ephemeris table.")
+    parser.add_argument("--start", type=int, default=1900, help="first year covered")
+    parser.add_argument("--end", type=int, default=2100, help="last year covered")
+    parser.add_argument("--step", type=float, default=1.0, help="days between rows")
+    args = parser.parse_args()
+    report = build_table(args.start, args.end, args.step)
+    print(f"{'body':8s} {'max error (deg)':>16s} {'max speed error (deg/day)':>26s}")
+    for body in BODIES:
+        print(f"{body:8s} {report['max_error_degrees'][body]:16.2e} {report['max_speed_error'][body]:26.2e}")
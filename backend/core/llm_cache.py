@@ -0,0 +1,212 @@
+"""
+Content-addressed cache of LLM responses.
+
+Responses are keyed by a hash of everything that determines them: model,
+system prompt, user prompt and the response_format schema. They are stored in
+an SQLite database (WAL mode) shared by all workers and trimmed to
+LLM_CACHE_MAX_BYTES, least recently used first. With LLM_CACHE_VARIANTS above
+one, a key collects that many responses before hits start, and hits pick one
+of them at random.
+
+Structured responses are stored as their parsed fields and rebuilt with
+model_construct, so a hit skips both the request and pydantic validation.
+"""
+import hashlib
+import json
+import logging
+import random
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Type, Union
+from pydantic import BaseModel
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data" / "llm_cache"
+DATA_DIR.mkdir(parents=True, exist_ok=True)
+DB_FILENAME = "llm_cache.sqlite3"
+
+# Bump when the stored format changes
+CACHE_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT NOT NULL,
+    variant INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (key, variant)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+"""
+
+# Writes between checks of the total size
+EVICTION_CHECK_INTERVAL = 100
+
+# One connection per thread and database file
+_local = threading.local()
+
+_stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+_stats_lock = threading.Lock()
+_writes_since_check = EVICTION_CHECK_INTERVAL
+
+
+def get_db_path() -> Path:
+    """Get the path to the LLM cache database."""
+    return DATA_DIR / DB_FILENAME
+
+
+def _connect() -> sqlite3.Connection:
+    path = get_db_path()
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(path)
+    if conn is None:
+        conn = sqlite3.connect(str(path), timeout=5.0, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.executescript(SCHEMA)
+        connections[path] = conn
+    return conn
+
+
+def _count(name: str, delta: int = 1) -> None:
+    with _stats_lock:
+        _stats[name] += delta
+
+
+@lru_cache(maxsize=64)
+def _schema_json(response_format: Type[BaseModel]) -> str:
+    return json.dumps(response_format.model_json_schema(), sort_keys=True)
+
+
+def cache_key(model: str, system_prompt: str, input_text: str,
+              response_format: Optional[Type[BaseModel]] = None) -> str:
+    """Hash of every input that determines a response."""
+    payload = json.dumps({
+        "version": CACHE_VERSION,
+        "model": model,
+        "system": system_prompt,
+        "user": input_text,
+        "schema": _schema_json(response_format) if response_format else None,
+    })
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_cached_response(key: str, response_format: Optional[Type[BaseModel]] = None) -> Optional[Union[str, BaseModel]]:
+    """
+    Return a cached response, or None on a miss.
+
+    A key with fewer than LLM_CACHE_VARIANTS responses is a miss, so the
+    caller generates another variant.
+
+    Args:
+        key: From cache_key
+        response_format: Model to rebuild structured responses into
+    """
+    if not Config.LLM_CACHE_ENABLED:
+        return None
+    try:
+        conn = _connect()
+        rows = conn.execute("SELECT variant, kind, value FROM responses WHERE key = ?", (key,)).fetchall()
+        if len(rows) < max(1, Config.LLM_CACHE_VARIANTS):
+            _count("misses")
+            return None
+        variant, kind, value = random.choice(rows)
+        conn.execute("UPDATE responses SET last_used = ? WHERE key = ? AND variant = ?", (time.time(), key, variant))
+    except Exception as e:
+        logger.error(f"Failed to read LLM cache: {e}")
+        return None
+
+    _count("hits")
+    if kind == "json":
+        data = json.loads(value)
+        # Validated when it was stored
+        return response_format.model_construct(**data) if response_format else data
+    return value
+
+
+def save_response(key: str, response: Union[str, BaseModel]) -> None:
+    """Store a response as the next variant of a key, unless it already has enough."""
+    global _writes_since_check
+    if not Config.LLM_CACHE_ENABLED or response is None:
+        return
+    if isinstance(response, BaseModel):
+        kind, value = "json", response.model_dump_json()
+    else:
+        kind, value = "text", str(response)
+    try:
+        conn = _connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            # Eviction removes single variants, so numbers can have gaps: count and number separately
+            count, variant = conn.execute(
+                "SELECT COUNT(*), COALESCE(MAX(variant) + 1, 0) FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if count >= max(1, Config.LLM_CACHE_VARIANTS):
+                return
+            conn.execute(
+                "INSERT INTO responses (key, variant, kind, value, size, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, variant, kind, value, len(value.encode("utf-8")), time.time())
+            )
+    except Exception as e:
+        logger.error(f"Failed to write LLM cache: {e}")
+        return
+
+    _count("writes")
+    with _stats_lock:
+        _writes_since_check += 1
+        check = _writes_since_check >= EVICTION_CHECK_INTERVAL
+        if check:
+            _writes_since_check = 0
+    if check:
+        _evict()
+
+
+def _evict() -> None:
+    """Delete the least recently used responses until the cache is under 90% of its budget."""
+    try:
+        conn = _connect()
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= Config.LLM_CACHE_MAX_BYTES:
+            return
+        target = total - Config.LLM_CACHE_MAX_BYTES * 0.9
+        freed = 0
+        victims = []
+        for key, variant, size in conn.execute("SELECT key, variant, size FROM responses ORDER BY last_used"):
+            if freed >= target:
+                break
+            victims.append((key, variant))
+            freed += size
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            evicted = conn.executemany("DELETE FROM responses WHERE key = ? AND variant = ?", victims).rowcount
+        _count("evictions", evicted)
+        logger.info(f"Evicted {evicted} LLM responses ({freed} bytes)")
+    except Exception as e:
+        logger.error(f"Failed to evict LLM cache entries: {e}")
+
+
+def get_llm_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters and the cache's size on disk."""
+    with _stats_lock:
+        stats: Dict[str, Any] = dict(_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    stats["enabled"] = Config.LLM_CACHE_ENABLED
+    stats["variants"] = Config.LLM_CACHE_VARIANTS
+    stats["max_bytes"] = Config.LLM_CACHE_MAX_BYTES
+    try:
+        entries, size = _connect().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        stats["entries"], stats["bytes"] = entries, size
+    except Exception:
+        stats["entries"] = stats["bytes"] = None
+    return stats
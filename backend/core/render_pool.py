@@ -0,0 +1,214 @@
+"""
+Process pool for matplotlib chart rendering.
+
+Renders run in spawned worker processes that load matplotlib, its fonts and
+the static wheel background once at start-up, so they neither hold the API process's GIL nor share
+matplotlib state with it. The number of queued and running renders is
+bounded, and workers are replaced after RENDER_MAX_TASKS_PER_WORKER renders
+to cap memory growth. Workers report when they pick a render up, so its
+deadline runs from then rather than from when it was queued.
+"""
+import io
+import itertools
+import logging
+import math
+import multiprocessing
+import threading
+import time
+from multiprocessing.pool import Pool
+from typing import Any, Dict, Optional
+from .chart_image import MASTER_DPI
+from .chart_plot import chart_background, render_chart_png
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class RenderPoolFull(RuntimeError):
+    """Raised when RENDER_QUEUE_SIZE renders are already queued or running."""
+
+
+_pool: Optional[Pool] = None
+_pool_lock = threading.Lock()
+_slots: Optional[threading.BoundedSemaphore] = None
+_stats = {"renders": 0, "rejected": 0, "timeouts": 0, "failures": 0, "restarts": 0, "in_flight": 0}
+_stats_lock = threading.Lock()
+
+# Seconds between deadline checks while waiting for a render
+_POLL_SECONDS = 0.5
+
+# Workers put the id of each render they start here; every pool shares it
+_started_queue: Any = None
+# task id -> monotonic time its worker started it, None while queued
+_started: Dict[int, Optional[float]] = {}
+_started_lock = threading.Lock()
+_task_ids = itertools.count()
+
+
+def _warm_worker(started_queue: Any) -> None:
+    """Pool initializer: load matplotlib, the wheel's fonts and the full-size background."""
+    global _started_queue
+    _started_queue = started_queue
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(1, 1))
+    ax = fig.add_subplot(projection='polar')
+    ax.text(0, 0.5, "☉☽☿♀♂♃♄♅♆♇ AC MC 1°")
+    fig.savefig(io.BytesIO(), format='png')
+    chart_background(MASTER_DPI)
+
+
+def _count(name: str, delta: int = 1) -> None:
+    with _stats_lock:
+        _stats[name] += delta
+
+
+def _render_task(task_id: int, chart: Dict, dpi: int) -> bytes:
+    """Runs in a worker: report the start, then render."""
+    _started_queue.put(task_id)
+    return render_chart_png(chart, dpi)
+
+
+def _collect_starts(started_queue: Any) -> None:
+    while True:
+        task_id = started_queue.get()
+        with _started_lock:
+            # Renders given up on meanwhile are no longer tracked
+            if task_id in _started:
+                _started[task_id] = time.monotonic()
+
+
+def _create_pool() -> Pool:
+    # Caller holds _pool_lock
+    global _started_queue
+    # spawn, not fork: workers must not inherit the API's threads and locks
+    context = multiprocessing.get_context("spawn")
+    if _started_queue is None:
+        _started_queue = context.SimpleQueue()
+        threading.Thread(target=_collect_starts, args=(_started_queue,), name="render-start-collector",
+                         daemon=True).start()
+    return context.Pool(
+        processes=Config.RENDER_WORKERS,
+        initializer=_warm_worker,
+        initargs=(_started_queue,),
+        maxtasksperchild=Config.RENDER_MAX_TASKS_PER_WORKER or None,
+    )
+
+
+def start_render_pool() -> None:
+    """Start the worker processes; they warm up in the background."""
+    global _pool, _slots
+    if Config.RENDER_WORKERS <= 0:
+        logger.info("Render pool disabled, charts render in the request thread")
+        return
+    with _pool_lock:
+        if _pool is None:
+            _slots = threading.BoundedSemaphore(max(1, Config.RENDER_QUEUE_SIZE))
+            _pool = _create_pool()
+            logger.info(f"Started render pool with {Config.RENDER_WORKERS} workers")
+
+
+def stop_render_pool() -> None:
+    """Terminate the worker processes."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.terminate()
+        pool.join()
+
+
+def _replace_pool(stuck: Pool) -> None:
+    """Swap in a fresh pool after a render overran its deadline."""
+    global _pool
+    with _pool_lock:
+        if _pool is not stuck:
+            # Another request already replaced it
+            return
+        _pool = _create_pool()
+    _count("restarts")
+    stuck.close()
+
+    def reap() -> None:
+        # Give renders still running on the old pool their full deadline, then kill it
+        time.sleep(Config.RENDER_TIMEOUT_SECONDS)
+        stuck.terminate()
+        stuck.join()
+
+    threading.Thread(target=reap, name="render-pool-reaper", daemon=True).start()
+
+
+def render_png(chart: Dict, dpi: int = 300) -> bytes:
+    """
+    Render a chart PNG in the worker pool.
+
+    Args:
+        chart: Birth chart as returned by calculate_birth_chart
+        dpi: Resolution passed to render_chart_png
+
+    Raises:
+        RenderPoolFull: Too many renders are already queued or running
+        TimeoutError: The render ran longer than RENDER_TIMEOUT_SECONDS once
+            a worker picked it up, or never got picked up within the time
+            every render ahead of it could take
+        RuntimeError: The pool was stopped
+    """
+    if Config.RENDER_WORKERS <= 0:
+        return render_chart_png(chart, dpi)
+    start_render_pool()
+    with _pool_lock:
+        pool, slots = _pool, _slots
+    if pool is None:
+        raise RuntimeError("Render pool is stopped")
+    if not slots.acquire(blocking=False):
+        _count("rejected")
+        raise RenderPoolFull(f"{Config.RENDER_QUEUE_SIZE} chart renders already pending")
+
+    timeout = Config.RENDER_TIMEOUT_SECONDS
+    # Worst case in the queue: every render ahead runs to its deadline
+    max_wait = timeout * (1 + math.ceil(Config.RENDER_QUEUE_SIZE / Config.RENDER_WORKERS))
+    task_id = next(_task_ids)
+    with _started_lock:
+        _started[task_id] = None
+    _count("in_flight")
+    try:
+        result = pool.apply_async(_render_task, (task_id, chart, dpi))
+        submitted = time.monotonic()
+        try:
+            while True:
+                try:
+                    png = result.get(timeout=min(_POLL_SECONDS, timeout))
+                    break
+                except multiprocessing.TimeoutError:
+                    now = time.monotonic()
+                    with _started_lock:
+                        started = _started[task_id]
+                    if started is not None and now - started > timeout:
+                        raise
+                    if started is None and now - submitted > max_wait:
+                        raise
+        except multiprocessing.TimeoutError:
+            _count("timeouts")
+            logger.error(f"Chart render exceeded {timeout}s, replacing the render pool")
+            _replace_pool(pool)
+            raise TimeoutError("Chart render timed out")
+        except Exception:
+            _count("failures")
+            raise
+        _count("renders")
+        return png
+    finally:
+        with _started_lock:
+            del _started[task_id]
+        _count("in_flight", -1)
+        slots.release()
+
+
+def get_render_pool_stats() -> Dict[str, Any]:
+    """Render counters and pool sizing."""
+    with _stats_lock:
+        stats: Dict[str, Any] = dict(_stats)
+    stats["workers"] = Config.RENDER_WORKERS
+    stats["queue_size"] = Config.RENDER_QUEUE_SIZE
+    stats["running"] = _pool is not None
+    return stats
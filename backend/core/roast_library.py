@@ -0,0 +1,250 @@
+"""
+Library of pre-generated placement roasts.
+
+A placement roast depends only on (planet, sign, house, language), a space of
+10 × 12 × 12 × 3 = 4,320 combinations. The library stores several variants of
+each in an SQLite database (WAL mode), filled by an offline build job and by
+live generations on a miss. Charts get a variant picked by chart id, so the
+same chart always sees the same roast while different charts rotate through
+the variants.
+
+Build with: python -m backend.core.roast_library [--variants 3] [--languages English,French,Russian]
+"""
+import argparse
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+from .birth_chart_calculator import PLANETS, ZODIAC_SIGNS
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data" / "roast_library"
+DATA_DIR.mkdir(parents=True, exist_ok=True)
+DB_FILENAME = "roast_library.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS placement_roasts (
+    planet TEXT NOT NULL,
+    sign TEXT NOT NULL,
+    house INTEGER NOT NULL,
+    language TEXT NOT NULL,
+    variant INTEGER NOT NULL,
+    roast TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (planet, sign, house, language, variant)
+) WITHOUT ROWID
+"""
+
+# One connection per thread and database file
+_local = threading.local()
+
+_stats = {"hits": 0, "misses": 0, "saved": 0}
+_stats_lock = threading.Lock()
+
+
+def get_db_path() -> Path:
+    """Get the path to the roast library database."""
+    return DATA_DIR / DB_FILENAME
+
+
+def _connect() -> sqlite3.Connection:
+    path = get_db_path()
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(path)
+    if conn is None:
+        conn = sqlite3.connect(str(path), timeout=5.0, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute(SCHEMA)
+        connections[path] = conn
+    return conn
+
+
+def _language_key(language: str) -> str:
+    return language.strip().lower()
+
+
+def pick_variant(seed: str, planet: str, count: int) -> int:
+    """Stable variant index for a chart's placement: same seed, same roast."""
+    digest = hashlib.sha256(f"{seed}:{planet}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count
+
+
+def lookup_placement_roasts(
+    placements: Mapping[str, Mapping[str, Any]],
+    language: str,
+    seed: str
+) -> Dict[str, str]:
+    """
+    Look up library roasts for a chart's placements in one query.
+
+    Args:
+        placements: Planet -> data with 'sign' and 'house', like a chart's 'planets'
+        language: Roast language
+        seed: Variant rotation seed, normally the chart id
+
+    Returns:
+        Planet -> roast for the placements found; missing ones are left out
+    """
+    if not Config.ROAST_LIBRARY_ENABLED or not placements:
+        return {}
+    keys = {planet: (planet, data['sign'], int(data['house'])) for planet, data in placements.items()}
+    clause = " OR ".join(["(planet = ? AND sign = ? AND house = ?)"] * len(keys))
+    params = [value for key in keys.values() for value in key]
+    try:
+        rows = _connect().execute(
+            f"SELECT planet, sign, house, roast FROM placement_roasts WHERE language = ? AND ({clause}) "
+            "ORDER BY planet, sign, house, variant",
+            (_language_key(language), *params)
+        ).fetchall()
+    except Exception as e:
+        logger.error(f"Failed to look up placement roasts: {e}")
+        return {}
+
+    variants: Dict[Tuple[str, str, int], list] = {}
+    for planet, sign, house, roast in rows:
+        variants.setdefault((planet, sign, house), []).append(roast)
+    roasts = {}
+    for planet, key in keys.items():
+        options = variants.get(key)
+        if options:
+            roasts[planet] = options[pick_variant(seed, planet, len(options))]
+    with _stats_lock:
+        _stats["hits"] += len(roasts)
+        _stats["misses"] += len(keys) - len(roasts)
+    return roasts
+
+
+def save_placement_roast(planet: str, sign: str, house: int, language: str, roast: str,
+                         max_variants: Optional[int] = None) -> bool:
+    """
+    Store a roast as the next variant of a placement.
+
+    Args:
+        planet: Planet name
+        sign: Zodiac sign name
+        house: House number 1-12
+        language: Roast language
+        roast: Roast text
+        max_variants: Variants kept per placement, Config.ROAST_LIBRARY_VARIANTS by default
+
+    Returns:
+        True if stored, False if the placement already has enough variants
+    """
+    max_variants = max_variants or Config.ROAST_LIBRARY_VARIANTS
+    key = (planet, sign, int(house), _language_key(language))
+    try:
+        conn = _connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            count = conn.execute(
+                "SELECT COUNT(*) FROM placement_roasts WHERE planet = ? AND sign = ? AND house = ? AND language = ?",
+                key
+            ).fetchone()[0]
+            if count >= max_variants:
+                return False
+            conn.execute(
+                "INSERT INTO placement_roasts (planet, sign, house, language, variant, roast, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (*key, count, roast, datetime.now().isoformat())
+            )
+    except Exception as e:
+        logger.error(f"Failed to save {planet} in {sign} (house {house}) roast: {e}")
+        return False
+    with _stats_lock:
+        _stats["saved"] += 1
+    return True
+
+
+def missing_placements(languages: Iterable[str], variants: int) -> Dict[Tuple[str, str, int, str], int]:
+    """Every (planet, sign, house, language) with fewer than `variants` roasts, and how many it has."""
+    counts = dict(
+        ((planet, sign, house, language), count)
+        for planet, sign, house, language, count in _connect().execute(
+            "SELECT planet, sign, house, language, COUNT(*) FROM placement_roasts GROUP BY planet, sign, house, language"
+        ).fetchall()
+    )
+    missing = {}
+    for language in languages:
+        for planet in PLANETS:
+            for sign, *_ in ZODIAC_SIGNS:
+                for house in range(1, 13):
+                    key = (planet, sign, house, _language_key(language))
+                    if counts.get(key, 0) < variants:
+                        missing[(planet, sign, house, language)] = counts.get(key, 0)
+    return missing
+
+
+async def build_library(languages: Iterable[str], variants: int = 3, concurrency: int = 8) -> Dict[str, int]:
+    """
+    Generate roasts for every placement that has fewer than `variants` of them.
+
+    Resumable: existing variants are kept, so an interrupted build picks up
+    where it stopped.
+
+    Returns:
+        Counts of generated and failed roasts
+    """
+    # Imported here so the API never loads the agent through this module
+    from backend.agents.roast_agent.agent import arun_placement
+
+    started = time.perf_counter()
+    missing = missing_placements(languages, variants)
+    jobs = [(key, n) for key, have in missing.items() for n in range(variants - have)]
+    logger.info(f"Generating {len(jobs)} placement roasts for {len(missing)} placements")
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    result = {"generated": 0, "failed": 0}
+
+    async def generate(key: Tuple[str, str, int, str]) -> None:
+        planet, sign, house, language = key
+        async with semaphore:
+            try:
+                roast = await arun_placement(planet, sign, house, language)
+            except Exception as e:
+                logger.warning(f"Failed to generate {planet} in {sign} (house {house}, {language}): {e}")
+                result["failed"] += 1
+                return
+        save_placement_roast(planet, sign, house, language, roast, variants)
+        result["generated"] += 1
+        done = result["generated"] + result["failed"]
+        if done % 100 == 0:
+            logger.info(f"{done}/{len(jobs)} placement roasts done")
+
+    await asyncio.gather(*(generate(key) for key, _ in jobs))
+    logger.info(f"Built roast library in {time.perf_counter() - started:.0f}s: {result}")
+    return result
+
+
+def get_roast_library_stats() -> Dict[str, Any]:
+    """Lookup counters and the number of stored roasts."""
+    with _stats_lock:
+        stats: Dict[str, Any] = dict(_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    stats["enabled"] = Config.ROAST_LIBRARY_ENABLED
+    try:
+        stats["roasts"] = _connect().execute("SELECT COUNT(*) FROM placement_roasts").fetchone()[0]
+    except Exception:
+        stats["roasts"] = None
+    return stats
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Generate the placement roast library.")
+    parser.add_argument("--variants", type=int, default=Config.ROAST_LIBRARY_VARIANTS, help="roasts per placement")
+    parser.add_argument("--languages", default="English,French,Russian", help="comma-separated languages")
+    parser.add_argument("--concurrency", type=int, default=8, help="LLM calls in flight")
+    args = parser.parse_args()
+    languages = [language.strip() for language in args.languages.split(",") if language.strip()]
+    print(asyncio.run(build_library(languages, args.variants, args.concurrency)))
@@ -0,0 +1,64 @@
+"""
+Parity and throughput check of the batch chart engine against calculate_birth_chart.
+
+Usage: python -m benchmarks.batch_chart [charts] [years]
+The planet engine follows CHART_ENGINE.
+"""
+import sys
+import time
+from datetime import datetime, timedelta
+import numpy as np
+from backend.core.batch_chart import BODIES, calculate_birth_charts
+from backend.core.birth_chart_calculator import ZODIAC_SIGNS, _calculate_birth_chart_cached, calculate_birth_chart
+from backend.core.config import Config
+
+
+def random_cohort(count: int, years: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    start = datetime(1990 - years // 2, 1, 1)
+    minutes = rng.integers(0, years * 365 * 24 * 60, count)
+    datetimes = [start + timedelta(minutes=int(m)) for m in minutes]
+    return datetimes, rng.uniform(-60, 60, count), rng.uniform(-180, 180, count)
+
+
+def main(count: int = 20000, years: int = 60, reference: int = 1000) -> None:
+    datetimes, lats, lons = random_cohort(count, years)
+    sign_names = [sign[0] for sign in ZODIAC_SIGNS]
+
+    # Single-chart path, bypassing its memo cache
+    started = time.perf_counter()
+    singles = [
+        calculate_birth_chart(dt.strftime("%Y-%m-%d"), dt.strftime("%H:%M"), lat, lon)
+        for dt, lat, lon in zip(datetimes[:reference], lats[:reference], lons[:reference])
+    ]
+    single_rate = reference / (time.perf_counter() - started)
+    _calculate_birth_chart_cached.cache_clear()
+
+    print(f"{count} charts over {years} years, {Config.CHART_ENGINE} engine")
+    print(f"single path:        {single_rate:10.0f} charts/s")
+    for interpolate in (False, True):
+        started = time.perf_counter()
+        batch = calculate_birth_charts(datetimes, lats, lons, interpolate=interpolate)
+        rate = count / (time.perf_counter() - started)
+
+        max_error = 0.0
+        mismatches = 0
+        for i, chart in enumerate(singles):
+            for column, name in enumerate(BODIES):
+                planet = chart['planets'][name]
+                max_error = max(max_error, abs(planet['degrees'] - batch.body_longitudes[i, column]))
+                max_error = max(max_error, abs(planet['speed'] - batch.body_speeds[i, column]))
+                # Only the swisseph engine reports retrograde motion
+                if 'retrograde' in planet:
+                    mismatches += planet['retrograde'] != (batch.body_speeds[i, column] < 0)
+                mismatches += planet['house'] != batch.house[i, column]
+                mismatches += planet['sign'] != sign_names[batch.sign_index[i, column]]
+            cusps = [chart['houses'][house]['degrees'] for house in range(1, 13)]
+            max_error = max(max_error, float(np.abs(batch.cusps[i] - cusps).max()))
+        label = "batch interpolated:" if interpolate else "batch exact:       "
+        print(f"{label} {rate:10.0f} charts/s  x{rate / single_rate:5.1f}  "
+              f"max diff {max_error:.1e} deg  sign/house/retrograde mismatches {mismatches}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,74 @@
+"""
+Parity and cost report of the ephem and swisseph chart engines.
+
+Usage: python -m benchmarks.chart_engine [charts]
+
+ephem's hlong is heliocentric (for the Sun it is the Earth's position, 180°
+away), while the swisseph engine returns geocentric longitudes, so the two are
+not expected to agree. The frame check recomputes Swiss Ephemeris in ephem's
+frame to show that the remaining differences are the frame, not the engines.
+"""
+import os
+import subprocess
+import sys
+import time
+import numpy as np
+import swisseph as swe
+from benchmarks.batch_chart import random_cohort
+from backend.core.birth_chart_calculator import PLANETS, SWE_BODIES, _calculate_birth_chart_cached
+
+IMPORT_PROBE = (
+    "import sys, time; started = time.perf_counter(); "
+    "from backend.core.birth_chart_calculator import calculate_birth_chart; "
+    "calculate_birth_chart('1990-05-17', '14:30', 40.7128, -74.006); "
+    "print(f'{(time.perf_counter() - started) * 1000:.0f} ms, ephem loaded: {\"ephem\" in sys.modules}')"
+)
+
+
+def angle_diff(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.abs((np.asarray(a) - np.asarray(b) + 180.0) % 360.0 - 180.0)
+
+
+def main(count: int = 1000) -> None:
+    datetimes, lats, lons = random_cohort(count, 60)
+    compute = _calculate_birth_chart_cached.__wrapped__
+    charts = {}
+    print(f"{count} charts, uncached")
+    for engine in ("ephem", "swisseph"):
+        started = time.perf_counter()
+        charts[engine] = [compute(dt, lat, lon, engine) for dt, lat, lon in zip(datetimes, lats, lons)]
+        elapsed = time.perf_counter() - started
+        env = dict(os.environ, CHART_ENGINE=engine, PYTHONPATH=os.getcwd())
+        probe = subprocess.run([sys.executable, "-c", IMPORT_PROBE], env=env, capture_output=True, text=True)
+        print(f"  {engine:9s} {elapsed / count * 1e6:7.0f} us/chart   import + first chart: {probe.stdout.strip()}")
+
+    print("\nephem vs swisseph: max |diff| deg, sign and house agreement")
+    for name in PLANETS:
+        old = np.array([chart['planets'][name]['degrees'] for chart in charts["ephem"]])
+        new = np.array([chart['planets'][name]['degrees'] for chart in charts["swisseph"]])
+        signs = np.mean([a['planets'][name]['sign'] == b['planets'][name]['sign']
+                         for a, b in zip(charts["ephem"], charts["swisseph"])])
+        houses = np.mean([a['planets'][name]['house'] == b['planets'][name]['house']
+                          for a, b in zip(charts["ephem"], charts["swisseph"])])
+        print(f"  {name:8s} {angle_diff(old, new).max():8.3f}   signs {signs:6.1%}   houses {houses:6.1%}")
+
+    print("\nframe check: ephem hlong vs Swiss Ephemeris in the same frame, max |diff| deg")
+    julian_days = [swe.julday(dt.year, dt.month, dt.day, dt.hour + dt.minute / 60.0) for dt in datetimes]
+    for name, body in SWE_BODIES.items():
+        if name == 'Sun':
+            # The Earth seen from the Sun
+            same_frame = [(swe.calc_ut(jd, body, swe.FLG_MOSEPH)[0][0] + 180.0) % 360.0 for jd in julian_days]
+        elif name == 'Moon':
+            # ephem reports the Moon geocentrically
+            same_frame = [swe.calc_ut(jd, body, swe.FLG_MOSEPH)[0][0] for jd in julian_days]
+        else:
+            same_frame = [swe.calc_ut(jd, body, swe.FLG_MOSEPH | swe.FLG_HELCTR)[0][0] for jd in julian_days]
+        old = [chart['planets'][name]['degrees'] for chart in charts["ephem"]]
+        print(f"  {name:8s} {angle_diff(old, same_frame).max():8.4f}")
+
+    retrograde = np.mean([[chart['planets'][name]['retrograde'] for name in PLANETS] for chart in charts["swisseph"]], axis=0)
+    print("\nretrograde share (swisseph): " + ", ".join(f"{name} {share:.0%}" for name, share in zip(PLANETS, retrograde)))
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
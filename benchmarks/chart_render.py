@@ -0,0 +1,83 @@
+"""
+Latency, payload size and memory of the PNG and SVG chart renderers.
+
+Usage: python -m benchmarks.chart_render [renders]
+       python -m benchmarks.chart_render --pool [renders]
+
+Each renderer runs in a fresh interpreter so imports and peak memory are
+measured separately. --pool measures PNG throughput of the render pool from
+one worker up to one per core.
+"""
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def measure(image_format: str, renders: int) -> dict:
+    from backend.core.birth_chart_calculator import calculate_birth_chart
+    chart = calculate_birth_chart("1990-05-17", "14:30", 40.7128, -74.006)
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    started = time.perf_counter()
+    if image_format == "svg":
+        from backend.core.chart_svg import render_chart_svg as render
+    else:
+        from backend.core.chart_plot import render_chart_png as render
+    image = render(chart)
+    first = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(renders):
+        image = render(chart)
+    return {
+        "first_ms": first * 1000,
+        "render_ms": (time.perf_counter() - started) / renders * 1000,
+        "bytes": len(image),
+        "peak_rss_mb": (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_kb) / 1024,
+    }
+
+
+def main(renders: int = 5) -> None:
+    print(f"{'format':6s} {'first (ms)':>11s} {'render (ms)':>12s} {'payload':>10s} {'peak RSS':>10s}")
+    for image_format in ("png", "svg"):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.chart_render", "--worker", image_format, str(renders)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{image_format:6s} {result['first_ms']:11.1f} {result['render_ms']:12.1f} "
+              f"{result['bytes'] / 1024:8.1f}KB {result['peak_rss_mb']:8.1f}MB")
+
+
+def pool_throughput(renders: int = 16) -> None:
+    from backend.core import render_pool
+    from backend.core.birth_chart_calculator import calculate_birth_chart
+    from backend.core.config import Config
+    chart = calculate_birth_chart("1990-05-17", "14:30", 40.7128, -74.006)
+    cores = os.cpu_count() or 1
+    Config.RENDER_QUEUE_SIZE = renders
+    for workers in sorted({1, max(1, cores // 2), cores}):
+        Config.RENDER_WORKERS = workers
+        render_pool.start_render_pool()
+        # Warm every worker before timing
+        with ThreadPoolExecutor(workers) as executor:
+            list(executor.map(lambda _: render_pool.render_png(chart), range(workers)))
+        started = time.perf_counter()
+        with ThreadPoolExecutor(renders) as executor:
+            list(executor.map(lambda _: render_pool.render_png(chart), range(renders)))
+        elapsed = time.perf_counter() - started
+        render_pool.stop_render_pool()
+        print(f"{workers:2d} workers: {renders / elapsed:6.2f} renders/s")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--worker"]:
+        print(json.dumps(measure(sys.argv[2], int(sys.argv[3]))))
+    elif sys.argv[1:2] == ["--pool"]:
+        pool_throughput(*(int(arg) for arg in sys.argv[2:]))
+    else:
+        main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,81 @@
+"""
+Latency and request count of the two placement roast modes.
+
+Usage: python -m benchmarks.placement_roast [runs] [language]
+
+per_placement makes one LLM call per placement plus one for the synthesis;
+single asks for the whole chart in one structured call and streams its
+fields. Both run against the live API (OPENAI_API_KEY required) with the LLM
+cache and roast library out of the way.
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+
+async def per_placement(placements: dict, language: str):
+    from backend.agents.roast_agent.agent import arun_birth_chart_synthesis, arun_placement
+    from backend.core.config import Config
+    semaphore = asyncio.Semaphore(max(1, Config.PLACEMENT_ROAST_CONCURRENCY))
+
+    async def roast(planet: str, data: dict) -> tuple:
+        async with semaphore:
+            return planet, await arun_placement(data['name'], data['sign'], data['house'], language)
+
+    roasts = {}
+    for next_done in asyncio.as_completed([roast(planet, data) for planet, data in placements.items()]):
+        planet, text = await next_done
+        roasts[planet] = text
+        yield planet
+    await arun_birth_chart_synthesis({planet: roasts[planet] for planet in placements}, language)
+    yield 'overall_synthesis'
+
+
+async def single(placements: dict, language: str):
+    from backend.agents.roast_agent.agent import astream_chart_roast
+    async for key, _, roast in astream_chart_roast(placements, language):
+        # Token deltas arrive first; count each field once it is complete
+        if roast is not None:
+            yield key
+
+
+async def measure(mode, placements: dict, language: str) -> dict:
+    from backend.core.agents_sdk_wrapper import get_pool_stats
+    requests_before = get_pool_stats()["requests"]
+    started = time.perf_counter()
+    first = None
+    fields = 0
+    async for _ in mode(placements, language):
+        first = first or time.perf_counter() - started
+        fields += 1
+    return {
+        "ttfb": first,
+        "total": time.perf_counter() - started,
+        "requests": get_pool_stats()["requests"] - requests_before,
+        "fields": fields,
+    }
+
+
+async def main(runs: int = 3, language: str = "English") -> None:
+    from backend.core.birth_chart_calculator import calculate_birth_chart
+    from backend.core.config import Config
+    Config.LLM_CACHE_ENABLED = False
+    Config.ROAST_LIBRARY_ENABLED = False
+    placements = calculate_birth_chart("1990-05-17", "14:30", 40.7128, -74.006)['planets']
+
+    print(f"{'mode':14s} {'requests':>9s} {'first (s)':>10s} {'total (s)':>10s} {'fields':>7s}")
+    for name, mode in (("per_placement", per_placement), ("single", single)):
+        results = [await measure(mode, placements, language) for _ in range(runs)]
+        print(f"{name:14s} {results[0]['requests']:9d} "
+              f"{statistics.median(r['ttfb'] for r in results):10.2f} "
+              f"{statistics.median(r['total'] for r in results):10.2f} "
+              f"{results[0]['fields']:7d}")
+
+
+if __name__ == "__main__":
+    from backend.core.config import Config
+    if not Config.OPENAI_API_KEY:
+        sys.exit("OPENAI_API_KEY is required: this benchmark calls the live API")
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 3,
+                     sys.argv[2] if len(sys.argv) > 2 else "English"))
@@ -281,6 +281,43 @@ const signMapping = {
   "Стрелец": "Sagittarius", "Козерог": "Capricorn", "Водолей": "Aquarius", "Рыбы": "Pisces"
 };
 
+// Follow a server-sent event stream until its `complete` event, calling onEvent with each event.
+// EventSource reconnects by itself after a dropped connection and sends Last-Event-ID,
+// so the server resumes the stream where it left off instead of generating it again.
+function readEventStream(url, onEvent) {
+  return new Promise((resolve, reject) => {
+    const source = new EventSource(url);
+
+    source.onmessage = (message) => {
+      let data;
+      try {
+        data = JSON.parse(message.data);
+      } catch (e) {
+        console.error('Error parsing stream data:', e);
+        return;
+      }
+      if (data.complete && data.error) {
+        source.close();
+        reject(new Error(data.error));
+        return;
+      }
+      onEvent(data);
+      if (data.complete) {
+        // Otherwise EventSource would reconnect once the server ends the stream
+        source.close();
+        resolve(data);
+      }
+    };
+
+    source.onerror = () => {
+      // CLOSED: the server refused the stream; otherwise the browser is already reconnecting
+      if (source.readyState === EventSource.CLOSED) {
+        reject(new Error("Stream failed"));
+      }
+    };
+  });
+}
+
 function Navigation({ currentPage, onPageChange, t }) {
   return React.createElement(
     "nav",
@@ -441,10 +478,17 @@ function HoroscopePage({ t, selectedLanguage }) {
     if (!sign) return;
     setLoading(true);
     try {
-      const res = await fetch(`http://localhost:8000/horoscope/${sign}?period=${selectedPeriod}&language=${selectedLanguage}`);
-      if (!res.ok) throw new Error("Failed to fetch roast");
-      const data = await res.json();
-      saveRoast(data.roast);
+      let partial = {};
+      await readEventStream(`http://localhost:8000/horoscope/${sign}/stream?period=${selectedPeriod}&language=${selectedLanguage}`, (data) => {
+        if (data.complete) {
+          saveRoast(data.roast);
+        } else if (data.category) {
+          // Show each category as it is written; the finished text replaces the deltas
+          partial = { ...partial, [data.category]: data.roast || (partial[data.category] || "") + data.delta };
+          setRoast(partial);
+          setLoading(false);
+        }
+      });
     } catch (err) {
       saveRoast(t.errorFetchingRoast);
     } finally {
@@ -760,7 +804,7 @@ function BirthChartPage({ t, selectedLanguage }) {
   const tCurrent = translations[selectedLanguage];
 
   // Mock data for initial display
-  const mockChartUrl = "http://localhost:8000/birth-chart/plot?birth_date=1990-06-15&birth_time=12:00&latitude=40.7128&longitude=-74.0060&t=mock";
+  const mockChartUrl = "http://localhost:8000/birth-chart/plot?birth_date=1990-06-15&birth_time=12:00&latitude=40.7128&longitude=-74.0060&size=screen&format=webp&t=mock";
 
   const mockPlacements = [
     { symbol: "☉", name: "Sun", sign: "Gemini", degrees: "24.3°" },
@@ -878,7 +922,8 @@ function BirthChartPage({ t, selectedLanguage }) {
       if (!res.ok) throw new Error("Failed to calculate birth chart");
       const data = await res.json();
       saveChartBirthChart(data);
-      const imageUrl = `http://localhost:8000/birth-chart/plot?birth_date=${birthDate}&birth_time=${birthTime}&latitude=${latitude}&longitude=${longitude}&t=${new Date().getTime()}`;
+      // Birth data is sent too so the saved URL still works once the server no longer holds the chart
+      const imageUrl = `http://localhost:8000/birth-chart/plot?chart_id=${data.chart_id}&birth_date=${birthDate}&birth_time=${birthTime}&latitude=${latitude}&longitude=${longitude}&size=screen&format=webp`;
       saveChartImageUrl(imageUrl);
     } catch (err) {
       saveChartBirthChart(null);
@@ -902,56 +947,39 @@ function BirthChartPage({ t, selectedLanguage }) {
       const chartData = await chartRes.json();
       saveChartBirthChart(chartData);
       
-      // Generate chart image URL
-      const imageUrl = `http://localhost:8000/birth-chart/plot?birth_date=${birthDate}&birth_time=${birthTime}&latitude=${latitude}&longitude=${longitude}&t=${new Date().getTime()}`;
+      // Generate chart image URL from the computed chart; birth data keeps the saved URL working once the chart expires
+      const imageUrl = `http://localhost:8000/birth-chart/plot?chart_id=${chartData.chart_id}&birth_date=${birthDate}&birth_time=${birthTime}&latitude=${latitude}&longitude=${longitude}&size=screen&format=webp`;
       saveChartImageUrl(imageUrl);
       
-      // Now stream the roasts with language parameter
-      const roastRes = await fetch(`http://localhost:8000/birth-chart/roast-placements?birth_date=${birthDate}&birth_time=${birthTime}&latitude=${latitude}&longitude=${longitude}&language=${selectedLanguage}`);
-      if (!roastRes.ok) throw new Error("Failed to get roasts");
-      
-      const reader = roastRes.body.getReader();
-      const decoder = new TextDecoder();
-      
-      while (true) {
-        const { done, value } = await reader.read();
-        if (done) break;
-        
-        const chunk = decoder.decode(value);
-        const lines = chunk.split('\n');
-        
-        for (const line of lines) {
-          if (line.startsWith('data: ')) {
+      // Now stream the roasts for the same chart with language parameter
+      await readEventStream(`http://localhost:8000/birth-chart/roast-placements?chart_id=${chartData.chart_id}&language=${selectedLanguage}`, (data) => {
+        if (data.complete) {
+          // All roasts are done
+          saveChartPlacementRoasts(data.all_roasts);
+          setLoading(false);
+        } else if (data.planet && data.delta) {
+          // Show tokens as they arrive; the finished roast replaces them
+          setPlacementRoasts(prev => ({
+            ...prev,
+            [data.planet]: ((prev && prev[data.planet]) || "") + data.delta
+          }));
+        } else if (data.planet && data.roast) {
+          // Update roasts as they come in
+          setPlacementRoasts(prev => {
+            const newRoasts = {
+              ...prev,
+              [data.planet]: data.roast
+            };
+            // Save to localStorage
             try {
-              const data = JSON.parse(line.slice(6));
-              
-              if (data.complete) {
-                // All roasts are done
-                saveChartPlacementRoasts(data.all_roasts);
-                setLoading(false);
-                return;
-              } else if (data.planet && data.roast) {
-                // Update roasts as they come in
-                setPlacementRoasts(prev => {
-                  const newRoasts = {
-                    ...prev,
-                    [data.planet]: data.roast
-                  };
-                  // Save to localStorage
-                  try {
-                    localStorage.setItem("chart-placement-roasts", JSON.stringify(newRoasts));
-                  } catch (error) {
-                    console.warn("Could not save placement roasts:", error);
-                  }
-                  return newRoasts;
-                });
-              }
-            } catch (e) {
-              console.error('Error parsing stream data:', e);
+              localStorage.setItem("chart-placement-roasts", JSON.stringify(newRoasts));
+            } catch (error) {
+              console.warn("Could not save placement roasts:", error);
             }
-          }
+            return newRoasts;
+          });
         }
-      }
+      });
       
     } catch (err) {
       console.error("Failed to get placement roasts:", err);
@@ -1277,7 +1305,7 @@ function App() {
         const longitude = localStorage.getItem("chart-longitude");
         
         if (birthDate && birthTime && latitude && longitude) {
-          refreshBirthChartRoasts(birthDate, birthTime, latitude, longitude, newLanguage);
+          refreshBirthChartRoasts(chart.chart_id, birthDate, birthTime, latitude, longitude, newLanguage);
         }
       } catch (error) {
         console.warn("Could not parse chart data for refresh:", error);
@@ -1301,41 +1329,23 @@ function App() {
   };
 
   // Function to refresh birth chart roasts
-  const refreshBirthChartRoasts = async (birthDate, birthTime, latitude, longitude, language) => {
+  const refreshBirthChartRoasts = async (chartId, birthDate, birthTime, latitude, longitude, language) => {
     try {
-      const res = await fetch(`http://localhost:8000/birth-chart/roast-placements?birth_date=${birthDate}&birth_time=${birthTime}&latitude=${latitude}&longitude=${longitude}&language=${language}`);
-      if (res.ok) {
-        const reader = res.body.getReader();
-        const decoder = new TextDecoder();
-        let newRoasts = {};
-        
-        while (true) {
-          const { done, value } = await reader.read();
-          if (done) break;
-          
-          const chunk = decoder.decode(value);
-          const lines = chunk.split('\n');
-          
-          for (const line of lines) {
-            if (line.startsWith('data: ')) {
-              try {
-                const data = JSON.parse(line.slice(6));
-                if (data.complete) {
-                  localStorage.setItem("chart-placement-roasts", JSON.stringify(data.all_roasts));
-                  window.dispatchEvent(new CustomEvent('chartRoastsRefresh', { detail: data.all_roasts }));
-                  return;
-                } else if (data.planet && data.roast) {
-                  newRoasts[data.planet] = data.roast;
-                  localStorage.setItem("chart-placement-roasts", JSON.stringify(newRoasts));
-                  window.dispatchEvent(new CustomEvent('chartRoastsRefresh', { detail: newRoasts }));
-                }
-              } catch (e) {
-                console.error('Error parsing refresh stream data:', e);
-              }
-            }
-          }
+      // Birth data is sent too in case the server no longer holds the chart
+      const url = `http://localhost:8000/birth-chart/roast-placements?chart_id=${chartId || ""}&birth_date=${birthDate}&birth_time=${birthTime}&latitude=${latitude}&longitude=${longitude}&language=${language}`;
+      let newRoasts = {};
+      
+      await readEventStream(url, (data) => {
+        if (data.complete) {
+          localStorage.setItem("chart-placement-roasts", JSON.stringify(data.all_roasts));
+          window.dispatchEvent(new CustomEvent('chartRoastsRefresh', { detail: data.all_roasts }));
+        } else if (data.planet && data.roast) {
+          // Token deltas are skipped; the refresh only swaps in finished roasts
+          newRoasts[data.planet] = data.roast;
+          localStorage.setItem("chart-placement-roasts", JSON.stringify(newRoasts));
+          window.dispatchEvent(new CustomEvent('chartRoastsRefresh', { detail: newRoasts }));
         }
-      }
+      });
     } catch (error) {
       console.warn("Could not refresh birth chart roasts:", error);
     }